@@ -0,0 +1,235 @@
+# app/core/cache.py
+"""
+Small pluggable cache used for tenant read paths.
+
+Values are pickled on the way in, so every backend stores plain bytes, sizes
+are exact, and callers can never mutate a cached value in place. The default
+backend is an in-process LRU; set CACHE_BACKEND=redis (and CACHE_URL) to share
+entries between worker processes. A Redis that is down or slow degrades to
+cache misses (logged), never to failed requests.
+
+Response caches key entries by tenant and the resource's version token (see
+app/core/versioning.py), so a write invalidates them by bumping the version;
+CACHE_TTL_SECONDS additionally bounds how long an entry may live.
+"""
+import logging
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        # lookups come from threadpool threads; += on an int isn't atomic
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._get(key)
+        with self._counter_lock:
+            if raw is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if raw is None:
+            return None
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        if ttl is None:
+            ttl = settings.cache_ttl_seconds
+        self._set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, raw: bytes, ttl: Optional[int]) -> None:
+        ...
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU bounded by entry count and by total bytes.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, max_bytes: int):
+        super().__init__(namespace)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, raw = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return raw
+
+    def _set(self, key: str, raw: bytes, ttl: Optional[int]) -> None:
+        if len(raw) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (expires_at, raw)
+            self.bytes += len(raw)
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _pop(self, key: str) -> None:
+        _, raw = self._entries.pop(key)
+        self.bytes -= len(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data.update(
+            entries=len(self._entries),
+            bytes=self.bytes,
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes,
+            evictions=self.evictions,
+        )
+        return data
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared backend for multi-worker deployments. Eviction is left to the
+    server: run it with `maxmemory` and `maxmemory-policy allkeys-lru`.
+    """
+
+    def __init__(self, namespace: str, url: str):
+        super().__init__(namespace)
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _failed(self, operation: str, key: str) -> None:
+        with self._counter_lock:
+            self.errors += 1
+        logger.warning("Redis cache %s failed for %s", operation, self._key(key), exc_info=True)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(self._key(key))
+        except self._errors:
+            self._failed("get", key)
+            return None
+
+    def _set(self, key: str, raw: bytes, ttl: Optional[int]) -> None:
+        try:
+            self._client.set(self._key(key), raw, ex=ttl or None)
+        except self._errors:
+            self._failed("set", key)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except self._errors:
+            self._failed("delete", key)
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["errors"] = self.errors
+        try:
+            data["bytes"] = self._client.info("memory").get("used_memory")
+        except self._errors:
+            data["bytes"] = None
+        return data
+
+
+_caches: Dict[str, CacheBackend] = {}
+
+
+def get_cache(namespace: str) -> CacheBackend:
+    """
+    Return the process-wide cache for `namespace`, creating it from settings
+    on first use.
+    """
+    cache = _caches.get(namespace)
+    if cache is None:
+        if settings.cache_backend == "redis":
+            if not settings.cache_url:
+                raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL")
+            cache = RedisCache(namespace, settings.cache_url)
+        else:
+            cache = LRUCache(namespace, settings.cache_max_entries, settings.cache_max_bytes)
+        _caches[namespace] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def render_cache_metrics() -> str:
+    """
+    Prometheus lines for this worker's cache lookups, by namespace.
+    """
+    lines = [
+        "# HELP cache_lookups_total Cache lookups, by result.",
+        "# TYPE cache_lookups_total counter",
+    ]
+    for name, cache in sorted(_caches.items()):
+        lines.append(f'cache_lookups_total{{cache="{name}",result="hit"}} {cache.hits}')
+        lines.append(f'cache_lookups_total{{cache="{name}",result="miss"}} {cache.misses}')
+    lines.append("")
+    return "\n".join(lines)
+
+
+def make_key(*parts: object) -> str:
+    return ":".join(str(p) for p in parts)
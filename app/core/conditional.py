@@ -0,0 +1,42 @@
+# app/core/conditional.py
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Dashboards must always revalidate, but may reuse their copy on a 304
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from whatever identifies the representation:
+    tenant, resource version, query string, ...
+    """
+    raw = "|".join(str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """
+    Return a 304 response if the client already holds `etag`; otherwise stamp
+    the ETag on the outgoing response and return None so the caller builds
+    the full body.
+    """
+    headers = {"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
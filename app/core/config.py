@@ -1,4 +1,6 @@
 # app/core/config.py
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -13,9 +15,102 @@ class Settings(BaseSettings):
     email_user: str
     email_password: str
     email_from: str
+    # STARTTLS before login; off for local SMTP sinks (e.g. mailpit)
+    email_use_tls: bool = True
 
     frontend_url: str
 
+    # CockroachDB connection pool. Connections are recycled before the load
+    # balancer's idle timeout and pinged on checkout, so dropped ones are
+    # replaced instead of failing a request.
+    db_sslmode: str = "require"  # "disable" for a local insecure node
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: Optional[int] = None
+
+    # Follower reads for read endpoints (see app/db/stale.py): the AS OF
+    # SYSTEM TIME target, and the route names (endpoint functions) that use
+    # them unless the request sends X-Read-Consistency: strong
+    db_stale_read_as_of: str = "follower_read_timestamp()"
+    db_stale_read_routes: str = ""
+
+    # Idempotency-Key on the create endpoints (app/modules/order/idempotency.py):
+    # how long a key's stored response is replayed, and how long a claim may
+    # stay pending before it's treated as abandoned by a crashed worker
+    idempotency_ttl_hours: int = 24
+    idempotency_lock_seconds: int = 60
+
+    # Create missing SQL tables at worker startup (dev convenience; normally
+    # run `python -m app.manage create-schema` once per deploy)
+    sql_create_schema: bool = False
+
+    # MongoDB client (one per worker process). Compressors are tried in
+    # order and negotiated with the server; zstd needs `zstandard`, snappy
+    # needs `python-snappy`. Unset write concern uses the server default.
+    mongo_max_pool_size: int = 50
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: Optional[int] = None
+    mongo_server_selection_timeout_ms: int = 5_000
+    mongo_connect_timeout_ms: int = 5_000
+    mongo_compressors: Optional[str] = "zstd,zlib"
+    mongo_read_preference: str = "primary"
+    mongo_write_concern: Optional[str] = None
+    mongo_wtimeout_ms: Optional[int] = None
+
+    # Create the registered Mongo indexes at worker startup (dev convenience;
+    # normally run `python -m app.manage ensure-indexes` once per deploy)
+    mongo_auto_indexes: bool = False
+
+    # Profile image uploads
+    profile_image_max_bytes: int = 5 * 1024 * 1024
+    image_workers: int = 2
+
+    # Read caches: "memory" (per process) or "redis" (shared, needs cache_url).
+    # Entries are invalidated by version bumps; the TTL is a backstop for
+    # writes made outside the API (0 = no expiry)
+    cache_backend: str = "memory"
+    cache_url: Optional[str] = None
+    cache_max_entries: int = 10_000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_seconds: int = 600
+
+    # Production launcher, `python -m app.serve` (gunicorn + uvicorn workers).
+    # WEB_CONCURRENCY defaults to the CPUs available to the process;
+    # max_requests=0 never recycles workers.
+    host: str = "0.0.0.0"
+    port: int = 8000
+    web_concurrency: Optional[int] = None
+    server_preload: bool = False
+    server_max_requests: int = 0
+    server_max_requests_jitter: int = 0
+    server_timeout: int = 60
+    server_graceful_timeout: int = 30
+    server_keepalive: int = 5
+
+    # Response compression (see app/core/compression.py); brotli is used
+    # when the client accepts it and the `brotli` package is installed
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_gzip_level: int = 5
+    compression_brotli_quality: int = 4
+
+    # Per-request profiling via the X-Profile header (see app/core/profiling.py);
+    # when disabled the middleware isn't installed at all
+    profiling_enabled: bool = False
+    profile_interval_ms: float = 5.0
+    profile_ttl_seconds: int = 900
+
+    # tracemalloc accounting of per-route peaks (see app/core/memory.py)
+    memory_tracking: bool = False
+    memory_trace_frames: int = 10
+    memory_log_threshold_mb: float = 50.0
+
+    # Shared secret for the /ops endpoints; unset disables them
+    ops_token: Optional[str] = None
+
     # Tell Pydantic to also read a “.env” file if it exists
     model_config = SettingsConfigDict(
         env_file = ".env",
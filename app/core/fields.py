@@ -0,0 +1,155 @@
+# app/core/fields.py
+"""
+Sparse fieldsets for list endpoints: `?fields=name,price` or, for embedded
+lists, `?fields=order_id,events.venue,events.no_of_guests`.
+
+The parsed selection drives the Mongo projection / SQL column list, so fields
+that weren't asked for are never read; the response is then trimmed to the
+selection and serialized through a model holding just the selected fields of
+the response model, so every value encodes exactly as it does without
+`fields` (Decimal money as strings, datetimes as ISO strings).
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type, get_args
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, TypeAdapter, create_model
+
+# top-level field -> sub-fields to keep (None keeps the whole value)
+Selection = Dict[str, Optional[Set[str]]]
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Iterable[str],
+    always: Iterable[str] = (),
+    nested: Optional[Dict[str, Iterable[str]]] = None,
+    nested_always: Optional[Dict[str, Iterable[str]]] = None,
+) -> Optional[Selection]:
+    """
+    Parse a comma-separated `fields` value; None means "everything".
+    `always` fields (ids) are added to every selection.
+    """
+    if not fields or not fields.strip():
+        return None
+    allowed = set(allowed)
+    nested = {key: set(subs) for key, subs in (nested or {}).items()}
+    nested_always = nested_always or {}
+
+    selected: Selection = {name: None for name in always}
+    unknown: List[str] = []
+    for raw in fields.split(","):
+        name = raw.strip()
+        if not name:
+            continue
+        parent, _, child = name.partition(".")
+        if child:
+            if child not in nested.get(parent, ()):
+                unknown.append(name)
+                continue
+            subs = selected.setdefault(parent, set())
+            if subs is not None:
+                subs.add(child)
+        elif name in allowed:
+            selected[name] = None
+        else:
+            unknown.append(name)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}",
+        )
+
+    for parent, subs in selected.items():
+        if subs is not None:
+            subs.update(nested_always.get(parent, ()))
+    return selected
+
+
+def wants(selected: Optional[Selection], name: str) -> bool:
+    return selected is None or name in selected
+
+
+def mongo_projection(names: Iterable[str], renames: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Projection for the given output names; `renames` maps output names to
+    document fields (e.g. "id" -> "_id").
+    """
+    renames = renames or {}
+    return {renames.get(name, name): 1 for name in names}
+
+
+def shape_doc(doc: Dict[str, Any], names: Iterable[str], id_field: str = "id") -> Dict[str, Any]:
+    """
+    Output dict for a projected Mongo document: the requested fields, with
+    the document's _id exposed as `id_field`.
+    """
+    out = {name: doc.get(name) for name in names if name != id_field}
+    out[id_field] = str(doc["_id"])
+    return out
+
+
+def pick(item: Dict[str, Any], selected: Selection) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, subs in selected.items():
+        value = item.get(name)
+        if subs is not None and isinstance(value, list):
+            value = [{k: v for k, v in entry.items() if k in subs} for entry in value]
+        out[name] = value
+    return out
+
+
+# hashable form of a Selection: ((name, sorted sub-fields or None), ...)
+_SelectionKey = Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]
+
+
+def _selection_key(selected: Selection) -> _SelectionKey:
+    return tuple(sorted(
+        (name, None if subs is None else tuple(sorted(subs)))
+        for name, subs in selected.items()
+    ))
+
+
+@lru_cache(maxsize=256)
+def _sparse_model(model: Type[BaseModel], key: _SelectionKey) -> Type[BaseModel]:
+    """
+    `model` cut down to the selected fields, in the model's own field order.
+    A field with sub-fields must be a list of models; its items are cut down
+    the same way.
+    """
+    subs_by_name = dict(key)
+    fields: Dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        if name not in subs_by_name:
+            continue
+        annotation = info.annotation
+        subs = subs_by_name[name]
+        if subs is not None:
+            (item_model,) = get_args(annotation)
+            annotation = List[_sparse_model(item_model, tuple((sub, None) for sub in subs))]
+        fields[name] = (annotation, ...)
+    return create_model(f"Sparse{model.__name__}", **fields)
+
+
+@lru_cache(maxsize=256)
+def _sparse_adapter(model: Type[BaseModel], key: _SelectionKey) -> TypeAdapter:
+    return TypeAdapter(List[_sparse_model(model, key)])
+
+
+def sparse_response(
+    response: Response,
+    items: List[Dict[str, Any]],
+    selected: Selection,
+    model: Type[BaseModel],
+) -> Response:
+    """
+    JSON response with only the selected fields of each item, encoded by
+    `model` (the endpoint's response model), carrying over headers (ETag,
+    cursor) already set on the injected `response`.
+    """
+    adapter = _sparse_adapter(model, _selection_key(selected))
+    body = adapter.dump_json(adapter.validate_python([pick(item, selected) for item in items]))
+    sparse = Response(content=body, media_type="application/json")
+    for key, value in response.headers.items():
+        sparse.headers[key] = value
+    return sparse
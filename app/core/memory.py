@@ -0,0 +1,173 @@
+# app/core/memory.py
+"""
+Optional tracemalloc accounting of per-route memory high-water marks.
+
+With MEMORY_TRACKING=true every request records the peak traced allocation
+above what was allocated when it started. tracemalloc's peak is
+process-wide and can only be reset as a whole, so it is reset only when no
+other request is in flight; with concurrent requests the figure is an upper
+bound shared by the overlapping requests. Requests above
+MEMORY_LOG_THRESHOLD_MB are logged with their route and tenant, and
+/ops/memory lists per-route peaks, the largest requests and the top
+allocation sites.
+
+tracemalloc itself slows allocation-heavy code noticeably; enable it to
+find the culprit, not permanently.
+"""
+import heapq
+import logging
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+LARGEST_KEPT = 20
+
+
+class MemoryTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # min-heap of (peak_bytes, seq, details) for the largest requests
+        self.largest: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._seq = 0
+
+    def start(self) -> int:
+        with self._lock:
+            if self.in_flight == 0:
+                tracemalloc.reset_peak()
+            self.in_flight += 1
+            return tracemalloc.get_traced_memory()[0]
+
+    def finish(self, baseline: int, method: str, route: str, tenant: str) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes = max(peak - baseline, 0)
+        with self._lock:
+            self.in_flight -= 1
+            stats = self.routes.get((method, route))
+            if stats is None:
+                stats = self.routes[(method, route)] = {
+                    "requests": 0, "peak_bytes_total": 0, "peak_bytes_max": 0, "max_tenant": None,
+                }
+            stats["requests"] += 1
+            stats["peak_bytes_total"] += peak_bytes
+            if peak_bytes >= stats["peak_bytes_max"]:
+                stats["peak_bytes_max"] = peak_bytes
+                stats["max_tenant"] = tenant
+
+            self._seq += 1
+            entry = (
+                peak_bytes,
+                self._seq,
+                {
+                    "method": method,
+                    "route": route,
+                    "tenant": tenant,
+                    "peak_bytes": peak_bytes,
+                    "concurrent": self.in_flight,
+                    "at": time.time(),
+                },
+            )
+            if len(self.largest) < LARGEST_KEPT:
+                heapq.heappush(self.largest, entry)
+            elif peak_bytes > self.largest[0][0]:
+                heapq.heapreplace(self.largest, entry)
+        return peak_bytes
+
+    def report(self, limit: int = 25, group_by: str = "lineno") -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            return {"enabled": False}
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        with self._lock:
+            routes = [
+                {
+                    "method": method,
+                    "route": route,
+                    "requests": s["requests"],
+                    "peak_bytes_max": s["peak_bytes_max"],
+                    "peak_bytes_avg": s["peak_bytes_total"] // s["requests"],
+                    "max_tenant": s["max_tenant"],
+                }
+                for (method, route), s in self.routes.items()
+            ]
+            largest = [details for _, _, details in sorted(self.largest, reverse=True)]
+        routes.sort(key=lambda r: r["peak_bytes_max"], reverse=True)
+        return {
+            "enabled": True,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "routes": routes,
+            "largest_requests": largest,
+            "top_allocations": [
+                {
+                    "site": str(stat.traceback[0]),
+                    "traceback": [str(frame) for frame in stat.traceback]
+                    if group_by == "traceback" else None,
+                    "bytes": stat.size,
+                    "blocks": stat.count,
+                }
+                for stat in snapshot.statistics(group_by)[:limit]
+            ],
+        }
+
+
+tracker = MemoryTracker()
+
+
+def _tenant(scope) -> str:
+    cid = scope.get("path_params", {}).get("cid")
+    if cid:
+        return cid
+    # routes like /caterer/profile take the tenant from the access token
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode()
+    if authorization.lower().startswith("bearer "):
+        try:
+            claims = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algorithm])
+            return claims.get("tid") or "-"
+        except JWTError:
+            pass
+    return "-"
+
+
+def start_tracing() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(settings.memory_trace_frames)
+
+
+class MemoryMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        baseline = tracker.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = route_template(scope)
+            tenant = _tenant(scope)
+            peak = tracker.finish(baseline, scope["method"], route, tenant)
+            if peak >= settings.memory_log_threshold_mb * MB:
+                logger.warning(
+                    "High memory request: %s %s tenant=%s peak=%.1fMB",
+                    scope["method"], route, tenant, peak / MB,
+                )
@@ -0,0 +1,226 @@
+# app/core/metrics.py
+"""
+Per-route request metrics in Prometheus text format.
+
+A pure ASGI middleware times every request and labels it by route template
+(`/caterer/{cid}/orders`, never the raw path, so label cardinality stays
+bounded); requests served by a mount, such as the static files, are
+labelled by the mount path.
+
+Time spent in CockroachDB and Mongo is accumulated per request through a
+context variable fed by SQLAlchemy cursor events and a pymongo
+CommandListener; sync endpoints run in the threadpool with a copy of the
+request context, so their queries are attributed too.
+
+Metrics are per worker process; scrape each worker or aggregate upstream.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from sqlalchemy import event
+
+# Upper bounds (seconds) of the latency histograms
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LABELS = ("cockroach", "mongo")
+
+# Database seconds spent by the current request, keyed by DB_LABELS
+_db_time: ContextVar[Optional[Dict[str, float]]] = ContextVar("db_time", default=None)
+
+RouteKey = Tuple[str, str]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight: Dict[str, int] = {}
+        self.statuses: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[RouteKey, _Histogram] = {}
+        self.db_latency: Dict[Tuple[str, str, str], _Histogram] = {}
+
+    def start(self, method: str) -> None:
+        with self._lock:
+            self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def finish(
+        self,
+        key: RouteKey,
+        status: int,
+        seconds: float,
+        db_seconds: Dict[str, float],
+    ) -> None:
+        with self._lock:
+            self.in_flight[key[0]] -= 1
+            status_key = (*key, str(status))
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+            hist = self.latency.get(key)
+            if hist is None:
+                hist = self.latency[key] = _Histogram()
+            hist.observe(seconds)
+            for db in DB_LABELS:
+                db_key = (*key, db)
+                hist = self.db_latency.get(db_key)
+                if hist is None:
+                    hist = self.db_latency[db_key] = _Histogram()
+                hist.observe(db_seconds.get(db, 0.0))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP http_requests_in_flight Requests currently being served.")
+            lines.append("# TYPE http_requests_in_flight gauge")
+            for method, value in sorted(self.in_flight.items()):
+                lines.append(f'http_requests_in_flight{{method="{method}"}} {value}')
+
+            lines.append("# HELP http_requests_total Requests served, by status code.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status), value in sorted(self.statuses.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {value}'
+                )
+
+            _render_histograms(
+                lines,
+                "http_request_duration_seconds",
+                "Request latency.",
+                {(f'method="{m}",route="{r}"'): h for (m, r), h in self.latency.items()},
+            )
+            _render_histograms(
+                lines,
+                "http_request_db_seconds",
+                "Database time per request.",
+                {
+                    (f'method="{m}",route="{r}",db="{db}"'): h
+                    for (m, r, db), h in self.db_latency.items()
+                },
+            )
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _render_histograms(
+    lines: List[str], name: str, help_text: str, series: Dict[str, _Histogram]
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, hist in sorted(series.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, hist.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{labels}}} {hist.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+registry = Registry()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # a Mount doesn't set "route"; it extends root_path by the mount path and
+    # records the app's own root_path in app_root_path
+    if "app_root_path" in scope:
+        return scope["root_path"][len(scope["app_root_path"]):] or "unmatched"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # the route is only known after routing, so in-flight is per method
+        method = scope["method"]
+        status_holder = {"status": 500}
+        db_seconds: Dict[str, float] = {}
+        token = _db_time.set(db_seconds)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        registry.start(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _db_time.reset(token)
+            registry.finish(
+                (method, route_template(scope)),
+                status_holder["status"],
+                elapsed,
+                db_seconds,
+            )
+
+
+def _add_db_time(db: str, seconds: float) -> None:
+    current = _db_time.get()
+    if current is not None:
+        current[db] = current.get(db, 0.0) + seconds
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attribute SQL statement time on `engine` to the current request.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        _add_db_time("cockroach", time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            started = conn.info["query_started"].pop()
+            _add_db_time("cockroach", time.perf_counter() - started)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Attribute Mongo command time to the current request.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        _add_db_time("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        _add_db_time("mongo", event.duration_micros / 1_000_000)
+
+
+mongo_command_timer = MongoCommandTimer()
@@ -0,0 +1,104 @@
+# app/core/pagination.py
+"""
+Opaque keyset ("cursor") pagination for Mongo listings.
+
+A cursor encodes the sort field, direction and the (sort value, _id) of the
+last document on the previous page. The next page is fetched with a range
+predicate on that pair, so it can walk the (caterer_id, field, _id) index
+directly instead of skipping over every earlier document. When the sort field
+is unique within the listing (`unique=True`), _id is left out of the sort and
+the predicate, and the field's unique index serves the walk.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson.objectid import ObjectId
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_field: str, direction: int, value: Any, doc_id: str) -> str:
+    if isinstance(value, datetime):
+        payload = {"f": sort_field, "d": direction, "t": "dt", "v": value.isoformat(), "id": doc_id}
+    else:
+        payload = {"f": sort_field, "d": direction, "v": value, "id": doc_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str, direction: int) -> Tuple[Any, ObjectId]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["v"]
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+        doc_id = ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if payload.get("f") != sort_field or payload.get("d") != direction:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor was issued for a different sort order",
+        )
+    return value, doc_id
+
+
+def cursor_query(
+    query: Dict[str, Any],
+    sort_field: str,
+    direction: int,
+    token: Optional[str],
+    unique: bool = False,
+) -> Dict[str, Any]:
+    """
+    Extend `query` so it only matches documents after the cursor position.
+    """
+    if not token:
+        return query
+    value, doc_id = decode_cursor(token, sort_field, direction)
+    op = "$gt" if direction == 1 else "$lt"
+    if unique:
+        return {**query, sort_field: {op: value}}
+    return {
+        **query,
+        "$or": [
+            {sort_field: {op: value}},
+            {sort_field: value, "_id": {op: doc_id}},
+        ],
+    }
+
+
+def cursor_sort(sort_field: str, direction: int, unique: bool = False) -> List[Tuple[str, int]]:
+    if unique:
+        return [(sort_field, direction)]
+    # _id breaks ties so the order is total and every document appears once
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def next_cursor(
+    page: List[Dict[str, Any]], sort_field: str, direction: int, limit: int
+) -> Optional[str]:
+    """
+    Cursor for the page after `page` (already shaped for the response, with
+    "id" and the sort field), or None when this was the last page.
+    """
+    if len(page) < limit:
+        return None
+    last = page[-1]
+    return encode_cursor(sort_field, direction, last[sort_field], last["id"])
+
+
+def set_next_cursor(
+    response: Response,
+    page: List[Dict[str, Any]],
+    sort_field: str,
+    direction: int,
+    limit: int,
+) -> None:
+    token = next_cursor(page, sort_field, direction, limit)
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
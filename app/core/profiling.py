@@ -0,0 +1,256 @@
+# app/core/profiling.py
+"""
+Opt-in profiling of a single request.
+
+Send `X-Profile: 1` together with either the ops token (X-Ops-Token) or an
+OWNER's bearer token. The request is then served under a sampling profiler
+and the response carries `X-Profile-Id`; fetch the result from
+`GET /profiles/{id}` (same credentials) as collapsed stacks, which
+flamegraph.pl, speedscope and inferno read directly. Send `X-Profile: inline`
+instead to get the stacks back as the response body (the endpoint's own
+status is in `X-Profile-Status`; its body is dropped).
+
+Stored profiles live in the "profiles" cache. With the default in-process
+backend only the worker that served the request has them, so behind several
+workers `GET /profiles/{id}` mostly 404s; use CACHE_BACKEND=redis there, or
+inline profiles.
+
+The sampler walks every thread of the worker, because sync endpoints run on
+a threadpool thread that isn't known up front; only stacks that pass
+through application code are kept. Requests served concurrently by the same
+worker would show up in the profile, so a tenant (bearer token) can only
+profile while the worker has no other request in flight, and the samples are
+discarded if another request starts before the profile ends. The ops token
+is not limited this way. One profile runs at a time per worker. Requests
+without the header only pay for a header lookup.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import get_cache
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+MAX_DEPTH = 128
+OVERLAPPED = "Other requests ran during the profile; retry while the worker is idle"
+
+profile_store = get_cache("profiles")
+_busy = threading.Lock()
+
+
+class Sampler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._labels: Dict[Tuple[object, int], str] = {}
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        key = (code, frame.f_lineno)
+        label = self._labels.get(key)
+        if label is None:
+            filename = code.co_filename
+            if filename.startswith(APP_ROOT):
+                filename = "app/" + filename[len(APP_ROOT):]
+            else:
+                filename = os.path.basename(filename)
+            label = f"{code.co_name} ({filename}:{frame.f_lineno})".replace(";", ",")
+            self._labels[key] = label
+        return label
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack: List[str] = []
+                in_app = False
+                depth = 0
+                while frame is not None and depth < MAX_DEPTH:
+                    if frame.f_code.co_filename.startswith(APP_ROOT):
+                        in_app = True
+                    stack.append(self._label(frame))
+                    frame = frame.f_back
+                    depth += 1
+                if in_app:
+                    self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _authorize(headers: Dict[bytes, bytes]) -> Optional[str]:
+    """
+    Return the tenant allowed to read the profile ("*" for the ops token),
+    or raise HTTPException.
+    """
+    ops_token = headers.get(b"x-ops-token")
+    if ops_token is not None:
+        if settings.ops_token and hmac.compare_digest(ops_token.decode(), settings.ops_token):
+            return "*"
+        raise HTTPException(status_code=403, detail="Invalid ops token")
+
+    authorization = headers.get(b"authorization", b"").decode()
+    if not authorization.lower().startswith("bearer "):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    # the same dependency chain the owner-only endpoints use
+    from app.db.cockroach import SessionLocal
+    from app.modules.auth.api.deps import (
+        get_current_active_user,
+        get_current_owner,
+        get_current_token_data,
+        get_current_user,
+    )
+
+    token_data = get_current_token_data(authorization[7:])
+    db = SessionLocal()
+    try:
+        user = get_current_owner(get_current_active_user(get_current_user(token_data, db)))
+        return user.caterer_id
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+        # requests in flight / started in this worker; only touched from the
+        # event loop, so plain ints are enough
+        self.in_flight = 0
+        self.started = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.in_flight += 1
+        self.started += 1
+        try:
+            await self._serve(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _serve(self, scope, receive, send):
+        headers = dict(scope["headers"])
+        mode = headers.get(PROFILE_HEADER, b"0")
+        if mode in (b"0", b""):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            tenant = await run_in_threadpool(_authorize, headers)
+        except HTTPException as exc:
+            await self.app(scope, receive, _with_header(send, b"x-profile", f"denied: {exc.detail}"))
+            return
+        # a tenant may only see its own request's stacks
+        if (tenant != "*" and self.in_flight > 1) or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"x-profile", "busy"))
+            return
+
+        started_before = self.started
+        inline = mode == b"inline"
+        response: Dict[str, Any] = {}
+        profile_id = uuid.uuid4().hex
+        sampler = Sampler(settings.profile_interval_ms / 1000)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            if inline:
+                await self.app(scope, receive, _capture(response))
+            else:
+                await self.app(scope, receive, _with_header(send, PROFILE_ID_HEADER, profile_id))
+        finally:
+            sampler.stop()
+            _busy.release()
+            overlapped = tenant != "*" and self.started != started_before
+            profile = {
+                "tenant": tenant,
+                "method": scope["method"],
+                "path": scope["path"],
+                "seconds": round(time.perf_counter() - started, 6),
+                "samples": sampler.sample_count,
+                "interval_ms": settings.profile_interval_ms,
+                # None: other requests ran meanwhile and may be in the samples
+                "collapsed": None if overlapped else sampler.collapsed(),
+            }
+            if not inline:
+                profile_store.set(profile_id, profile, ttl=settings.profile_ttl_seconds)
+        if not inline:
+            return
+
+        status, body = 200, profile["collapsed"]
+        if body is None:
+            status, body = 409, OVERLAPPED
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"x-profile-status", str(response.get("status", 500)).encode()),
+                *((k.lower().encode(), v.encode("latin-1")) for k, v in profile_headers(profile).items()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body.encode()})
+
+
+def _with_header(send, name: bytes, value: str):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message["headers"] = [*message.get("headers", []), (name, value.encode("latin-1"))]
+        await send(message)
+
+    return wrapped
+
+
+def _capture(response: Dict[str, Any]):
+    """
+    A `send` that keeps the response status and drops the response itself.
+    """
+
+    async def capture(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+
+    return capture
+
+
+def profile_headers(profile: dict) -> Dict[str, str]:
+    return {
+        "X-Profile-Request": f"{profile['method']} {profile['path']}",
+        "X-Profile-Seconds": str(profile["seconds"]),
+        "X-Profile-Samples": str(profile["samples"]),
+        "X-Profile-Interval-Ms": str(profile["interval_ms"]),
+    }
+
+
+def read_profile(profile_id: str, headers: Dict[bytes, bytes]) -> dict:
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    tenant = _authorize(headers)
+    if tenant != "*" and tenant != profile["tenant"]:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    if profile["collapsed"] is None:
+        raise HTTPException(status_code=409, detail=OVERLAPPED)
+    return profile
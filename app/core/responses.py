@@ -0,0 +1,28 @@
+# app/core/responses.py
+"""
+JSON rendering for responses FastAPI doesn't serialize itself.
+
+Routes with a `response_model` are validated and written straight to JSON
+bytes by pydantic-core, which is faster than any python-side encoder, so they
+keep FastAPI's default. Setting a custom `default_response_class` on the app
+would switch that path off (FastAPI then dumps to python objects and hands
+them to the class), so this class is used where FastAPI would otherwise fall
+back to `jsonable_encoder` + `json.dumps`: hand-built responses such as the
+sparse `fields=` lists, and routers whose endpoints return plain dicts.
+"""
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-rendered JSONResponse. Types orjson doesn't know (Decimal,
+    ObjectId, sets, models) go through `jsonable_encoder`, so the output
+    matches the stock JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
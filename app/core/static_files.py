@@ -0,0 +1,124 @@
+# app/core/static_files.py
+import hashlib
+import mimetypes
+import os
+import stat
+from typing import List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import acceptable_encodings
+from app.utils.images import VARIANTS, variant_filename
+
+# Files under these prefixes are never rewritten in place (every upload gets a
+# fresh name), so browsers may cache them for a year without revalidating.
+IMMUTABLE_PREFIXES = ("profile_images/",)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+# Precompressed siblings by encoding: "app.js" -> "app.js.br"; which one is
+# served follows the client's Accept-Encoding preferences
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with long-lived cache headers, strong ETags for immutable
+    files, and support for serving pre-resized (?variant=thumb) or
+    precompressed (.br / .gz) siblings when they exist on disk.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        try:
+            for candidate, encoding in self._candidates(path, scope):
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, candidate
+                )
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    # The plain file stands in for its .br/.gz siblings, so
+                    # caches must key it on Accept-Encoding as well.
+                    vary = encoding is not None or (
+                        candidate == path and await self._has_precompressed(path)
+                    )
+                    return self._cached_file_response(
+                        full_path, stat_result, scope, candidate, encoding, vary
+                    )
+        except (OSError, ValueError):
+            # Let StaticFiles map bad paths to the right error response
+            pass
+        return await super().get_response(path, scope)
+
+    def _candidates(self, path: str, scope: Scope) -> List[Tuple[str, Optional[str]]]:
+        candidates: List[Tuple[str, Optional[str]]] = []
+
+        variant = QueryParams(scope.get("query_string", b"")).get("variant")
+        if variant in VARIANTS:
+            head, tail = os.path.split(path)
+            stem = os.path.splitext(tail)[0]
+            candidates.append((os.path.join(head, variant_filename(stem, variant)), None))
+
+        if self._precompressible(path):
+            accepted = acceptable_encodings(Headers(scope=scope).get("accept-encoding", ""))
+            for encoding in accepted:
+                candidates.append((path + PRECOMPRESSED[encoding], encoding))
+
+        candidates.append((path, None))
+        return candidates
+
+    @staticmethod
+    def _precompressible(path: str) -> bool:
+        media_type, _ = mimetypes.guess_type(path)
+        return bool(media_type) and not media_type.startswith("image/")
+
+    async def _has_precompressed(self, path: str) -> bool:
+        if not self._precompressible(path):
+            return False
+        for suffix in PRECOMPRESSED.values():
+            _, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                return True
+        return False
+
+    def _cached_file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        served_path: str,
+        encoding: Optional[str],
+        vary: bool,
+    ) -> Response:
+        headers = {}
+        if served_path.startswith(IMMUTABLE_PREFIXES):
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+            # Content never changes under a given name, so the name is a
+            # strong validator on its own.
+            digest = hashlib.sha1(served_path.encode()).hexdigest()
+            headers["etag"] = f'"{digest}"'
+        else:
+            headers["cache-control"] = DEFAULT_CACHE_CONTROL
+
+        media_type = None
+        if vary:
+            headers["vary"] = "Accept-Encoding"
+        if encoding:
+            headers["content-encoding"] = encoding
+            # Describe the decoded body, not the .br/.gz container
+            media_type, _ = mimetypes.guess_type(served_path.rsplit(".", 1)[0])
+
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            headers=headers,
+            media_type=media_type,
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
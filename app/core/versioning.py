@@ -0,0 +1,62 @@
+# app/core/versioning.py
+"""
+Per-tenant version tokens for cacheable resources.
+
+Every write endpoint bumps the token of the resource it touches, so readers
+can tell whether anything changed with a single primary-key lookup instead
+of re-running the full query.
+"""
+from typing import Dict, Iterable
+from uuid import uuid4
+
+from pymongo import UpdateOne
+
+VERSIONS_COLLECTION = "resource_versions"
+
+# Resources that carry a version token
+PROFILE = "profile"
+CUSTOMERS = "customers"
+MENU = "menu"
+PACKAGES = "packages"
+ORDERS = "orders"
+
+INITIAL_VERSION = "0"
+
+
+def _version_id(cid: str, resource: str) -> str:
+    return f"{cid}:{resource}"
+
+
+def get_versions(mongo_db, cid: str, resources: Iterable[str]) -> Dict[str, str]:
+    """
+    Fetch the current tokens for several resources of one tenant in one query.
+    Resources that were never written report INITIAL_VERSION.
+    """
+    resources = list(resources)
+    ids = [_version_id(cid, r) for r in resources]
+    found = {
+        doc["_id"]: doc["v"]
+        for doc in mongo_db[VERSIONS_COLLECTION].find({"_id": {"$in": ids}})
+    }
+    return {r: found.get(_version_id(cid, r), INITIAL_VERSION) for r in resources}
+
+
+def get_version(mongo_db, cid: str, resource: str) -> str:
+    return get_versions(mongo_db, cid, [resource])[resource]
+
+
+def bump_version(mongo_db, cid: str, *resources: str) -> None:
+    """
+    Give each resource a fresh random token. Random tokens (rather than a
+    counter) never repeat, even if the versions collection is wiped.
+    """
+    ops = [
+        UpdateOne(
+            {"_id": _version_id(cid, r)},
+            {"$set": {"v": uuid4().hex}},
+            upsert=True,
+        )
+        for r in resources
+    ]
+    if ops:
+        mongo_db[VERSIONS_COLLECTION].bulk_write(ops, ordered=False)
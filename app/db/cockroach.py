@@ -10,14 +10,28 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedQueuePool
 
 DATABASE_URL = str(settings.cockroach_database_url)
 
+connect_args = {"sslmode": settings.db_sslmode}
+if settings.db_statement_timeout_ms:
+    # Server-side cap for every statement on every pooled connection
+    connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"sslmode": "require"},
+    connect_args=connect_args,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
     future=True,
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     bind=engine,
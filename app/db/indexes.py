@@ -0,0 +1,167 @@
+# app/db/indexes.py
+"""
+Declarative registry of the Mongo indexes the routers rely on, plus a report
+that shows how each query shape is actually executed.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    name: str
+    unique: bool = False
+
+
+# Unique indexes double as the keyset index for their own key: names are
+# unique per tenant (items: per category), so listings by name need no _id
+# tiebreak (see app/core/pagination.py) and no second index that only adds one.
+INDEXES: List[IndexSpec] = [
+    # menu_categories: duplicate-name check, keyset listing by name / created_at
+    IndexSpec("menu_categories", (("caterer_id", 1), ("name", 1)),
+              "uq_menu_cat_caterer_name", unique=True),
+    IndexSpec("menu_categories", (("caterer_id", 1), ("created_at", 1), ("_id", 1)),
+              "ix_menu_cat_caterer_created_id"),
+    # menu_items: duplicate check, per-category listing, tenant-wide listing
+    IndexSpec("menu_items", (("caterer_id", 1), ("category_id", 1), ("name", 1)),
+              "uq_item_caterer_cat_name", unique=True),
+    IndexSpec("menu_items", (("caterer_id", 1), ("name", 1), ("_id", 1)),
+              "ix_item_caterer_name_id"),
+    IndexSpec("menu_items", (("caterer_id", 1), ("created_at", 1), ("_id", 1)),
+              "ix_item_caterer_created_id"),
+    # packages: duplicate-name check, keyset listing by name / created_at
+    IndexSpec("packages", (("caterer_id", 1), ("name", 1)),
+              "uq_package_caterer_name", unique=True),
+    IndexSpec("packages", (("caterer_id", 1), ("created_at", 1), ("_id", 1)),
+              "ix_package_caterer_created_id"),
+    # search: multikey prefix index (see app/modules/package/search.py)
+    IndexSpec("menu_items", (("caterer_id", 1), ("search_terms", 1)),
+              "ix_item_caterer_search"),
+    IndexSpec("packages", (("caterer_id", 1), ("search_terms", 1)),
+              "ix_package_caterer_search"),
+    # events: fetched by order (single order and $in over a page of orders)
+    IndexSpec("events", (("order_id", 1),), "ix_event_order"),
+]
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    label: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[Dict[str, int]] = field(default=None)
+
+
+_CID = "__index_report__"
+
+# One entry per find() the routers issue, with placeholder values
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("list categories by name", "menu_categories", {"caterer_id": _CID}, {"name": 1}),
+    QueryShape("list categories by created_at", "menu_categories", {"caterer_id": _CID}, {"created_at": 1, "_id": 1}),
+    QueryShape("category duplicate check", "menu_categories", {"caterer_id": _CID, "name": "x"}),
+    QueryShape("list items by name", "menu_items", {"caterer_id": _CID}, {"name": 1, "_id": 1}),
+    QueryShape("list items by created_at", "menu_items", {"caterer_id": _CID}, {"created_at": 1, "_id": 1}),
+    QueryShape("items of a category", "menu_items", {"caterer_id": _CID, "category_id": "x"}, {"name": 1}),
+    QueryShape("item duplicate check", "menu_items", {"caterer_id": _CID, "category_id": "x", "name": "x"}),
+    QueryShape("list packages by name", "packages", {"caterer_id": _CID}, {"name": 1}),
+    QueryShape("list packages by created_at", "packages", {"caterer_id": _CID}, {"created_at": 1, "_id": 1}),
+    QueryShape("package duplicate check", "packages", {"caterer_id": _CID, "name": "x"}),
+    QueryShape("search items", "menu_items", {"caterer_id": _CID, "search_terms": {"$all": ["pa", "ti"]}}),
+    QueryShape("search packages", "packages", {"caterer_id": _CID, "search_terms": {"$all": ["pa", "ti"]}}),
+    QueryShape("events of an order", "events", {"order_id": "x"}),
+    QueryShape("events of many orders", "events", {"order_id": {"$in": ["x", "y"]}}),
+]
+
+
+def ensure_indexes(mongo_db) -> Dict[str, str]:
+    """
+    Create every registered index (a no-op for ones that already exist).
+    A failure on one index, e.g. a unique index over existing duplicates, is
+    logged and reported without stopping the rest. Indexes found on the
+    registered collections but missing from the registry (left over from an
+    older release, or added by hand) are reported as "unregistered" under
+    "<collection>.<name>"; they still cost every write, so drop them once
+    nothing relies on them.
+    """
+    results: Dict[str, str] = {}
+    for spec in INDEXES:
+        try:
+            mongo_db[spec.collection].create_index(
+                list(spec.keys), name=spec.name, unique=spec.unique
+            )
+            results[spec.name] = "ok"
+        except OperationFailure as exc:
+            logger.warning("Could not create index %s on %s: %s",
+                           spec.name, spec.collection, exc)
+            results[spec.name] = f"failed: {exc}"
+
+    registered = {(spec.collection, spec.name) for spec in INDEXES}
+    for collection in sorted({spec.collection for spec in INDEXES}):
+        for name in mongo_db[collection].index_information():
+            if name != "_id_" and (collection, name) not in registered:
+                logger.warning("Index %s on %s is not in the registry", name, collection)
+                results[f"{collection}.{name}"] = "unregistered"
+    return results
+
+
+def _plan_summary(plan: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Collect stage names and index names from a (nested) winning plan."""
+    stages: List[str] = []
+    indexes: List[str] = []
+    todo = [plan]
+    while todo:
+        node = todo.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "indexName" in node:
+            indexes.append(node["indexName"])
+        if "queryPlan" in node:
+            todo.append(node["queryPlan"])
+        if "inputStage" in node:
+            todo.append(node["inputStage"])
+        todo.extend(node.get("inputStages", []))
+    return stages, indexes
+
+
+def index_report(mongo_db) -> Dict[str, Any]:
+    """
+    $indexStats usage counters per collection, and the winning plan of each
+    registered query shape, flagging collection scans and in-memory sorts.
+    """
+    collections = sorted({spec.collection for spec in INDEXES})
+    usage: Dict[str, List[Dict[str, Any]]] = {}
+    for name in collections:
+        usage[name] = [
+            {
+                "name": stat["name"],
+                "ops": stat["accesses"]["ops"],
+                "since": stat["accesses"]["since"],
+            }
+            for stat in mongo_db[name].aggregate([{"$indexStats": {}}])
+        ]
+
+    shapes = []
+    for shape in QUERY_SHAPES:
+        command: Dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+        if shape.sort:
+            command["sort"] = shape.sort
+        explained = mongo_db.command("explain", command, verbosity="queryPlanner")
+        stages, indexes = _plan_summary(explained["queryPlanner"]["winningPlan"])
+        shapes.append(
+            {
+                "query": shape.label,
+                "collection": shape.collection,
+                "indexes": indexes,
+                "collscan": "COLLSCAN" in stages,
+                "in_memory_sort": "SORT" in stages,
+            }
+        )
+
+    return {"index_usage": usage, "query_plans": shapes}
@@ -1,14 +1,168 @@
 # app/db/mongo.py
-from pymongo import MongoClient
+"""
+One MongoClient per worker process.
+
+The app lifespan opens the client (and warms its pool) when a worker starts
+and closes it on shutdown. A client inherited across fork() is never reused:
+its sockets and monitor threads belong to the parent, so a process that finds
+a client created under another pid builds its own.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from pymongo import MongoClient, monitoring
+
 from app.core.config import settings
+from app.core.metrics import mongo_command_timer
+
+DB_NAME = "catertrack"
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection-pool counters for this process (all servers combined).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.connections_open = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open -= 1
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        duration = getattr(event, "duration", None) or 0.0
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.checkout_seconds_total += duration
+            self.checkout_seconds_max = max(self.checkout_seconds_max, duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_pool_size": settings.mongo_max_pool_size,
+                "min_pool_size": settings.mongo_min_pool_size,
+                "connections_open": self.connections_open,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_seconds_total": round(self.checkout_seconds_total, 6),
+                "checkout_seconds_max": round(self.checkout_seconds_max, 6),
+                "checkout_seconds_avg": (
+                    round(self.checkout_seconds_total / self.checkouts, 6)
+                    if self.checkouts else None
+                ),
+                "pool_clears": self.pool_clears,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+_client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _client_options() -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "event_listeners": [pool_metrics, mongo_command_timer],
+    }
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    if settings.mongo_write_concern is not None:
+        w = settings.mongo_write_concern
+        options["w"] = int(w) if w.isdigit() else w
+    if settings.mongo_wtimeout_ms is not None:
+        options["wTimeoutMS"] = settings.mongo_wtimeout_ms
+    return options
 
-_client = None
 
 def get_mongo_client() -> MongoClient:
-    global _client
-    if _client is None:
-        _client = MongoClient(settings.mongo_uri)
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                if _client_pid != pid:
+                    # inherited from the parent; counts are the parent's too
+                    pool_metrics.reset()
+                _client = MongoClient(settings.mongo_uri, **_client_options())
+                _client_pid = pid
     return _client
 
-def get_mongo_db(db_name: str = "catertrack"):
+
+def connect_mongo() -> None:
+    """
+    Create this process's client and open its first connection, so the
+    first request doesn't pay for server selection and the handshake.
+    """
+    get_mongo_client().admin.command("ping")
+
+
+def close_mongo() -> None:
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def get_mongo_db(db_name: str = DB_NAME):
     return get_mongo_client()[db_name]
@@ -0,0 +1,102 @@
+# app/db/pool.py
+"""
+QueuePool that keeps checkout statistics, so pool size / overflow / timeout
+can be tuned from numbers rather than guessed.
+
+`waiting` is the number of threads currently blocked waiting for a connection
+(no idle connection and no overflow left when they asked); checkout latency
+covers the wait plus, when the pool grows, opening the new connection
+(pre-ping time is not included).
+"""
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout latency histogram
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args: Any, **kw: Any):
+        super().__init__(*args, **kw)
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outer call
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            return super()._do_get()
+
+        self._local.depth = 1
+        blocks = self._would_block()
+        if blocks:
+            with self._stats_lock:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._local.depth = 0
+            with self._stats_lock:
+                self.waiting -= blocks
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_seconds += elapsed
+                self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+                self.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def _would_block(self) -> bool:
+        # same test QueuePool._do_get makes before waiting on the queue
+        overflow_left = self._max_overflow == -1 or self._overflow < self._max_overflow
+        return self._pool.qsize() == 0 and not overflow_left
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), self.buckets):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "timeout": self._timeout,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "checkout_seconds_total": round(self.wait_seconds, 6),
+                "checkout_seconds_max": round(self.max_wait_seconds, 6),
+                "checkout_seconds_avg": (
+                    round(self.wait_seconds / self.checkouts, 6) if self.checkouts else None
+                ),
+                "checkout_seconds_histogram": histogram,
+            }
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
@@ -0,0 +1,19 @@
+# app/db/schema.py
+"""
+SQL schema creation, run as an explicit step rather than on every worker
+import (`python -m app.manage create-schema`; dev only, use Alembic in prod).
+"""
+from typing import List
+
+from app.db.cockroach import Base, engine
+
+
+def create_schema() -> List[str]:
+    # register every model on Base.metadata
+    import app.modules.auth.models  # noqa: F401
+    import app.modules.caterer.models  # noqa: F401
+    import app.modules.customer.models  # noqa: F401
+    import app.modules.order.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    return sorted(Base.metadata.tables)
@@ -0,0 +1,82 @@
+# app/db/stale.py
+"""
+Follower ("stale") reads for dashboard queries.
+
+CockroachDB can answer a read-only transaction from the nearest replica
+instead of the leaseholder when it reads at a timestamp slightly in the past.
+Such reads take load off the leaseholders and never wait on, or restart
+because of, in-flight writes such as payment entry.
+
+Sessions from StaleSessionLocal begin every transaction with
+`SET TRANSACTION AS OF SYSTEM TIME <DB_STALE_READ_AS_OF>`, which is either
+`follower_read_timestamp()` (the freshest timestamp followers can serve, a
+few seconds old) or a fixed bound such as `-10s`. They are read-only.
+
+Read endpoints take their session from `get_read_db`; a request gets a
+follower read with `X-Read-Consistency: stale`, or by default when its route
+is listed in DB_STALE_READ_ROUTES (`strong` opts back out). Results of a
+stale read may predate the resource version, so they are never cached and
+never carry an ETag.
+"""
+import re
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.cockroach import engine
+
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+_INTERVAL = re.compile(r"-\d+(\.\d+)?(us|ms|s|m|h)")
+
+
+def as_of_clause(value: str) -> str:
+    if value == "follower_read_timestamp()":
+        return value
+    if _INTERVAL.fullmatch(value):
+        return f"'{value}'"
+    raise RuntimeError(
+        f"DB_STALE_READ_AS_OF must be follower_read_timestamp() or a negative interval like -10s, not {value!r}"
+    )
+
+
+AS_OF = as_of_clause(settings.db_stale_read_as_of)
+STALE_READ_ROUTES = frozenset(
+    name.strip() for name in settings.db_stale_read_routes.split(",") if name.strip()
+)
+
+StaleSessionLocal = sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    future=True,
+)
+
+
+@event.listens_for(StaleSessionLocal, "after_begin")
+def _read_as_of(session, transaction, connection) -> None:
+    connection.exec_driver_sql(f"SET TRANSACTION AS OF SYSTEM TIME {AS_OF}")
+
+
+def wants_stale_read(request: Request) -> bool:
+    requested = request.headers.get(READ_CONSISTENCY_HEADER, "").strip().lower()
+    if requested in ("stale", "strong"):
+        return requested == "stale"
+    route = request.scope.get("route")
+    return getattr(route, "name", None) in STALE_READ_ROUTES
+
+
+def mark_stale_read(request: Request, response: Response) -> bool:
+    """
+    Return whether this request is reading from followers. If it is, label
+    the response and drop the ETag already stamped on it: the body may be
+    older than the version the tag names.
+    """
+    stale = getattr(request.state, "stale_read", False)
+    if stale:
+        response.headers[READ_CONSISTENCY_HEADER] = "stale"
+        if "etag" in response.headers:
+            del response.headers["etag"]
+    return stale
@@ -1,9 +1,10 @@
 # app/dependencies/database.py
 from typing import Generator
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.orm import Session
 from app.db.cockroach import SessionLocal
 from app.db.mongo import get_mongo_db
+from app.db.stale import StaleSessionLocal, wants_stale_read
 
 def get_sql_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -12,5 +13,18 @@ def get_sql_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Session for read-only endpoints: a follower read when the request or
+    route opts in (see app/db/stale.py), the primary session otherwise.
+    """
+    stale = wants_stale_read(request)
+    request.state.stale_read = stale
+    db = StaleSessionLocal() if stale else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def get_mongo(db=Depends(get_mongo_db)):
     return db
@@ -1,13 +1,25 @@
 # app/main.py
 import app.core.patches
-import multiprocessing
+import logging
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import text
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.db.cockroach import Base, engine
+from app.core.memory import MemoryMiddleware, start_tracing
+from app.core.metrics import MetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.profiling import ProfilingMiddleware
+from app.core.static_files import CachedStaticFiles
+from app.db.indexes import ensure_indexes
+from app.db.mongo import close_mongo, connect_mongo, get_mongo_db
+from app.db.stale import READ_CONSISTENCY_HEADER
+from app.db.schema import create_schema
+from app.modules.order.idempotency import REPLAYED_HEADER
+from app.utils.images import shutdown_image_pool
 
 # import your auth router
 from app.modules.auth.api.auth import router as auth_router
@@ -15,18 +27,47 @@ from app.modules.caterer.api.profile import router as profile_router
 from app.modules.customer.api.customer import router as customer_router
 from app.modules.package.api.package import router as package_router
 from app.modules.order.api.order import router as order_router
+from app.modules.ops.api.ops import router as ops_router
+from app.modules.ops.api.profiles import router as profiles_router
 
 from app.modules.package.api.menu_import import router as menu_import_router
 
-# create all SQL tables (dev only; use Alembic in prod)
-# Base.metadata.drop_all(bind=engine)
+# SQL tables are created by `python -m app.manage create-schema` (dev only;
+# use Alembic in prod), or at startup with SQL_CREATE_SCHEMA=true.
 
-Base.metadata.create_all(bind=engine)
-app = FastAPI(title="CaterTrack Auth Service")
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.memory_tracking:
+        start_tracing()
+    if settings.sql_create_schema:
+        await run_in_threadpool(create_schema)
+    # per-worker Mongo client, opened after any fork
+    try:
+        await run_in_threadpool(connect_mongo)
+    except Exception:
+        # not fatal: the client retries server selection on first use
+        logger.exception("Mongo warm-up failed")
+    if settings.mongo_auto_indexes:
+        # idempotent; `python -m app.manage ensure-indexes` does the same
+        try:
+            await run_in_threadpool(ensure_indexes, get_mongo_db())
+        except Exception:
+            logger.exception("Mongo index provisioning failed")
+    yield
+    # the image variant pool is per worker process; reap it on shutdown
+    shutdown_image_pool()
+    close_mongo()
+
+
+app = FastAPI(title="CaterTrack Auth Service", lifespan=lifespan)
 
 app.mount(
     "/static",
-    StaticFiles(directory="static"),
+    CachedStaticFiles(directory="static"),
     name="static",
 )
 
@@ -46,7 +87,16 @@ app.add_middleware(
     allow_credentials=True,              # <— allow cookies/auth
     allow_methods=["*"],                 # <— allow GET, POST, PUT, DELETE, etc.
     allow_headers=["*"],                 # <— allow any headers (e.g. Authorization)
+    expose_headers=["ETag", NEXT_CURSOR_HEADER, READ_CONSISTENCY_HEADER, REPLAYED_HEADER],  # <— readable by browser clients
 )
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+if settings.memory_tracking:
+    app.add_middleware(MemoryMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+# outermost, so it times the whole stack; served on /ops/metrics
+app.add_middleware(MetricsMiddleware)
 # ─────────────────────────────────────────────────────────────────────────────
 
 # include the auth microservice router
@@ -57,13 +107,25 @@ app.include_router(package_router)
 app.include_router(order_router)
 
 app.include_router(menu_import_router)
+app.include_router(ops_router)
+app.include_router(profiles_router)
+
+
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    """
+    Liveness probe; touches no database so it answers as soon as the
+    worker is up.
+    """
+    return {"status": "ok"}
 
 
 if __name__ == "__main__":
+    # dev server: one process, reloads on change. Production runs
+    # `python -m app.serve` (multiple workers, recycling, graceful restarts).
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,                     # dev only
-        workers=multiprocessing.cpu_count(),
+        host=settings.host,
+        port=settings.port,
+        reload=True,
     )
@@ -0,0 +1,77 @@
+# app/manage.py
+"""
+Management commands, run outside the web workers:
+
+    python -m app.manage create-schema
+    python -m app.manage ensure-indexes
+    python -m app.manage index-report
+    python -m app.manage backfill-search
+    python -m app.manage migrate-event-menus
+    python -m app.manage purge-idempotency-keys
+"""
+import argparse
+import json
+
+from app.db.mongo import get_mongo_db
+
+
+def create_schema(args) -> None:
+    from app.db.schema import create_schema as apply
+
+    for table in apply():
+        print(f"{table}: ok")
+
+
+def ensure_indexes(args) -> None:
+    from app.db.indexes import ensure_indexes as apply
+
+    for name, result in apply(get_mongo_db()).items():
+        print(f"{name}: {result}")
+
+
+def index_report(args) -> None:
+    from app.db.indexes import index_report as report
+
+    print(json.dumps(report(get_mongo_db()), indent=2, default=str))
+
+
+def backfill_search(args) -> None:
+    from app.modules.package.search import backfill_search_terms
+
+    for collection, count in backfill_search_terms(get_mongo_db()).items():
+        print(f"{collection}: {count} documents indexed")
+
+
+def migrate_event_menus(args) -> None:
+    from app.modules.order.events import migrate_event_menus as migrate
+
+    counts = migrate(get_mongo_db())
+    print(f"events: {counts['events']} migrated")
+    print(f"snapshots: {counts['snapshots']} stored")
+
+
+def purge_idempotency_keys(args) -> None:
+    from app.modules.order.idempotency import purge_expired
+
+    print(f"idempotency_key: {purge_expired()} expired rows deleted")
+
+
+COMMANDS = {
+    "create-schema": create_schema,
+    "ensure-indexes": ensure_indexes,
+    "index-report": index_report,
+    "backfill-search": backfill_search,
+    "migrate-event-menus": migrate_event_menus,
+    "purge-idempotency-keys": purge_idempotency_keys,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
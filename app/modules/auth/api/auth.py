@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from uuid import uuid4
 
 from fastapi import (
-    APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
+    APIRouter, Depends, HTTPException, status, BackgroundTasks
 )
 from sqlalchemy.orm import Session
 from jose import jwt
@@ -16,8 +17,18 @@ from app.utils.email import EmailService
 from app.modules.auth.api.deps import get_current_owner
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
-mailer  = EmailService()
+
+
+# Built on first use rather than at import, so workers start serving sooner
+@lru_cache
+def get_pwd_ctx() -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache
+def get_mailer() -> EmailService:
+    return EmailService()
+
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -36,7 +47,7 @@ def register_tenant(
     db.add(cat); db.commit(); db.refresh(cat)
 
     # 2) create OWNER user
-    hashed = pwd_ctx.hash(payload.password)
+    hashed = get_pwd_ctx().hash(payload.password)
     user = models.User(
         caterer_id      = cat.id,
         email           = payload.email,
@@ -56,7 +67,7 @@ def login(
     db: Session = Depends(get_sql_db),
 ):
     user = db.query(models.User).filter_by(email=payload.email).first()
-    if not user or not pwd_ctx.verify(payload.password, user.hashed_password):
+    if not user or not get_pwd_ctx().verify(payload.password, user.hashed_password):
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
     token = create_access_token({
         "sub": user.id,
@@ -89,7 +100,7 @@ def invite_staff(
       <p><a href="{accept_url}">Click here to accept your invitation</a></p>
     """
     background.add_task(
-        mailer.send_email,
+        get_mailer().send_email,
         payload.email,
         "You’re invited to CaterTrack",
         html
@@ -97,18 +108,14 @@ def invite_staff(
     return token
 
 @router.post("/accept", response_model=schemas.Token)
-async def accept_invite(
-    request: Request,
+def accept_invite(
     payload: schemas.InviteAccept,
     db: Session = Depends(get_sql_db),
 ):
-    raw = await request.body()
-    print("── RAW BODY ──", raw)
-      
     inv = db.query(models.Invite).filter_by(token=payload.token, used=False).first()
     if not inv:
         raise HTTPException(404, "Invalid or expired invite")
-    hashed = pwd_ctx.hash(payload.password)
+    hashed = get_pwd_ctx().hash(payload.password)
     user = models.User(
         caterer_id      = inv.caterer_id,
         email           = inv.email,
@@ -148,7 +155,7 @@ def forgot_password(
       <p>Reset your password by clicking the link below (valid for 1 hour):</p>
       <p><a href="{reset_url}">Reset Password</a></p>
     """
-    background.add_task(mailer.send_email, payload.email, "Reset your CaterTrack password", html)
+    background.add_task(get_mailer().send_email, payload.email, "Reset your CaterTrack password", html)
     return "If that email is registered, you’ll get a reset link shortly"
 
 
@@ -161,7 +168,7 @@ def reset_password(
     if not pr or pr.expires_at < datetime.utcnow():
         raise HTTPException(400, "Invalid or expired reset token")
     user = db.query(models.User).get(pr.user_id)
-    user.hashed_password = pwd_ctx.hash(payload.password)
+    user.hashed_password = get_pwd_ctx().hash(payload.password)
     pr.used = True
     db.commit()
 
@@ -1,7 +1,8 @@
 # app/modules/auth/api/deps.py
 
-from typing import Literal
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Literal, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -76,3 +77,21 @@ def get_current_manager_or_owner(
     if current_user.role not in ("OWNER", "MANAGER"):
         raise HTTPException(status_code=403, detail="Requires MANAGER or OWNER role")
     return current_user
+
+
+def require_ops_token(
+    x_ops_token: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+) -> None:
+    """
+    Guard for operational endpoints (metrics, reports). Disabled entirely
+    unless OPS_TOKEN is configured. The token is sent as X-Ops-Token, or as
+    `Authorization: Bearer <token>` for scrapers that only support that.
+    """
+    if not settings.ops_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = x_ops_token
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token or not hmac.compare_digest(token, settings.ops_token):
+        raise HTTPException(status_code=403, detail="Invalid ops token")
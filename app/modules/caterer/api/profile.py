@@ -1,7 +1,5 @@
 # app/modules/caterer/api/profile.py
 
-import os
-import uuid
 from typing import Optional
 
 from fastapi import (
@@ -13,30 +11,68 @@ from fastapi import (
     File,
     Form,
     Request,
+    Response,
 )
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core import versioning
+from app.core.cache import get_cache, make_key
+from app.core.conditional import conditional_response, make_etag
 from app.modules.caterer import models, schemas
 from app.modules.auth.api.deps import get_current_user
-from app.dependencies.database import get_sql_db
+from app.db.stale import mark_stale_read
+from app.dependencies.database import get_read_db, get_sql_db, get_mongo_db
+from app.utils.images import store_profile_image
 
 router = APIRouter(
     prefix="/caterer/profile",
     tags=["caterer"],
 )
 
+# Profile rows keyed by (caterer_id, profile version); update_profile bumps it
+profile_cache = get_cache("profile")
+
+PROFILE_COLUMNS = (
+    "id", "name", "email", "contact", "address", "city", "state", "postal_code",
+    "description", "profile_image_url", "created_at", "updated_at",
+)
+
 
 @router.get("", response_model=schemas.CatererOut)
 def view_profile(
+    request: Request,
+    response: Response,
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_sql_db),
+    db: Session = Depends(get_read_db),
+    mongo_db=Depends(get_mongo_db),
 ):
-    caterer = db.query(models.Caterer).filter_by(id=current_user.caterer_id).first()
+    """
+    The caller's caterer profile. Supports follower reads
+    (X-Read-Consistency: stale).
+    """
+    cid = current_user.caterer_id
+    version = versioning.get_version(mongo_db, cid, versioning.PROFILE)
+    etag = make_etag(cid, version)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "profile")
+    cached = profile_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    stale = mark_stale_read(request, response)
+
+    caterer = db.query(models.Caterer).filter_by(id=cid).first()
     if not caterer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
         )
-    return caterer
+    profile = {column: getattr(caterer, column) for column in PROFILE_COLUMNS}
+    if not stale:
+        profile_cache.set(cache_key, profile)
+    return profile
 
 
 @router.put("", response_model=schemas.CatererOut)
@@ -52,6 +88,7 @@ async def update_profile(
     profile_image: Optional[UploadFile] = File(None),
     current_user=Depends(get_current_user),
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
 ):
     caterer = db.query(models.Caterer).filter_by(id=current_user.caterer_id).first()
     if not caterer:
@@ -61,23 +98,12 @@ async def update_profile(
 
     # ─── 1) Handle file upload ──────────────────────────────────────────────
     if profile_image:
-        # Save under "<project_root>/static/profile_images"
-        # If you used Option 1, that folder already exists.
-        # If you used Option 2, STATIC_DIR was created at startup.
-        upload_folder = os.path.join(os.getcwd(), "static", "profile_images")
-        os.makedirs(upload_folder, exist_ok=True)
-
-        original_name = profile_image.filename
-        ext = os.path.splitext(original_name)[1]
-        unique_name = f"{caterer.id}_{uuid.uuid4().hex}{ext}"
-        file_location = os.path.join(upload_folder, unique_name)
-
-        with open(file_location, "wb") as f:
-            contents = await profile_image.read()
-            f.write(contents)
+        # Streamed to "<project_root>/static/profile_images" under a
+        # content-hash name; thumbnail/WebP variants are rendered alongside.
+        stored_name = await store_profile_image(profile_image, caterer.id)
 
         base_url = str(request.base_url).rstrip("/")  # e.g. "http://localhost:8000"
-        image_url = f"{base_url}/static/profile_images/{unique_name}"
+        image_url = f"{base_url}/static/profile_images/{stored_name}"
         caterer.profile_image_url = image_url
 
     # ─── 2) Update any other text fields ────────────────────────────────────
@@ -98,4 +124,5 @@ async def update_profile(
 
     db.commit()
     db.refresh(caterer)
+    await run_in_threadpool(versioning.bump_version, mongo_db, caterer.id, versioning.PROFILE)
     return caterer
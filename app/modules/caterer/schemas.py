@@ -1,9 +1,11 @@
 # app/modules/caterer/schemas.py
 
-from pydantic import BaseModel, EmailStr, HttpUrl, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, EmailStr, HttpUrl, ConfigDict, computed_field
+from typing import Optional, Dict
 from datetime import datetime
 
+from app.utils.images import image_variant_urls
+
 class CatererBase(BaseModel):
     name: str
     email: EmailStr
@@ -40,3 +42,11 @@ class CatererOut(CatererBase):
     updated_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
+
+    # Original + resized variants, so clients fetch only the size they render
+    @computed_field
+    @property
+    def profile_image_variants(self) -> Optional[Dict[str, str]]:
+        if not self.profile_image_url:
+            return None
+        return image_variant_urls(str(self.profile_image_url))
@@ -7,12 +7,17 @@ from fastapi import (
     HTTPException,
     status,
     Query,
+    Request,
+    Response,
 )
 from sqlalchemy.orm import Session
 from sqlalchemy import asc, desc
 
 from app.modules.customer import models, schemas
-from app.dependencies.database import get_sql_db
+from app.core import versioning
+from app.core.cache import get_cache, make_key
+from app.db.stale import mark_stale_read
+from app.dependencies.database import get_read_db, get_sql_db, get_mongo_db
 from app.modules.auth.api.deps import get_current_active_user
 
 router = APIRouter(
@@ -20,6 +25,10 @@ router = APIRouter(
     tags=["customer"],
 )
 
+# Read results keyed by (caterer_id, customers version, view, query); customer
+# writes (here and in order-with-customer) bump the version.
+customer_cache = get_cache("customers")
+
 def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
     """
     Ensure the authenticated user's caterer_id matches the 'cid' path param.
@@ -34,25 +43,39 @@ def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
 @router.get("", response_model=List[schemas.CustomerOut])
 def list_customers(
     cid: str,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     sort_by: str = Query("name", regex="^(name|created_at)$"),
     sort_dir: str = Query("asc", regex="^(asc|desc)$"),
-    db: Session = Depends(get_sql_db),
+    db: Session = Depends(get_read_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
     List customers for a given caterer (tenant) with pagination & sorting.
+    Supports follower reads (X-Read-Consistency: stale).
     """
+    cache_key = make_key(
+        cid, versioning.get_version(mongo_db, cid, versioning.CUSTOMERS), "customers", request.url.query
+    )
+    cached = customer_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    stale = mark_stale_read(request, response)
+
     order_clause = asc(sort_by) if sort_dir == "asc" else desc(sort_by)
-    customers = (
-        db.query(models.Customer)
+    customers = [
+        schemas.CustomerOut.model_validate(cust)
+        for cust in db.query(models.Customer)
         .filter_by(caterer_id=cid)
         .order_by(order_clause)
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    ]
+    if not stale:
+        customer_cache.set(cache_key, customers)
     return customers
 
 
@@ -61,6 +84,7 @@ def create_customer(
     cid: str,
     dto: schemas.CustomerCreate,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
@@ -82,24 +106,42 @@ def create_customer(
     db.add(cust)
     db.commit()
     db.refresh(cust)
+    versioning.bump_version(mongo_db, cid, versioning.CUSTOMERS)
     return cust
 
 
 @router.get("/search", response_model=Optional[schemas.CustomerOut])
 def search_customer(
     cid: str,
+    request: Request,
+    response: Response,
     phone: str = Query(..., description="Phone number to search"),
-    db: Session = Depends(get_sql_db),
+    db: Session = Depends(get_read_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
     Search for a customer by exact phone number. Returns one or null.
+    Supports follower reads (X-Read-Consistency: stale).
     """
-    return (
+    cache_key = make_key(
+        cid, versioning.get_version(mongo_db, cid, versioning.CUSTOMERS), "phone", phone
+    )
+    cached = customer_cache.get(cache_key)
+    if cached is not None:
+        # a cached miss is stored as False, since None means "not cached"
+        return cached or None
+    stale = mark_stale_read(request, response)
+
+    cust = (
         db.query(models.Customer)
         .filter_by(caterer_id=cid, phone=phone)
         .first()
     )
+    found = schemas.CustomerOut.model_validate(cust) if cust else None
+    if not stale:
+        customer_cache.set(cache_key, found or False)
+    return found
 
 
 @router.get("/{customer_id}", response_model=schemas.CustomerOut)
@@ -107,11 +149,19 @@ def get_customer(
     cid: str,
     customer_id: str,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
     Retrieve a specific customer by ID.
     """
+    cache_key = make_key(
+        cid, versioning.get_version(mongo_db, cid, versioning.CUSTOMERS), "customer", customer_id
+    )
+    cached = customer_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     cust = (
         db.query(models.Customer)
         .filter_by(caterer_id=cid, customer_id=customer_id)
@@ -122,7 +172,9 @@ def get_customer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Customer not found",
         )
-    return cust
+    customer = schemas.CustomerOut.model_validate(cust)
+    customer_cache.set(cache_key, customer)
+    return customer
 
 
 @router.put("/{customer_id}", response_model=schemas.CustomerOut)
@@ -131,6 +183,7 @@ def update_customer(
     customer_id: str,
     dto: schemas.CustomerUpdate,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
@@ -168,6 +221,8 @@ def update_customer(
 
     db.commit()
     db.refresh(cust)
+    # customers are embedded in order responses
+    versioning.bump_version(mongo_db, cid, versioning.CUSTOMERS, versioning.ORDERS)
     return cust
 
 
@@ -176,6 +231,7 @@ def delete_customer(
     cid: str,
     customer_id: str,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
@@ -207,4 +263,5 @@ def delete_customer(
 
     db.delete(cust)
     db.commit()
+    versioning.bump_version(mongo_db, cid, versioning.CUSTOMERS)
     return None
@@ -0,0 +1,79 @@
+# app/modules/ops/api/ops.py
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import cache_stats, render_cache_metrics
+from app.core.memory import tracker
+from app.core.metrics import registry
+from app.core.responses import FastJSONResponse
+from app.db.cockroach import engine
+from app.db.pool import pool_stats
+from app.db.indexes import index_report
+from app.db.mongo import pool_metrics
+from app.dependencies.database import get_mongo_db
+from app.modules.auth.api.deps import require_ops_token
+
+router = APIRouter(
+    prefix="/ops",
+    tags=["ops"],
+    dependencies=[Depends(require_ops_token)],
+    default_response_class=FastJSONResponse,
+)
+
+
+@router.get("/cache")
+def read_cache_stats():
+    """
+    Hit rate, entry count and memory use of every read cache in this process.
+    """
+    return cache_stats()
+
+
+@router.get("/indexes")
+def read_index_report(mongo_db=Depends(get_mongo_db)):
+    """
+    Index usage counters and the query plan of every registered query shape.
+    """
+    return index_report(mongo_db)
+
+
+@router.get("/db/pool")
+def read_db_pool_stats():
+    """
+    SQL connection pool usage for this worker: checked-out connections,
+    waiters, timeouts and checkout latency.
+    """
+    return pool_stats(engine)
+
+
+@router.get("/mongo/pool")
+def read_mongo_pool_stats():
+    """
+    Mongo connection pool events for this worker: open and checked-out
+    connections, checkout latency and failures, pool clears.
+    """
+    return pool_metrics.stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    Prometheus exposition of this worker's per-route request metrics and
+    cache hit/miss counts.
+    """
+    return PlainTextResponse(
+        registry.render() + render_cache_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/memory")
+def read_memory_report(
+    limit: int = Query(25, ge=1, le=200),
+    group_by: str = Query("lineno", regex="^(lineno|filename|traceback)$"),
+):
+    """
+    Per-route memory peaks, the largest recent requests and the top
+    allocation sites (needs MEMORY_TRACKING=true).
+    """
+    return tracker.report(limit, group_by)
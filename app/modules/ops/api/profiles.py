@@ -0,0 +1,18 @@
+# app/modules/ops/api/profiles.py
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import profile_headers, read_profile
+
+router = APIRouter(prefix="/profiles", tags=["ops"])
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str, request: Request):
+    """
+    Collapsed stacks of a profiled request (see app/core/profiling.py).
+    Readable with the ops token or by an OWNER of the profiled tenant.
+    """
+    profile = read_profile(profile_id, dict(request.scope["headers"]))
+    return PlainTextResponse(profile["collapsed"], headers=profile_headers(profile))
@@ -1,15 +1,22 @@
 # app/modules/order/api/order.py
 from decimal import Decimal
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.orm import Session, load_only
 from pymongo.collection import Collection
 from bson.objectid import ObjectId
 from datetime import datetime
 
-from app.dependencies.database import get_sql_db, get_mongo_db
+from app.core import versioning
+from app.core.cache import get_cache, make_key
+from app.core.conditional import conditional_response, make_etag
+from app.core.fields import mongo_projection, parse_fields, shape_doc, sparse_response, wants
+from app.db.stale import mark_stale_read
+from app.dependencies.database import get_read_db, get_sql_db, get_mongo_db
 from app.modules.auth.api.deps import get_current_active_user
 from app.modules.order import models, schemas
+from app.modules.order.events import event_out, find_events, store_menus
+from app.modules.order.idempotency import Idempotency, idempotency
 from app.modules.customer.models import Customer
 
 from app.modules.order.schemas import PaymentIn, PaymentOut
@@ -20,6 +27,10 @@ router = APIRouter(
     tags=["order"],
 )
 
+# Read results keyed by (caterer_id, orders version, view, query); every order,
+# event, payment or customer write bumps the version.
+order_cache = get_cache("orders")
+
 
 def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
     """
@@ -32,84 +43,127 @@ def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
 #
 # ─── 2.1  List All Orders ─────────────────────────────────────────────────────
 #
+ORDER_COLUMNS = ("grand_total", "paid_till_now", "due", "paid_status", "created_at", "updated_at")
+
+
 @router.get(
     "/orders",
     response_model=List[schemas.OrderOut],
 )
 def list_orders(
     cid: str,
-    db: Session = Depends(get_sql_db),
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return; events.<field> selects event fields",
+    ),
+    db: Session = Depends(get_read_db),
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
     List all orders for this caterer, each with embedded events fetched from MongoDB.
+    With `fields`, only the selected SQL columns / event fields are read.
+    Supports follower reads (X-Read-Consistency: stale).
     """
-    # 1) Fetch all order rows from CockroachDB
-    orders = db.query(models.Order).filter_by(caterer_id=cid).all()
-
-    # 2) Bulk-fetch events from Mongo where order_id in the returned orders
-    col_evt: Collection = mongo_db["events"]
-    order_ids = [order.order_id for order in orders]
-    raw_events = list(col_evt.find({"order_id": {"$in": order_ids}}))
-
-    # Group events by order_id
-    events_by_order: dict[str, List[dict]] = {}
-    for doc in raw_events:
-        oid = doc["order_id"]
-        events_by_order.setdefault(oid, []).append(doc)
-
-    response: List[schemas.OrderOut] = []
-    for order in orders:
-        # 3) Load associated customer from SQL
-        cust: Customer = db.query(Customer).filter_by(customer_id=order.customer_id).first()
-        if not cust:
-            raise HTTPException(status_code=404, detail="Customer not found")
-
-        customer_out = schemas.CustomerOut(
-            customer_id=cust.customer_id,
-            name=cust.name,
-            phone=cust.phone,
-            email=cust.email,
-        )
-
-        # 4) Convert Mongo docs to EventOut
-        ev_docs = events_by_order.get(order.order_id, [])
-        event_out_list: List[schemas.EventOut] = []
-        for doc in ev_docs:
-            event_out_list.append(
-                schemas.EventOut(
-                    event_id=str(doc["_id"]),
-                    event_type=doc["event_type"],
-                    event_date=doc["event_date"],
-                    start_time=doc["start_time"],
-                    end_time=doc["end_time"],
-                    venue=doc["venue"],
-                    no_of_guests=doc["no_of_guests"],
-                    extra_services=doc.get("extra_services"),
-                    menu=doc.get("menu"),
-                    total_amount=doc.get("total_amount", 0.0),
-                    created_at=doc["created_at"],
-                    updated_at=doc.get("updated_at"),
-                )
-            )
-
-        # 5) Build the OrderOut
-        response.append(
-            schemas.OrderOut(
-                order_id=order.order_id,
-                customer=customer_out,
-                events=event_out_list,
-                grand_total=order.grand_total,
-                paid_till_now=order.paid_till_now,
-                due=order.due,
-                paid_status=order.paid_status,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
+    selected = parse_fields(
+        fields,
+        schemas.OrderOut.model_fields,
+        always=("order_id",),
+        nested={"events": schemas.EventOut.model_fields},
+        nested_always={"events": ("event_id",)},
+    )
+    version = versioning.get_version(mongo_db, cid, versioning.ORDERS)
+    etag = make_etag(cid, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "orders", request.url.query)
+    cached = order_cache.get(cache_key)
+    if cached is not None:
+        if selected is not None:
+            return sparse_response(response, cached, selected, schemas.OrderOut)
+        return cached
+    stale = mark_stale_read(request, response)
+
+    # 1) Fetch order rows from CockroachDB, only the columns we return
+    columns = [c for c in ORDER_COLUMNS if wants(selected, c)]
+    if wants(selected, "customer"):
+        columns.append("customer_id")
+    orders = (
+        db.query(models.Order)
+        .options(
+            load_only(
+                models.Order.order_id,
+                *(getattr(models.Order, c) for c in columns),
+                raiseload=True,
             )
         )
+        .filter_by(caterer_id=cid)
+        .all()
+    )
 
-    return response
+    # 2) Load all referenced customers in one query
+    customers: dict[str, Customer] = {}
+    if wants(selected, "customer"):
+        customer_ids = {order.customer_id for order in orders}
+        if customer_ids:
+            customers = {
+                cust.customer_id: cust
+                for cust in db.query(Customer)
+                .options(load_only(Customer.name, Customer.phone, Customer.email))
+                .filter(Customer.customer_id.in_(customer_ids))
+            }
+
+    # 3) Bulk-fetch events from Mongo where order_id in the returned orders
+    event_fields = None if selected is None else selected.get("events", set())
+    events_by_order: dict[str, List[dict]] = {}
+    if orders and (event_fields is None or "events" in selected):
+        order_ids = [order.order_id for order in orders]
+        if event_fields is None:
+            projection = None
+        else:
+            projection = mongo_projection({*event_fields, "order_id"}, {"event_id": "_id"})
+        for doc in find_events(mongo_db, {"order_id": {"$in": order_ids}}, projection):
+            events_by_order.setdefault(doc["order_id"], []).append(doc)
+
+    payload: List[dict] = []
+    for order in orders:
+        item = {"order_id": order.order_id}
+        for column in columns:
+            if column != "customer_id":
+                item[column] = getattr(order, column)
+
+        if wants(selected, "customer"):
+            cust = customers.get(order.customer_id)
+            if not cust:
+                raise HTTPException(status_code=404, detail="Customer not found")
+            item["customer"] = {
+                "customer_id": cust.customer_id,
+                "name": cust.name,
+                "phone": cust.phone,
+                "email": cust.email,
+            }
+
+        # 4) Convert Mongo docs to event dicts
+        if wants(selected, "events"):
+            ev_docs = events_by_order.get(order.order_id, [])
+            if event_fields is None:
+                item["events"] = [event_out(doc) for doc in ev_docs]
+            else:
+                item["events"] = [
+                    shape_doc(doc, event_fields, id_field="event_id") for doc in ev_docs
+                ]
+
+        payload.append(item)
+
+    if not stale:
+        order_cache.set(cache_key, payload)
+    if selected is not None:
+        return sparse_response(response, payload, selected, schemas.OrderOut)
+    return payload
 
 
 #
@@ -122,6 +176,8 @@ def list_orders(
 def get_order(
     cid: str,
     order_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_sql_db),
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
@@ -129,6 +185,17 @@ def get_order(
     """
     Retrieve a single order (SQL) along with its events (Mongo).
     """
+    version = versioning.get_version(mongo_db, cid, versioning.ORDERS)
+    etag = make_etag(cid, version, order_id)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "order", order_id)
+    cached = order_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 1) Fetch the order row
     order = db.query(models.Order).filter_by(caterer_id=cid, order_id=order_id).first()
     if not order:
@@ -147,29 +214,13 @@ def get_order(
     )
 
     # 3) Fetch events for this order
-    col_evt: Collection = mongo_db["events"]
-    raw_events = list(col_evt.find({"order_id": order_id}))
+    raw_events = find_events(mongo_db, {"order_id": order_id})
 
     event_out_list: List[schemas.EventOut] = []
     for doc in raw_events:
-        event_out_list.append(
-            schemas.EventOut(
-                event_id=str(doc["_id"]),
-                event_type=doc["event_type"],
-                event_date=doc["event_date"],
-                start_time=doc["start_time"],
-                end_time=doc["end_time"],
-                venue=doc["venue"],
-                no_of_guests=doc["no_of_guests"],
-                extra_services=doc.get("extra_services"),
-                menu=doc.get("menu"),
-                total_amount=doc.get("total_amount", 0.0),
-                created_at=doc["created_at"],
-                updated_at=doc.get("updated_at"),
-            )
-        )
+        event_out_list.append(schemas.EventOut(**event_out(doc)))
 
-    return schemas.OrderOut(
+    order_out = schemas.OrderOut(
         order_id=order.order_id,
         customer=customer_out,
         events=event_out_list,
@@ -180,6 +231,8 @@ def get_order(
         created_at=order.created_at,
         updated_at=order.updated_at,
     )
+    order_cache.set(cache_key, order_out)
+    return order_out
 
 
 #
@@ -196,6 +249,7 @@ def create_order(
     db: Session = Depends(get_sql_db),
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
+    idem: Idempotency = Depends(idempotency),
 ):
     """
     Create an order for an existing customer:
@@ -203,6 +257,9 @@ def create_order(
     - Insert N Event documents in MongoDB
     - Sum each event's total_amount to set grand_total
     """
+    if idem.response is not None:
+        return idem.response
+
     # 1) Validate customer exists
     cust: Customer = db.query(Customer).filter_by(
         customer_id=dto.customer_id, caterer_id=cid
@@ -220,8 +277,10 @@ def create_order(
     now = datetime.utcnow()
     total_sum = 0.0
 
+    # Menus are stored once as snapshots; events reference them by hash
+    menu_hashes = store_menus(mongo_db, [e.menu for e in dto.events])
     event_docs = []
-    for e in dto.events:
+    for e, menu_hash in zip(dto.events, menu_hashes):
         if e.total_amount < 0:
             raise HTTPException(
                 status_code=400, detail="Event total_amount must be non-negative"
@@ -238,7 +297,7 @@ def create_order(
             "venue":          e.venue,
             "no_of_guests":   e.no_of_guests,
             "extra_services": e.extra_services,
-            "menu":           e.menu,
+            "menu_hash":      menu_hash,
             "total_amount":   e.total_amount,
             "created_at":     now,
             "updated_at":     None,
@@ -255,6 +314,7 @@ def create_order(
 
     db.commit()
     db.refresh(order)
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
 
     # 5) Build and return the OrderOut (similar to get_order)
     customer_out = schemas.CustomerOut(
@@ -263,27 +323,12 @@ def create_order(
         phone=cust.phone,
         email=cust.email,
     )
-    inserted = list(col_evt.find({"order_id": order.order_id}))
+    inserted = find_events(mongo_db, {"order_id": order.order_id})
     event_out_list: List[schemas.EventOut] = []
     for doc in inserted:
-        event_out_list.append(
-            schemas.EventOut(
-                event_id=str(doc["_id"]),
-                event_type=doc["event_type"],
-                event_date=doc["event_date"],
-                start_time=doc["start_time"],
-                end_time=doc["end_time"],
-                venue=doc["venue"],
-                no_of_guests=doc["no_of_guests"],
-                extra_services=doc.get("extra_services"),
-                menu=doc.get("menu"),
-                total_amount=doc.get("total_amount", 0.0),
-                created_at=doc["created_at"],
-                updated_at=doc.get("updated_at"),
-            )
-        )
+        event_out_list.append(schemas.EventOut(**event_out(doc)))
 
-    return schemas.OrderOut(
+    order_out = schemas.OrderOut(
         order_id=order.order_id,
         customer=customer_out,
         events=event_out_list,
@@ -294,6 +339,7 @@ def create_order(
         created_at=order.created_at,
         updated_at=order.updated_at,
     )
+    return idem.complete(order_out, status.HTTP_201_CREATED)
 
 
 #
@@ -310,10 +356,14 @@ def create_order_with_customer(
     db: Session = Depends(get_sql_db),
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
+    idem: Idempotency = Depends(idempotency),
 ):
     """
     Create a new customer (if needed) and then create the order + events.
     """
+    if idem.response is not None:
+        return idem.response
+
     # 1) Lookup existing customer by phone
     cust = db.query(Customer).filter_by(phone=dto.phone, caterer_id=cid).first()
     if not cust:
@@ -336,8 +386,10 @@ def create_order_with_customer(
     now = datetime.utcnow()
     total_sum = 0.0
 
+    # Menus are stored once as snapshots; events reference them by hash
+    menu_hashes = store_menus(mongo_db, [e.menu for e in dto.events])
     event_docs = []
-    for e in dto.events:
+    for e, menu_hash in zip(dto.events, menu_hashes):
         if e.total_amount < 0:
             raise HTTPException(
                 status_code=400, detail="Event total_amount must be non-negative"
@@ -354,7 +406,7 @@ def create_order_with_customer(
             "venue":          e.venue,
             "no_of_guests":   e.no_of_guests,
             "extra_services": e.extra_services,
-            "menu":           e.menu,
+            "menu_hash":      menu_hash,
             "total_amount":   e.total_amount,
             "created_at":     now,
             "updated_at":     None,
@@ -372,6 +424,8 @@ def create_order_with_customer(
     db.commit()
     db.refresh(order)
     db.refresh(cust)
+    # the customer may be new
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS, versioning.CUSTOMERS)
 
     # 5) Build response
     customer_out = schemas.CustomerOut(
@@ -380,27 +434,12 @@ def create_order_with_customer(
         phone=cust.phone,
         email=cust.email,
     )
-    inserted = list(col_evt.find({"order_id": order.order_id}))
+    inserted = find_events(mongo_db, {"order_id": order.order_id})
     event_out_list: List[schemas.EventOut] = []
     for doc in inserted:
-        event_out_list.append(
-            schemas.EventOut(
-                event_id=str(doc["_id"]),
-                event_type=doc["event_type"],
-                event_date=doc["event_date"],
-                start_time=doc["start_time"],
-                end_time=doc["end_time"],
-                venue=doc["venue"],
-                no_of_guests=doc["no_of_guests"],
-                extra_services=doc.get("extra_services"),
-                menu=doc.get("menu"),
-                total_amount=doc.get("total_amount", 0.0),
-                created_at=doc["created_at"],
-                updated_at=doc.get("updated_at"),
-            )
-        )
+        event_out_list.append(schemas.EventOut(**event_out(doc)))
 
-    return schemas.OrderOut(
+    order_out = schemas.OrderOut(
         order_id=order.order_id,
         customer=customer_out,
         events=event_out_list,
@@ -411,6 +450,7 @@ def create_order_with_customer(
         created_at=order.created_at,
         updated_at=order.updated_at,
     )
+    return idem.complete(order_out, status.HTTP_201_CREATED)
 
 
 #
@@ -460,30 +500,23 @@ def update_event(
     # Set the updated_at timestamp
     update_data["updated_at"] = datetime.utcnow()
 
-    # 4) Perform the update in Mongo
-    result = col_evt.update_one({"_id": oid}, {"$set": update_data})
+    # 4) Perform the update in Mongo; a new menu becomes a snapshot reference
+    update: dict = {"$set": update_data}
+    if "menu" in update_data:
+        update_data["menu_hash"] = store_menus(mongo_db, [update_data.pop("menu")])[0]
+        update["$unset"] = {"menu": ""}
+    result = col_evt.update_one({"_id": oid}, update)
     if result.matched_count == 0:
         raise HTTPException(status_code=500, detail="Failed to update event")
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
 
     # 5) Re-fetch the updated document
-    doc = col_evt.find_one({"_id": oid})
-    if not doc:
+    docs = find_events(mongo_db, {"_id": oid})
+    if not docs:
         raise HTTPException(status_code=500, detail="Event disappeared after update")
+    doc = docs[0]
 
-    return schemas.EventOut(
-        event_id=str(doc["_id"]),
-        event_type=doc["event_type"],
-        event_date=doc["event_date"],
-        start_time=doc["start_time"],
-        end_time=doc["end_time"],
-        venue=doc["venue"],
-        no_of_guests=doc["no_of_guests"],
-        extra_services=doc.get("extra_services"),
-        menu=doc.get("menu"),
-        total_amount=doc.get("total_amount", 0.0),
-        created_at=doc["created_at"],
-        updated_at=doc.get("updated_at"),
-    )
+    return schemas.EventOut(**event_out(doc))
 
 
 #
@@ -524,6 +557,7 @@ def delete_event(
     result = col_evt.delete_one({"_id": oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to delete event")
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
 
     # 4) Return 204 No Content
     return None
@@ -539,20 +573,33 @@ def delete_event(
 def list_payments(
     cid: str,
     order_id: str,
-    db: Session = Depends(get_sql_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
+    cache_key = make_key(
+        cid, versioning.get_version(mongo_db, cid, versioning.ORDERS), "payments", order_id
+    )
+    cached = order_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    stale = mark_stale_read(request, response)
+
     # ensure order exists
     from app.modules.order.models import Order
     if not db.query(Order).filter_by(caterer_id=cid, order_id=order_id).first():
         raise HTTPException(status_code=404, detail="Order not found")
 
-    payments = (
-        db.query(Payment)
+    payments = [
+        PaymentOut.model_validate(payment)
+        for payment in db.query(Payment)
         .filter_by(order_id=order_id)
         .order_by(Payment.datetime)
-        .all()
-    )
+    ]
+    if not stale:
+        order_cache.set(cache_key, payments)
     return payments
 
 @router.post(
@@ -565,8 +612,13 @@ def create_payment(
     order_id: str,
     dto: PaymentIn,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
+    idem: Idempotency = Depends(idempotency),
 ):
+    if idem.response is not None:
+        return idem.response
+
     # ensure order exists
     from app.modules.order.models import Order
     order = db.query(Order).filter_by(caterer_id=cid, order_id=order_id).first()
@@ -593,7 +645,8 @@ def create_payment(
 
     db.commit()
     db.refresh(payment)
-    return payment
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
+    return idem.complete(PaymentOut.model_validate(payment), status.HTTP_201_CREATED)
 
 
 @router.put(
@@ -606,6 +659,7 @@ def update_payment(
     payment_id: str,
     dto: PaymentIn,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     # 1) Load order
@@ -646,6 +700,7 @@ def update_payment(
 
     db.commit()
     db.refresh(payment)
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
     return payment
 
 
@@ -658,6 +713,7 @@ def delete_payment(
     order_id: str,
     payment_id: str,
     db: Session = Depends(get_sql_db),
+    mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     # 1) Load order
@@ -690,4 +746,5 @@ def delete_payment(
         order.paid_status = "UNPAID"
 
     db.commit()
+    versioning.bump_version(mongo_db, cid, versioning.ORDERS)
     return None
\ No newline at end of file
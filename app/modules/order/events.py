@@ -0,0 +1,149 @@
+# app/modules/order/events.py
+"""
+Event document helpers.
+
+Event menus are stored once per distinct content in `menu_snapshots`, keyed by
+the sha256 of their canonical JSON; an event only carries `menu_hash`. Reads
+resolve the hashes of a whole batch of events with one $in query, behind a
+cache (snapshots never change, so entries never go stale). Events written
+before snapshots existed still embed `menu` and are returned as-is.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from app.core.cache import get_cache
+
+SNAPSHOTS = "menu_snapshots"
+
+snapshot_cache = get_cache("menu_snapshots")
+
+
+def menu_hash(menu: Dict[str, Any]) -> str:
+    canonical = json.dumps(menu, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def store_menus(mongo_db, menus: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[str]]:
+    """
+    Make sure a snapshot exists for every menu and return their hashes
+    (None for events without a menu), in input order.
+    """
+    hashes: List[Optional[str]] = []
+    pending: Dict[str, Dict[str, Any]] = {}
+    for menu in menus:
+        if menu is None:
+            hashes.append(None)
+            continue
+        digest = menu_hash(menu)
+        hashes.append(digest)
+        if snapshot_cache.get(digest) is None:
+            pending[digest] = menu
+
+    if pending:
+        now = datetime.utcnow()
+        mongo_db[SNAPSHOTS].bulk_write(
+            [
+                UpdateOne(
+                    {"_id": digest},
+                    {"$setOnInsert": {"menu": menu, "created_at": now}},
+                    upsert=True,
+                )
+                for digest, menu in pending.items()
+            ],
+            ordered=False,
+        )
+        for digest, menu in pending.items():
+            snapshot_cache.set(digest, menu)
+    return hashes
+
+
+def resolve_menus(mongo_db, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fill in `menu` on every event doc that references a snapshot.
+    """
+    menus: Dict[str, Dict[str, Any]] = {}
+    missing = set()
+    for doc in docs:
+        digest = doc.get("menu_hash")
+        if not digest or digest in menus:
+            continue
+        cached = snapshot_cache.get(digest)
+        if cached is None:
+            missing.add(digest)
+        else:
+            menus[digest] = cached
+
+    if missing:
+        for snap in mongo_db[SNAPSHOTS].find({"_id": {"$in": list(missing)}}):
+            menus[snap["_id"]] = snap["menu"]
+            snapshot_cache.set(snap["_id"], snap["menu"])
+
+    for doc in docs:
+        digest = doc.get("menu_hash")
+        if digest:
+            doc["menu"] = menus.get(digest)
+    return docs
+
+
+def find_events(mongo_db, query: Dict[str, Any], projection=None) -> List[Dict[str, Any]]:
+    if projection is not None and "menu" in projection:
+        projection = {**projection, "menu_hash": 1}
+    return resolve_menus(mongo_db, list(mongo_db["events"].find(query, projection)))
+
+
+def event_out(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    EventOut-shaped dict for an event doc (menu already resolved).
+    """
+    return {
+        "event_id": str(doc["_id"]),
+        "event_type": doc["event_type"],
+        "event_date": doc["event_date"],
+        "start_time": doc["start_time"],
+        "end_time": doc["end_time"],
+        "venue": doc["venue"],
+        "no_of_guests": doc["no_of_guests"],
+        "extra_services": doc.get("extra_services"),
+        "menu": doc.get("menu"),
+        "total_amount": doc.get("total_amount", 0.0),
+        "created_at": doc["created_at"],
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def migrate_event_menus(mongo_db, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Move embedded event menus into snapshots; safe to re-run.
+    """
+    counts = {"events": 0}
+    col_evt = mongo_db["events"]
+    docs: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        if not docs:
+            return
+        hashes = store_menus(mongo_db, [d["menu"] for d in docs])
+        col_evt.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"menu_hash": digest}, "$unset": {"menu": ""}},
+                )
+                for doc, digest in zip(docs, hashes)
+            ],
+            ordered=False,
+        )
+        counts["events"] += len(docs)
+        docs.clear()
+
+    for doc in col_evt.find({"menu": {"$exists": True}}, {"menu": 1}):
+        docs.append(doc)
+        if len(docs) >= batch_size:
+            flush()
+    flush()
+    counts["snapshots"] = mongo_db[SNAPSHOTS].estimated_document_count()
+    return counts
@@ -0,0 +1,211 @@
+# app/modules/order/idempotency.py
+"""
+Idempotency-Key support for the order and payment create endpoints.
+
+A client that may retry a POST sends `Idempotency-Key: <unique value>`. The
+first request with a key claims it by inserting a pending row keyed by
+(tenant, key), runs normally and stores its status and JSON body on the row.
+A retry with the same key then costs one primary-key lookup and gets the
+stored response back (with `Idempotent-Replayed: true`) without touching
+SQL or Mongo again. While the first request is still running, a retry gets
+409; reusing a key for a different request (method, path or body) gets 422.
+
+Keys live for IDEMPOTENCY_TTL_HOURS; expired rows are treated as absent and
+removed by `python -m app.manage purge-idempotency-keys`. A pending claim
+older than IDEMPOTENCY_LOCK_SECONDS is assumed to belong to a worker that
+died mid-request and may be taken over; the takeover is conditional on the
+row being unchanged, so only one of several concurrent retries wins it. If
+the endpoint fails, the claim is released so the client can retry. If the
+endpoint succeeded but its response couldn't be stored, the claim is kept:
+retries get 409 rather than creating the order or payment again.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.cockroach import SessionLocal
+from app.modules.order.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    try:
+        # key order and whitespace don't make it a different request
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        canonical = body
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(canonical)
+    return digest.hexdigest()
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still in progress",
+        headers={"Retry-After": "1"},
+    )
+
+
+class Idempotency:
+    """
+    Per-request handle. `response` holds the stored response to replay, if
+    any; otherwise the endpoint runs and hands its result to `complete`.
+    Without the header every method is a no-op.
+    """
+
+    def __init__(self, caterer_id: str, key: Optional[str], request_fingerprint: Optional[str]):
+        self.caterer_id = caterer_id
+        self.key = key
+        self.fingerprint = request_fingerprint
+        self.response: Optional[Response] = None
+        self.claimed = False
+        self.done = False
+
+    def claim(self) -> None:
+        """
+        Look the key up and either load the stored response, refuse the
+        request, or insert a pending row for it.
+        """
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            row = db.get(IdempotencyKey, (self.caterer_id, self.key))
+            if row is not None and row.expires_at > now:
+                if row.fingerprint != self.fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Idempotency-Key was already used for a different request",
+                    )
+                if row.status_code is not None:
+                    self.response = Response(
+                        content=row.response_body,
+                        status_code=row.status_code,
+                        media_type="application/json",
+                        headers={REPLAYED_HEADER: "true"},
+                    )
+                    return
+                if row.created_at > now - timedelta(seconds=settings.idempotency_lock_seconds):
+                    raise _in_progress()
+
+            # absent, expired, or abandoned: (re)claim it
+            claim = dict(
+                fingerprint=self.fingerprint,
+                status_code=None,
+                response_body=None,
+                created_at=now,
+                expires_at=now + timedelta(hours=settings.idempotency_ttl_hours),
+            )
+            if row is None:
+                db.add(IdempotencyKey(caterer_id=self.caterer_id, key=self.key, **claim))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # a concurrent request inserted the same key first
+                    db.rollback()
+                    raise _in_progress()
+            else:
+                # only if nobody else took it over since we read it
+                taken = (
+                    db.query(IdempotencyKey)
+                    .filter_by(caterer_id=self.caterer_id, key=self.key, created_at=row.created_at)
+                    .update(claim, synchronize_session=False)
+                )
+                db.commit()
+                if not taken:
+                    raise _in_progress()
+            self.claimed = True
+        finally:
+            db.close()
+
+    def complete(self, result: Any, status_code: int) -> Any:
+        """
+        Store the endpoint's result as the response for this key and return
+        it unchanged.
+        """
+        if not self.claimed:
+            return result
+        if isinstance(result, BaseModel):
+            body = result.model_dump_json()
+        else:
+            body = json.dumps(jsonable_encoder(result))
+        db = SessionLocal()
+        try:
+            row = db.get(IdempotencyKey, (self.caterer_id, self.key))
+            if row is not None and row.fingerprint == self.fingerprint:
+                row.status_code = status_code
+                row.response_body = body
+                db.commit()
+        except Exception:
+            # the writes are done, so the claim must not be released: a retry
+            # would create them again. Retries get 409 until the lock expires
+            # and the key is taken over as abandoned.
+            logger.exception("Could not store the response for Idempotency-Key %s", self.key)
+        finally:
+            self.done = True
+            db.close()
+        return result
+
+    def release(self) -> None:
+        db = SessionLocal()
+        try:
+            db.query(IdempotencyKey).filter_by(
+                caterer_id=self.caterer_id, key=self.key, fingerprint=self.fingerprint, status_code=None
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
+async def idempotency(cid: str, request: Request) -> AsyncGenerator[Idempotency, None]:
+    """
+    Dependency for POST endpoints that create things. Declare it after the
+    tenant check, so keys are only looked up for authorised requests.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        yield Idempotency(cid, None, None)
+        return
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+        )
+
+    handle = Idempotency(cid, key, fingerprint(request.method, request.url.path, await request.body()))
+    await run_in_threadpool(handle.claim)
+    try:
+        yield handle
+    finally:
+        if handle.claimed and not handle.done:
+            # failed (or forgot to complete): let the client retry
+            await run_in_threadpool(handle.release)
+
+
+def purge_expired(now: Optional[datetime] = None) -> int:
+    db = SessionLocal()
+    try:
+        deleted = (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.expires_at <= (now or datetime.utcnow()))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+    finally:
+        db.close()
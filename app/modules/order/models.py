@@ -6,7 +6,9 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Integer,
     Numeric,
+    Text,
     func,
 )
 from sqlalchemy.orm import relationship
@@ -58,4 +60,21 @@ class Payment(Base):
     amount     = Column(Numeric(10, 2), nullable=False)
     datetime   = Column(DateTime,  server_default=func.now(), nullable=False)
     type       = Column(String,    nullable=False)
-    notes      = Column(String,    nullable=True)
\ No newline at end of file
+    notes      = Column(String,    nullable=True)
+
+
+class IdempotencyKey(Base):
+    """
+    One row per (tenant, Idempotency-Key) on the create endpoints; see
+    app/modules/order/idempotency.py. status_code is NULL while the first
+    request is still running.
+    """
+    __tablename__ = "idempotency_key"
+
+    caterer_id    = Column(String, primary_key=True)
+    key           = Column(String, primary_key=True)
+    fingerprint   = Column(String, nullable=False)    # sha256 of method, path and body
+    status_code   = Column(Integer, nullable=True)
+    response_body = Column(Text,    nullable=True)
+    created_at    = Column(DateTime, nullable=False)
+    expires_at    = Column(DateTime, nullable=False, index=True)
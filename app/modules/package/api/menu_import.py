@@ -1,18 +1,26 @@
 # app/modules/package/api/menu_import.py
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from typing import List
+from typing import Dict, List, Set, Tuple
 import csv
-from io import StringIO
+import io
+from app.core import versioning
+from app.core.responses import FastJSONResponse
 from app.dependencies.database import get_mongo_db
+from pymongo import UpdateOne
 from pymongo.collection import Collection
-from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
 from app.modules.auth.api.deps import get_current_active_user
+from app.modules.package.search import item_search_terms
 from datetime import datetime
 
+# Rows buffered before each round of category/item writes
+IMPORT_BATCH_SIZE = 1000
+
 router = APIRouter(
     prefix="/caterer/{cid}/menu",
     tags=["menu"],
+    default_response_class=FastJSONResponse,
 )
 
 def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
@@ -21,7 +29,7 @@ def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
 
 
 @router.post("/import")
-async def import_menu(
+def import_menu(
     cid: str,
     file: UploadFile = File(...),    # ← FastAPI will look for “file” in multipart/form-data
     mongo_db = Depends(get_mongo_db),
@@ -31,62 +39,132 @@ async def import_menu(
     Expect a CSV with columns: Category,Item,Description
     Creates any new categories in `menu_categories` and new items in `menu_items`.
     Returns a summary of how many categories and items were added.
+
+    The upload is parsed incrementally and written in batches: one upsert +
+    one lookup for the batch's new categories, then one unordered bulk upsert
+    for its items. Existing categories/items are left untouched.
     """
-    # 1) Read and decode the CSV
-    contents = await file.read()
-    text = contents.decode("utf-8")
-    reader = csv.DictReader(StringIO(text))
-    if not {"Category", "Item", "Description"}.issubset(reader.fieldnames or []):
-        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY,
-                            "CSV must have exactly headers: Category,Item,Description")
-
-    col_cat: Collection = mongo_db["menu_categories"]
-    col_itm: Collection = mongo_db["menu_items"]
-
-    categories_added = 0
-    items_added = 0
-
-    # 2) For each row: upsert category, then upsert item
-    for row in reader:
-        cat_name = row["Category"].strip()
-        itm_name = row["Item"].strip()
-        itm_desc = row["Description"].strip()
-
-        # 2a) Category: if it doesn’t exist, insert
-        cat_doc = col_cat.find_one({"caterer_id": cid, "name": cat_name})
-        if not cat_doc:
-            new_cat = {
-                "caterer_id": cid,
-                "name": cat_name,
-                "created_at": datetime.utcnow(),
-                "updated_at": None,
-            }
-            result = col_cat.insert_one(new_cat)
-            cat_id_str = str(result.inserted_id)
-            categories_added += 1
-        else:
-            cat_id_str = str(cat_doc["_id"])
-
-        # 2b) Item: if it doesn’t exist in that category, insert
-        existing_item = col_itm.find_one({
-            "caterer_id": cid,
-            "category_id": cat_id_str,
-            "name": itm_name,
-        })
-        if not existing_item:
-            new_item = {
-                "caterer_id": cid,
-                "category_id": cat_id_str,
-                "name": itm_name,
-                "description": itm_desc,
-                "created_at": datetime.utcnow(),
-                "updated_at": None,
-            }
-            col_itm.insert_one(new_item)
-            items_added += 1
+    # 1) Decode the CSV lazily, straight from the spooled upload
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    importer = _MenuImporter(mongo_db, cid)
+    try:
+        reader = csv.DictReader(text)
+        if not {"Category", "Item", "Description"}.issubset(reader.fieldnames or []):
+            raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                "CSV must have exactly headers: Category,Item,Description")
+
+        batch: List[Tuple[str, str, str]] = []
+        for row in reader:
+            batch.append((
+                (row["Category"] or "").strip(),
+                (row["Item"] or "").strip(),
+                (row["Description"] or "").strip(),
+            ))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                importer.flush(batch)
+                batch = []
+        importer.flush(batch)
+    except UnicodeDecodeError:
+        raise importer.failed("CSV must be UTF-8 encoded")
+    except BulkWriteError:
+        raise importer.failed("Some rows could not be written; re-run the import")
+    finally:
+        # Leave closing the underlying upload to FastAPI
+        text.detach()
+        # Earlier batches stay written even when a later one fails
+        if importer.categories_added or importer.items_added:
+            versioning.bump_version(mongo_db, cid, versioning.MENU)
 
     return {
         "message": "Import completed.",
-        "categories_added": categories_added,
-        "items_added": items_added,
+        "categories_added": importer.categories_added,
+        "items_added": importer.items_added,
     }
+
+
+class _MenuImporter:
+    """
+    Accumulates state across batches: resolved category ids and the
+    (category, item) pairs already written, so repeated rows cost nothing.
+    """
+
+    def __init__(self, mongo_db, cid: str):
+        self.cid = cid
+        self.col_cat: Collection = mongo_db["menu_categories"]
+        self.col_itm: Collection = mongo_db["menu_items"]
+        self.category_ids: Dict[str, str] = {}
+        self.seen_items: Set[Tuple[str, str]] = set()
+        self.categories_added = 0
+        self.items_added = 0
+
+    def failed(self, message: str) -> HTTPException:
+        """
+        422 for an import that stopped part-way, with what it wrote so far.
+        """
+        return HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, {
+            "message": message,
+            "categories_added": self.categories_added,
+            "items_added": self.items_added,
+        })
+
+    def flush(self, rows: List[Tuple[str, str, str]]) -> None:
+        if not rows:
+            return
+        self._resolve_categories({cat_name for cat_name, _, _ in rows})
+
+        now = datetime.utcnow()
+        ops = []
+        for cat_name, itm_name, itm_desc in rows:
+            cat_id_str = self.category_ids[cat_name]
+            key = (cat_id_str, itm_name)
+            if key in self.seen_items:
+                continue
+            self.seen_items.add(key)
+            # Item: only inserted if it doesn’t exist in that category
+            ops.append(UpdateOne(
+                {"caterer_id": self.cid, "category_id": cat_id_str, "name": itm_name},
+                {"$setOnInsert": {
+                    "description": itm_desc,
+                    "search_terms": item_search_terms(itm_name, itm_desc),
+                    "created_at": now,
+                    "updated_at": None,
+                }},
+                upsert=True,
+            ))
+        if ops:
+            try:
+                result = self.col_itm.bulk_write(ops, ordered=False)
+            except BulkWriteError as exc:
+                # unordered: the other upserts in the batch went through
+                self.items_added += exc.details.get("nUpserted", 0)
+                raise
+            self.items_added += result.upserted_count
+
+    def _resolve_categories(self, names: Set[str]) -> None:
+        missing = [name for name in names if name not in self.category_ids]
+        if not missing:
+            return
+
+        # Category: create any that don’t exist yet, then look all of them up
+        now = datetime.utcnow()
+        try:
+            result = self.col_cat.bulk_write(
+                [
+                    UpdateOne(
+                        {"caterer_id": self.cid, "name": name},
+                        {"$setOnInsert": {"created_at": now, "updated_at": None}},
+                        upsert=True,
+                    )
+                    for name in missing
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as exc:
+            self.categories_added += exc.details.get("nUpserted", 0)
+            raise
+        self.categories_added += result.upserted_count
+
+        for doc in self.col_cat.find(
+            {"caterer_id": self.cid, "name": {"$in": missing}}, {"name": 1}
+        ):
+            self.category_ids[doc["name"]] = str(doc["_id"])
@@ -5,20 +5,38 @@ from fastapi import (
     HTTPException,
     status,
     Query,
+    Request,
+    Response,
 )
 from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
 from bson.objectid import ObjectId
 from datetime import datetime
 
+from app.core import versioning
+from app.core.cache import get_cache, make_key
+from app.core.conditional import conditional_response, make_etag
+from app.core.fields import mongo_projection, parse_fields, shape_doc, sparse_response
+from app.core.pagination import cursor_query, cursor_sort, set_next_cursor
 from app.dependencies.database import get_mongo_db
 from app.modules.auth.api.deps import get_current_active_user
 from app.modules.package import schemas
+from app.modules.package.quote import load_packages, price_quotes
+from app.modules.package.search import (
+    item_search_terms,
+    package_search_terms,
+    search_menu,
+)
 
 router = APIRouter(
     prefix="/caterer/{cid}",
     tags=["package", "menu"],
 )
 
+# Read results keyed by (caterer_id, version, view, query); a write bumps the
+# version, so stale entries are simply never looked up again.
+menu_cache = get_cache("menu")
+
 
 def check_tenant(cid: str, current_user=Depends(get_current_active_user)):
     """
@@ -57,7 +75,12 @@ def create_menu_category(
         "created_at": now,
         "updated_at": None,
     }
-    result = col.insert_one(doc)
+    try:
+        result = col.insert_one(doc)
+    except DuplicateKeyError:
+        # lost a race with a concurrent insert; the unique index caught it
+        raise HTTPException(status_code=400, detail="Category already exists")
+    versioning.bump_version(mongo_db, cid, versioning.MENU)
     return {
         "id": str(result.inserted_id),
         "name": dto.name,
@@ -72,7 +95,12 @@ def create_menu_category(
 )
 def list_menu_categories(
     cid: str,
-    skip: int = Query(0, ge=0),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from the previous page's X-Next-Cursor header"
+    ),
+    skip: int = Query(0, ge=0, deprecated=True, description="Use `cursor` instead"),
     limit: int = Query(50, ge=1, le=100),
     sort_by: str = Query("name", regex="^(name|created_at)$"),
     sort_dir: str = Query("asc", regex="^(asc|desc)$"),
@@ -80,22 +108,35 @@ def list_menu_categories(
     _=Depends(check_tenant),
 ):
     """
-    List categories with pagination & sorting.
+    List categories with cursor pagination & sorting; the next page's token
+    is returned in the X-Next-Cursor header.
     """
-    col: Collection = mongo_db["menu_categories"]
     sort_field = sort_by
     sort_direction = 1 if sort_dir == "asc" else -1
 
-    cursor = (
-        col.find({"caterer_id": cid})
-        .sort(sort_field, sort_direction)
-        .skip(skip)
-        .limit(limit)
-    )
-    results: List[dict] = list(cursor)
-    response = []
+    version = versioning.get_version(mongo_db, cid, versioning.MENU)
+    etag = make_etag(cid, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "categories", request.url.query)
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        set_next_cursor(response, cached, sort_field, sort_direction, limit)
+        return cached
+
+    col: Collection = mongo_db["menu_categories"]
+    # category names are unique per caterer
+    unique = sort_field == "name"
+    query = cursor_query({"caterer_id": cid}, sort_field, sort_direction, cursor, unique)
+    found = col.find(query).sort(cursor_sort(sort_field, sort_direction, unique))
+    if not cursor:
+        found = found.skip(skip)
+    results: List[dict] = list(found.limit(limit))
+    payload = []
     for doc in results:
-        response.append(
+        payload.append(
             {
                 "id": str(doc["_id"]),
                 "name": doc["name"],
@@ -103,7 +144,9 @@ def list_menu_categories(
                 "updated_at": doc.get("updated_at"),
             }
         )
-    return response
+    menu_cache.set(cache_key, payload)
+    set_next_cursor(response, payload, sort_field, sort_direction, limit)
+    return payload
 
 
 # ─── 3.2  Menu Item Endpoints (unchanged) ───────────────────────────────────────────────
@@ -151,10 +194,16 @@ def create_menu_item(
         "category_id": dto.category_id,
         "name": dto.name,
         "description": dto.description,
+        "search_terms": item_search_terms(dto.name, dto.description),
         "created_at": now,
         "updated_at": None,
     }
-    result = col_itm.insert_one(doc)
+    try:
+        result = col_itm.insert_one(doc)
+    except DuplicateKeyError:
+        # lost a race with a concurrent insert; the unique index caught it
+        raise HTTPException(status_code=400, detail="Menu item already exists")
+    versioning.bump_version(mongo_db, cid, versioning.MENU)
     return {
         "id": str(result.inserted_id),
         "category_id": dto.category_id,
@@ -171,8 +220,13 @@ def create_menu_item(
 )
 def list_menu_items(
     cid: str,
+    request: Request,
+    response: Response,
     category_id: Optional[str] = Query(None, description="Filter by category"),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from the previous page's X-Next-Cursor header"
+    ),
+    skip: int = Query(0, ge=0, deprecated=True, description="Use `cursor` instead"),
     limit: int = Query(50, ge=1, le=100),
     sort_by: str = Query("name", regex="^(name|created_at)$"),
     sort_dir: str = Query("asc", regex="^(asc|desc)$"),
@@ -180,8 +234,24 @@ def list_menu_items(
     _=Depends(check_tenant),
 ):
     """
-    List menu items, optionally filtered by category_id, with pagination & sorting.
+    List menu items, optionally filtered by category_id, with cursor
+    pagination & sorting (next token in the X-Next-Cursor header).
     """
+    sort_field = sort_by
+    sort_direction = 1 if sort_dir == "asc" else -1
+
+    version = versioning.get_version(mongo_db, cid, versioning.MENU)
+    etag = make_etag(cid, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "items", request.url.query)
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        set_next_cursor(response, cached, sort_field, sort_direction, limit)
+        return cached
+
     col_itm: Collection = mongo_db["menu_items"]
     query: dict = {"caterer_id": cid}
 
@@ -194,19 +264,18 @@ def list_menu_items(
 
         query["category_id"] = category_id
 
-    sort_field = sort_by
-    sort_direction = 1 if sort_dir == "asc" else -1
-
-    cursor = (
-        col_itm.find(query)
-        .sort(sort_field, sort_direction)
-        .skip(skip)
-        .limit(limit)
+    # item names are unique within a category, not across the menu
+    unique = sort_field == "name" and bool(category_id)
+    query = cursor_query(query, sort_field, sort_direction, cursor, unique)
+    found = col_itm.find(query, {"search_terms": 0}).sort(
+        cursor_sort(sort_field, sort_direction, unique)
     )
-    results: List[dict] = list(cursor)
-    response = []
+    if not cursor:
+        found = found.skip(skip)
+    results: List[dict] = list(found.limit(limit))
+    payload = []
     for doc in results:
-        response.append(
+        payload.append(
             {
                 "id": str(doc["_id"]),
                 "category_id": doc["category_id"],
@@ -216,7 +285,9 @@ def list_menu_items(
                 "updated_at": doc.get("updated_at"),
             }
         )
-    return response
+    menu_cache.set(cache_key, payload)
+    set_next_cursor(response, payload, sort_field, sort_direction, limit)
+    return payload
 
 
 # ─── 3.3  Package Endpoints ─────────────────────────────────────────────────
@@ -252,10 +323,16 @@ def create_package(
         "decoration_type":  dto.decoration_type,
         "waiter_count":     dto.waiter_count,
         "pro_couple_count": dto.pro_couple_count,
+        "search_terms":     package_search_terms(dto.name, dto.description, dto.menu),
         "created_at":       now,
         "updated_at":       None,
     }
-    result = col_pkg.insert_one(doc)
+    try:
+        result = col_pkg.insert_one(doc)
+    except DuplicateKeyError:
+        # lost a race with a concurrent insert; the unique index caught it
+        raise HTTPException(status_code=400, detail="Package name already exists")
+    versioning.bump_version(mongo_db, cid, versioning.PACKAGES)
     return {
         "id":               str(result.inserted_id),
         "name":             doc["name"],
@@ -276,30 +353,65 @@ def create_package(
 )
 def list_packages(
     cid: str,
-    skip: int = Query(0, ge=0),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from the previous page's X-Next-Cursor header"
+    ),
+    skip: int = Query(0, ge=0, deprecated=True, description="Use `cursor` instead"),
     limit: int = Query(50, ge=1, le=100),
     sort_by: str = Query("name", regex="^(name|created_at)$"),
     sort_dir: str = Query("asc", regex="^(asc|desc)$"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. name,price"
+    ),
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
     """
-    List packages with pagination & sorting.
+    List packages with cursor pagination & sorting; the next page's token
+    is returned in the X-Next-Cursor header. `fields` limits both what is
+    read from Mongo and what is returned.
     """
-    col_pkg: Collection = mongo_db["packages"]
     sort_field = sort_by
     sort_direction = 1 if sort_dir == "asc" else -1
+    selected = parse_fields(fields, schemas.PackageOut.model_fields, always=("id",))
+
+    version = versioning.get_version(mongo_db, cid, versioning.PACKAGES)
+    etag = make_etag(cid, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "packages", request.url.query)
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        set_next_cursor(response, cached, sort_field, sort_direction, limit)
+        if selected is not None:
+            return sparse_response(response, cached, selected, schemas.PackageOut)
+        return cached
 
-    cursor = (
-        col_pkg.find({"caterer_id": cid})
-        .sort(sort_field, sort_direction)
-        .skip(skip)
-        .limit(limit)
+    col_pkg: Collection = mongo_db["packages"]
+    # package names are unique per caterer
+    unique = sort_field == "name"
+    query = cursor_query({"caterer_id": cid}, sort_field, sort_direction, cursor, unique)
+    if selected is None:
+        projection = {"search_terms": 0}
+    else:
+        # the sort field is read too, for the next cursor
+        projection = mongo_projection({*selected, sort_field}, {"id": "_id"})
+    found = col_pkg.find(query, projection).sort(
+        cursor_sort(sort_field, sort_direction, unique)
     )
-    results: List[dict] = list(cursor)
-    response = []
+    if not cursor:
+        found = found.skip(skip)
+    results: List[dict] = list(found.limit(limit))
+    payload = []
     for doc in results:
-        response.append(
+        if selected is not None:
+            payload.append(shape_doc(doc, {*selected, sort_field}))
+            continue
+        payload.append(
             {
                 "id":               str(doc["_id"]),
                 "name":             doc["name"],
@@ -313,7 +425,11 @@ def list_packages(
                 "updated_at":       doc.get("updated_at"),
             }
         )
-    return response
+    menu_cache.set(cache_key, payload)
+    set_next_cursor(response, payload, sort_field, sort_direction, limit)
+    if selected is not None:
+        return sparse_response(response, payload, selected, schemas.PackageOut)
+    return payload
 
 
 @router.get(
@@ -323,6 +439,8 @@ def list_packages(
 def get_package(
     cid: str,
     package_id: str,
+    request: Request,
+    response: Response,
     mongo_db=Depends(get_mongo_db),
     _=Depends(check_tenant),
 ):
@@ -336,12 +454,23 @@ def get_package(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid package_id format")
 
+    version = versioning.get_version(mongo_db, cid, versioning.PACKAGES)
+    etag = make_etag(cid, version, package_id)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "package", package_id)
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Fetch the package document belonging to this caterer
-    pkg_doc = col_pkg.find_one({"_id": pkg_obj, "caterer_id": cid})
+    pkg_doc = col_pkg.find_one({"_id": pkg_obj, "caterer_id": cid}, {"search_terms": 0})
     if not pkg_doc:
         raise HTTPException(status_code=404, detail="Package not found")
 
-    return {
+    package = {
         "id":               str(pkg_doc["_id"]),
         "name":             pkg_doc["name"],
         "price":            pkg_doc["price"],
@@ -353,9 +482,11 @@ def get_package(
         "created_at":       pkg_doc["created_at"],
         "updated_at":       pkg_doc.get("updated_at"),
     }
+    menu_cache.set(cache_key, package)
+    return package
 
 
-# ─── 3.4  Full Nested Menu Endpoint (unchanged) ──────────────────────────────────────────
+# ─── 3.4  Full Nested Menu Endpoint ────────────────────────────────────────────────────
 
 @router.get(
     "/menu",
@@ -363,6 +494,8 @@ def get_package(
 )
 def list_full_menu(
     cid: str,
+    request: Request,
+    response: Response,
     skip_cat: Optional[int] = Query(
         0, ge=0, description="Number of categories to skip"
     ),
@@ -384,48 +517,83 @@ def list_full_menu(
       - skip_cat, limit_cat: apply to categories
       - skip_item, limit_item: apply to items within each category
     """
+    version = versioning.get_version(mongo_db, cid, versioning.MENU)
+    etag = make_etag(cid, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(cid, version, "full_menu", request.url.query)
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    menu = fetch_full_menu(mongo_db, cid, skip_cat, limit_cat, skip_item, limit_item)
+    menu_cache.set(cache_key, menu)
+    return menu
+
+
+def fetch_full_menu(
+    mongo_db,
+    cid: str,
+    skip_cat: int,
+    limit_cat: int,
+    skip_item: int,
+    limit_item: int,
+) -> List[dict]:
+    """
+    Build the nested menu with a single aggregation: page the categories,
+    then $lookup each category's page of items inside the same round trip.
+    """
     col_cat: Collection = mongo_db["menu_categories"]
-    col_itm: Collection = mongo_db["menu_items"]
 
-    # 1) Fetch categories with pagination & sorted by name ascending
-    cursor_cat = (
-        col_cat.find({"caterer_id": cid})
-        .sort("name", 1)
-        .skip(skip_cat)
-        .limit(limit_cat)
-    )
-    categories = list(cursor_cat)
-
-    response: List[dict] = []
-    for cat_doc in categories:
-        cat_id_str = str(cat_doc["_id"])
-        # 2) For each category, fetch its items with pagination & sorting by name ascending
-        cursor_itm = (
-            col_itm.find({"caterer_id": cid, "category_id": cat_id_str})
-            .sort("name", 1)
-            .skip(skip_item)
-            .limit(limit_item)
-        )
-        items = list(cursor_itm)
+    pipeline = [
+        # 1) Categories with pagination & sorted by name ascending
+        {"$match": {"caterer_id": cid}},
+        {"$sort": {"name": 1}},
+        {"$skip": skip_cat},
+        {"$limit": limit_cat},
+        # 2) Each category's items, paginated per category & sorted by name
+        {
+            "$lookup": {
+                "from": "menu_items",
+                "let": {"cat_id": {"$toString": "$_id"}},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "caterer_id": cid,
+                            "$expr": {"$eq": ["$category_id", "$$cat_id"]},
+                        }
+                    },
+                    {"$sort": {"name": 1}},
+                    {"$skip": skip_item},
+                    {"$limit": limit_item},
+                    {"$project": {"search_terms": 0}},
+                ],
+                "as": "items",
+            }
+        },
+    ]
 
+    menu: List[dict] = []
+    for cat_doc in col_cat.aggregate(pipeline):
         # Transform item documents into the MenuItemOut shape
-        item_list = []
-        for itm in items:
-            item_list.append(
-                {
-                    "id":          str(itm["_id"]),
-                    "category_id": itm["category_id"],
-                    "name":        itm["name"],
-                    "description": itm.get("description"),
-                    "created_at":  itm["created_at"],
-                    "updated_at":  itm.get("updated_at"),
-                }
-            )
+        item_list = [
+            {
+                "id":          str(itm["_id"]),
+                "category_id": itm["category_id"],
+                "name":        itm["name"],
+                "description": itm.get("description"),
+                "created_at":  itm["created_at"],
+                "updated_at":  itm.get("updated_at"),
+            }
+            for itm in cat_doc["items"]
+        ]
 
         # Append the category + nested items
-        response.append(
+        menu.append(
             {
-                "id":         cat_id_str,
+                "id":         str(cat_doc["_id"]),
                 "name":       cat_doc["name"],
                 "created_at": cat_doc["created_at"],
                 "updated_at": cat_doc.get("updated_at"),
@@ -433,7 +601,65 @@ def list_full_menu(
             }
         )
 
-    return response
+    return menu
+
+
+# ─── 3.5  Menu & Package Search ────────────────────────────────────────────
+
+@router.get(
+    "/search",
+    response_model=List[schemas.SearchHit],
+)
+def search(
+    cid: str,
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=2, description="Words or word prefixes, e.g. 'pan tik'"),
+    kind: str = Query("all", regex="^(all|items|packages)$"),
+    limit: int = Query(20, ge=1, le=100),
+    mongo_db=Depends(get_mongo_db),
+    _=Depends(check_tenant),
+):
+    """
+    Ranked prefix search across menu items and the menus embedded in packages.
+    """
+    versions = versioning.get_versions(mongo_db, cid, [versioning.MENU, versioning.PACKAGES])
+    etag = make_etag(cid, versions[versioning.MENU], versions[versioning.PACKAGES], request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = make_key(
+        cid, versions[versioning.MENU], versions[versioning.PACKAGES], "search", request.url.query
+    )
+    cached = menu_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    hits = search_menu(mongo_db, cid, q, kind, limit)
+    menu_cache.set(cache_key, hits)
+    return hits
+
+
+# ─── 3.6  Batch Quotes ─────────────────────────────────────────────────────
+
+@router.post(
+    "/quotes",
+    response_model=List[schemas.QuoteLine],
+)
+def create_quotes(
+    cid: str,
+    dto: schemas.QuoteRequest,
+    mongo_db=Depends(get_mongo_db),
+    _=Depends(check_tenant),
+):
+    """
+    Price many (package, guests, extras) combinations in one call.
+    All referenced packages are loaded with a single projected query; a
+    candidate whose package is missing gets a line with `error` set.
+    """
+    packages = load_packages(mongo_db, cid, [c.package_id for c in dto.candidates])
+    return price_quotes(packages, dto)
 
 
 @router.delete(
@@ -464,6 +690,7 @@ def delete_menu_item(
 
     # Delete the item
     col_itm.delete_one({"_id": itm_obj, "caterer_id": cid})
+    versioning.bump_version(mongo_db, cid, versioning.MENU)
 
     return None  # 204 No Content
 
@@ -499,5 +726,6 @@ def delete_menu_category(
 
     # 2) Delete the category itself
     col_cat.delete_one({"_id": cat_obj, "caterer_id": cid})
+    versioning.bump_version(mongo_db, cid, versioning.MENU)
 
     return None  # 204 No Content
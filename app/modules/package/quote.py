@@ -0,0 +1,116 @@
+# app/modules/package/quote.py
+"""
+Batch pricing of (package, guests, extras) candidates.
+
+Packages are loaded once for the whole batch; each candidate is then priced
+from in-memory data: per-guest base price, guest-count slab discount, staff
+add-ons and flat extra services.
+"""
+import bisect
+import math
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List
+
+from bson.objectid import ObjectId
+
+from app.modules.package import schemas
+
+CENTS = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+# Only what pricing needs; menus can be large
+PRICING_PROJECTION = {"name": 1, "price": 1, "waiter_count": 1, "pro_couple_count": 1}
+
+
+def _money(value: Any) -> Decimal:
+    return Decimal(str(value)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def load_packages(mongo_db, cid: str, package_ids: List[str]) -> Dict[str, dict]:
+    """
+    Fetch every referenced package of this tenant in one query.
+    Malformed ids are skipped; the caller reports them as missing.
+    """
+    object_ids = []
+    for package_id in set(package_ids):
+        try:
+            object_ids.append(ObjectId(package_id))
+        except Exception:
+            continue
+    if not object_ids:
+        return {}
+    cursor = mongo_db["packages"].find(
+        {"_id": {"$in": object_ids}, "caterer_id": cid}, PRICING_PROJECTION
+    )
+    return {str(doc["_id"]): doc for doc in cursor}
+
+
+def price_quotes(
+    packages: Dict[str, dict], dto: schemas.QuoteRequest
+) -> List[Dict[str, Any]]:
+    # Slabs sorted once; each candidate picks the highest threshold it reaches
+    slabs = sorted(dto.slabs, key=lambda s: s.min_guests)
+    thresholds = [s.min_guests for s in slabs]
+    waiter_rate = _money(dto.waiter_rate)
+    pro_couple_rate = _money(dto.pro_couple_rate)
+
+    lines: List[Dict[str, Any]] = []
+    for cand in dto.candidates:
+        pkg = packages.get(cand.package_id)
+        if pkg is None:
+            lines.append(
+                {
+                    "package_id": cand.package_id,
+                    "package_name": None,
+                    "label": cand.label,
+                    "guests": cand.guests,
+                    "per_guest_price": ZERO,
+                    "base_amount": ZERO,
+                    "discount_pct": 0.0,
+                    "discount_amount": ZERO,
+                    "waiter_count": 0,
+                    "pro_couple_count": 0,
+                    "staff_amount": ZERO,
+                    "extras_amount": ZERO,
+                    "total": ZERO,
+                    "error": "Package not found",
+                }
+            )
+            continue
+
+        per_guest = _money(pkg["price"])
+        base = per_guest * cand.guests
+
+        slab_idx = bisect.bisect_right(thresholds, cand.guests) - 1
+        discount_pct = slabs[slab_idx].discount_pct if slab_idx >= 0 else 0.0
+        discount = _money(base * Decimal(str(discount_pct)) / 100)
+
+        waiters = pkg.get("waiter_count") or 0
+        if dto.guests_per_waiter:
+            waiters = max(waiters, math.ceil(cand.guests / dto.guests_per_waiter))
+        pro_couples = pkg.get("pro_couple_count") or 0
+        staff = waiter_rate * waiters + pro_couple_rate * pro_couples
+
+        extras = sum(
+            (_money(amount) for amount in (cand.extra_services or {}).values()), ZERO
+        )
+
+        lines.append(
+            {
+                "package_id": cand.package_id,
+                "package_name": pkg["name"],
+                "label": cand.label,
+                "guests": cand.guests,
+                "per_guest_price": per_guest,
+                "base_amount": base,
+                "discount_pct": discount_pct,
+                "discount_amount": discount,
+                "waiter_count": waiters,
+                "pro_couple_count": pro_couples,
+                "staff_amount": staff,
+                "extras_amount": extras,
+                "total": base - discount + staff + extras,
+                "error": None,
+            }
+        )
+    return lines
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, List, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List, Any, Dict
 from datetime import datetime
+from decimal import Decimal
 
 #
 # ─── 2.1  MenuCategory Schemas (unchanged) ─────────────────────────────────────
@@ -63,3 +64,57 @@ class PackageOut(BaseModel):
 
 class FullMenuCategoryOut(MenuCategoryOut):
     items: List[MenuItemOut]
+
+
+#
+# ─── 2.4  Search Schemas ─────────────────────────────────────────────────────
+#
+class SearchHit(BaseModel):
+    kind:         str                              # "item" or "package"
+    id:           str
+    name:         str
+    description:  Optional[str]
+    category_id:  Optional[str]                    # items only
+    matched_menu: Optional[List[dict[str, Any]]]   # packages only
+    score:        float
+
+#
+# ─── 2.5  Quote Schemas ──────────────────────────────────────────────────────
+#
+class DiscountSlab(BaseModel):
+    min_guests:   int   = Field(..., ge=1)
+    discount_pct: float = Field(..., ge=0, le=100)
+
+# Amounts can only add to a quote, never take it below the package price
+NonNegativeAmount = Annotated[float, Field(ge=0)]
+
+class QuoteCandidate(BaseModel):
+    package_id:     str
+    guests:         int                                    = Field(..., ge=1)
+    # service name -> flat amount, e.g. {"DJ": 15000}
+    extra_services: Optional[Dict[str, NonNegativeAmount]] = None
+    label:          Optional[str]                          = None   # e.g. event reference
+
+class QuoteRequest(BaseModel):
+    candidates:        List[QuoteCandidate] = Field(..., min_length=1, max_length=500)
+    slabs:             List[DiscountSlab]   = []
+    waiter_rate:       float                = Field(0, ge=0)
+    pro_couple_rate:   float                = Field(0, ge=0)
+    # when set, waiters = max(package.waiter_count, ceil(guests / guests_per_waiter))
+    guests_per_waiter: Optional[int]        = Field(None, ge=1)
+
+class QuoteLine(BaseModel):
+    package_id:       str
+    package_name:     Optional[str]
+    label:            Optional[str]
+    guests:           int
+    per_guest_price:  Decimal
+    base_amount:      Decimal
+    discount_pct:     float
+    discount_amount:  Decimal
+    waiter_count:     int
+    pro_couple_count: int
+    staff_amount:     Decimal
+    extras_amount:    Decimal
+    total:            Decimal
+    error:            Optional[str] = None
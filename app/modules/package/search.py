@@ -0,0 +1,209 @@
+# app/modules/package/search.py
+"""
+Per-tenant prefix search over menu items and packages.
+
+Each searchable document carries a `search_terms` array holding every prefix
+(2..15 chars) of every word in its name/description (and, for packages, in
+their embedded menu). A multikey index on (caterer_id, search_terms) turns a
+query into an index-only $all lookup; ranking happens on the small candidate
+set in Python.
+
+At most SCAN_LIMIT candidates per collection are ranked. When a broad prefix
+matches more than that, candidates are fetched best-first instead (query
+words as whole words of the name, then as word starts in the name, then
+anywhere), so the ones left out are those that would have ranked lowest.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+MIN_PREFIX = 2
+MAX_PREFIX = 15
+# Candidates fetched per collection before ranking
+SCAN_LIMIT = 200
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+def search_terms(*texts: Optional[str]) -> List[str]:
+    """
+    All indexable prefixes of all words in `texts`.
+    """
+    terms = set()
+    for text in texts:
+        for word in tokenize(text):
+            if len(word) < MIN_PREFIX:
+                continue
+            for end in range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1):
+                terms.add(word[:end])
+    return sorted(terms)
+
+
+def item_search_terms(name: str, description: Optional[str]) -> List[str]:
+    return search_terms(name, description)
+
+
+def package_search_terms(
+    name: str, description: Optional[str], menu: Optional[List[Dict[str, Any]]]
+) -> List[str]:
+    texts: List[Optional[str]] = [name, description]
+    for entry in menu or []:
+        texts.append(entry.get("name"))
+        texts.append(entry.get("description"))
+    return search_terms(*texts)
+
+
+def _query_terms(q: str) -> List[str]:
+    return [w[:MAX_PREFIX] for w in tokenize(q) if len(w) >= MIN_PREFIX]
+
+
+def _text_score(words: List[str], text: Optional[str], weight: float) -> float:
+    score = 0.0
+    candidates = tokenize(text)
+    for word in words:
+        if word in candidates:
+            score += 2 * weight
+        elif any(c.startswith(word) for c in candidates):
+            score += weight
+    return score
+
+
+def _rank(words: List[str], name: str, *others: Optional[str]) -> float:
+    score = _text_score(words, name, 3.0)
+    for text in others:
+        score += _text_score(words, text, 1.0)
+    if name.lower().startswith(" ".join(words)):
+        score += 2.0
+    return score
+
+
+def _name_tiers(words: List[str]) -> List[Dict[str, Any]]:
+    def every_word(pattern: str) -> Dict[str, Any]:
+        return {"$and": [
+            {"name": {"$regex": pattern.format(re.escape(word)), "$options": "i"}}
+            for word in words
+        ]}
+
+    return [
+        every_word(r"(?:^|\W){}(?:\W|$)"),
+        every_word(r"(?:^|\W){}"),
+        {},
+    ]
+
+
+def _candidates(
+    collection, query: Dict[str, Any], projection: Dict[str, int], words: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Up to SCAN_LIMIT documents matching `query`: all of them if they fit,
+    otherwise the strongest name matches first.
+    """
+    docs = list(collection.find(query, projection).limit(SCAN_LIMIT + 1))
+    if len(docs) <= SCAN_LIMIT:
+        return docs
+
+    docs = []
+    for tier in _name_tiers(words):
+        remaining = SCAN_LIMIT - len(docs)
+        if remaining <= 0:
+            break
+        tier_query = {**query, **tier}
+        if docs:
+            tier_query["_id"] = {"$nin": [doc["_id"] for doc in docs]}
+        docs.extend(collection.find(tier_query, projection).limit(remaining))
+    return docs
+
+
+def search_menu(
+    mongo_db, cid: str, q: str, kind: str = "all", limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Find items and packages whose words start with every word of `q`.
+    """
+    words = _query_terms(q)
+    if not words:
+        return []
+    query = {"caterer_id": cid, "search_terms": {"$all": words}}
+    hits: List[Dict[str, Any]] = []
+
+    if kind in ("all", "items"):
+        for doc in _candidates(
+            mongo_db["menu_items"], query, {"name": 1, "description": 1, "category_id": 1}, words
+        ):
+            hits.append(
+                {
+                    "kind": "item",
+                    "id": str(doc["_id"]),
+                    "name": doc["name"],
+                    "description": doc.get("description"),
+                    "category_id": doc.get("category_id"),
+                    "matched_menu": None,
+                    "score": _rank(words, doc["name"], doc.get("description")),
+                }
+            )
+
+    if kind in ("all", "packages"):
+        for doc in _candidates(
+            mongo_db["packages"], query, {"name": 1, "description": 1, "menu": 1}, words
+        ):
+            matched = [
+                entry
+                for entry in doc.get("menu") or []
+                if _rank(words, entry.get("name") or "", entry.get("description")) > 0
+            ]
+            menu_text = " ".join(
+                f"{e.get('name') or ''} {e.get('description') or ''}" for e in matched
+            )
+            hits.append(
+                {
+                    "kind": "package",
+                    "id": str(doc["_id"]),
+                    "name": doc["name"],
+                    "description": doc.get("description"),
+                    "category_id": None,
+                    "matched_menu": matched,
+                    "score": _rank(words, doc["name"], doc.get("description"), menu_text),
+                }
+            )
+
+    hits.sort(key=lambda h: (-h["score"], h["name"].lower()))
+    return hits[:limit]
+
+
+def backfill_search_terms(mongo_db, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    (Re)compute `search_terms` for every item and package; used once after
+    deploying search, and safe to re-run.
+    """
+    counts = {"menu_items": 0, "packages": 0}
+
+    def flush(collection: str, ops: List[UpdateOne]) -> None:
+        if ops:
+            mongo_db[collection].bulk_write(ops, ordered=False)
+            counts[collection] += len(ops)
+
+    def run(collection: str, projection: Dict[str, int], terms_for) -> None:
+        ops: List[UpdateOne] = []
+        for doc in mongo_db[collection].find({}, projection):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_terms": terms_for(doc)}}))
+            if len(ops) >= batch_size:
+                flush(collection, ops)
+                ops = []
+        flush(collection, ops)
+
+    run(
+        "menu_items",
+        {"name": 1, "description": 1},
+        lambda d: item_search_terms(d.get("name") or "", d.get("description")),
+    )
+    run(
+        "packages",
+        {"name": 1, "description": 1, "menu": 1},
+        lambda d: package_search_terms(d.get("name") or "", d.get("description"), d.get("menu")),
+    )
+    return counts
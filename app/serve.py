@@ -0,0 +1,85 @@
+# app/serve.py
+"""
+Production launcher: a gunicorn master supervising uvicorn workers.
+
+    python -m app.serve
+
+Configured from settings (env / .env):
+
+    WEB_CONCURRENCY             worker processes (default: CPUs available)
+    SERVER_PRELOAD              import the app once in the master, then fork
+    SERVER_MAX_REQUESTS         recycle a worker after this many requests,
+    SERVER_MAX_REQUESTS_JITTER  plus up to this many, so they don't all
+                                restart at once (bounds slow memory growth)
+    SERVER_GRACEFUL_TIMEOUT     seconds a stopping worker gets to finish
+                                in-flight requests
+    HOST / PORT                 bind address (Render sets PORT)
+
+Signals to the master: TERM stops gracefully; HUP starts fresh workers and
+retires the old ones once they have drained, without closing the listening
+socket. With SERVER_PRELOAD the code is loaded in the master, so HUP only
+cycles workers; deploy new code with USR2 (spawns a new master on the same
+socket) followed by TERM to the old master.
+
+Every worker runs the app lifespan itself, so each opens its own Mongo
+client after the fork; the SQL engine inherited from a preloading master is
+disposed in `post_fork` for the same reason. `python -m app.main` stays a
+single-process dev server with reload.
+"""
+import os
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    try:
+        # honours CPU affinity / container cpusets, unlike os.cpu_count()
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def post_fork(server, worker) -> None:
+    # drop pooled SQL connections copied from the master; close=False leaves
+    # the master's sockets alone
+    from app.db.cockroach import engine
+
+    engine.dispose(close=False)
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.host}:{settings.port}",
+        "workers": settings.web_concurrency or default_workers(),
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": settings.server_preload,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "timeout": settings.server_timeout,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "keepalive": settings.server_keepalive,
+        "post_fork": post_fork,
+        "accesslog": "-",
+    }
+
+
+class Server(BaseApplication):
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+if __name__ == "__main__":
+    Server(gunicorn_options()).run()
@@ -9,6 +9,7 @@ class EmailService:
         self.user = settings.email_user
         self.password = settings.email_password
         self.sender = settings.email_from
+        self.use_tls = settings.email_use_tls
 
     def send_email(self, to: str, subject: str, html_body: str):
         msg = MIMEText(html_body, "html")
@@ -17,6 +18,8 @@ class EmailService:
         msg["To"]      = to
 
         with smtplib.SMTP(self.host, self.port) as smtp:
-            smtp.starttls()
-            smtp.login(self.user, self.password)
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password)
             smtp.send_message(msg)
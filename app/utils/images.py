@@ -0,0 +1,211 @@
+# app/utils/images.py
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+PROFILE_IMAGE_DIR = os.path.join(os.getcwd(), "static", "profile_images")
+PROFILE_IMAGE_PATH = "/static/profile_images/"
+
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+CHUNK_SIZE = 256 * 1024
+
+# "<caterer_id>_sha256-<first 32 hex digits of the content hash>", as named by
+# store_profile_image. Older uploads ("<caterer_id>_<uuid4 hex>") have no
+# variants; the marker keeps them from matching.
+HASH_MARKER = "_sha256-"
+STORED_STEM = re.compile(r"[^/]+" + HASH_MARKER + r"[0-9a-f]{32}")
+
+# Variant name -> longest edge in pixels. Every variant is written as
+# "<stem>.<name>.webp" next to the original upload.
+VARIANTS: Dict[str, int] = {
+    "thumb": 64,
+    "medium": 256,
+    "large": 1024,
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """
+    One process pool per worker process; a forked worker never reuses
+    its parent's pool.
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.image_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_pid = None
+
+
+def variant_filename(stem: str, name: str) -> str:
+    return f"{stem}.{name}.webp"
+
+
+def render_variants(src_path: str, dest_dir: str, stem: str) -> Dict[str, str]:
+    """
+    Runs inside the process pool: verify the upload really is an image and
+    write the resized WebP variants. Raises ValueError for anything Pillow
+    cannot decode.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(src_path) as probe:
+            probe.verify()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as exc:
+        raise ValueError("Uploaded file is not a valid image") from exc
+
+    written: Dict[str, str] = {}
+    with Image.open(src_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        for name, edge in VARIANTS.items():
+            out_name = variant_filename(stem, name)
+            out_path = os.path.join(dest_dir, out_name)
+            if os.path.exists(out_path):
+                written[name] = out_name
+                continue
+            variant = img.copy()
+            variant.thumbnail((edge, edge))
+            # a temp file of its own: the same image may be rendering for
+            # another upload right now
+            fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=dest_dir)
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    variant.save(tmp, format="WEBP", quality=80, method=4)
+                os.replace(tmp_path, out_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            written[name] = out_name
+    return written
+
+
+async def store_profile_image(upload: UploadFile, caterer_id: str) -> str:
+    """
+    Stream an upload to disk in fixed-size chunks, enforcing the configured
+    size cap, and name it by content hash so re-uploading the same picture
+    reuses the existing file. Variants are generated in the process pool.
+    Returns the stored filename.
+    """
+    ext = os.path.splitext(upload.filename or "")[1].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unsupported image type; use one of {', '.join(sorted(ALLOWED_EXTENSIONS))}",
+        )
+
+    max_bytes = settings.profile_image_max_bytes
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image exceeds {max_bytes} bytes",
+        )
+
+    await run_in_threadpool(os.makedirs, PROFILE_IMAGE_DIR, exist_ok=True)
+    fd, tmp_path = await run_in_threadpool(
+        tempfile.mkstemp, suffix=".part", dir=PROFILE_IMAGE_DIR
+    )
+    out = os.fdopen(fd, "wb")
+
+    try:
+        # ─── 1) Stream to a temp file while hashing ─────────────────────────
+        digest = hashlib.sha256()
+        received = 0
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Image exceeds {max_bytes} bytes",
+                )
+            digest.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+        await run_in_threadpool(out.close)
+
+        if received == 0:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Empty image upload",
+            )
+
+        # ─── 2) Content-addressed name: same bytes, same file ───────────────
+        stem = f"{caterer_id}{HASH_MARKER}{digest.hexdigest()[:32]}"
+        filename = f"{stem}{ext}"
+        final_path = os.path.join(PROFILE_IMAGE_DIR, filename)
+
+        if os.path.exists(final_path) and all(
+            os.path.exists(os.path.join(PROFILE_IMAGE_DIR, variant_filename(stem, name)))
+            for name in VARIANTS
+        ):
+            return filename
+
+        # ─── 3) Validate + render variants off the event loop ───────────────
+        job = get_image_pool().submit(
+            render_variants, tmp_path, PROFILE_IMAGE_DIR, stem
+        )
+        try:
+            await asyncio.wrap_future(job)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            )
+
+        if os.path.exists(final_path):
+            await run_in_threadpool(os.remove, tmp_path)
+        else:
+            await run_in_threadpool(os.replace, tmp_path, final_path)
+        return filename
+    finally:
+        if not out.closed:
+            out.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def image_variant_urls(image_url: str) -> Dict[str, str]:
+    """
+    Map an original profile image URL to the URLs of its variants, plus the
+    original itself under "original". Only names given by
+    store_profile_image (see STORED_STEM) have variants, and that returns
+    after every variant is written, so the URLs follow from the name alone
+    without touching the disk. Older uploads get just the original.
+    """
+    urls = {"original": image_url}
+    marker = image_url.rfind(PROFILE_IMAGE_PATH)
+    if marker == -1:
+        return urls
+    prefix = image_url[: marker + len(PROFILE_IMAGE_PATH)]
+    stem = os.path.splitext(image_url[len(prefix):])[0]
+    if not STORED_STEM.fullmatch(stem):
+        return urls
+    for name in VARIANTS:
+        urls[name] = prefix + variant_filename(stem, name)
+    return urls
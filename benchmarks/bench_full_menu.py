@@ -0,0 +1,117 @@
+# benchmarks/bench_full_menu.py
+"""
+Latency of the nested menu query: the old per-category loop (1 + N round
+trips) against the single aggregation used by `list_full_menu`.
+
+Needs a reachable MongoDB and the usual app settings (.env):
+
+    BENCH_MONGO_URI=mongodb://localhost:27017 python -m benchmarks.bench_full_menu
+
+Seeds a scratch database with 100 categories x 50 items (5000 items), runs
+each variant a number of times and prints min / median / p95 in ms, then
+the before/after ratio of the medians. Both variants must return the same
+items, or the run stops.
+
+Results depend mostly on the round-trip time to the server, so record them
+with the server version and where it ran (same host, same region, ...)
+when quoting them.
+"""
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from pymongo import MongoClient
+
+from app.modules.package.api.package import fetch_full_menu
+
+MONGO_URI = os.environ.get("BENCH_MONGO_URI", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("BENCH_DB", "catertrack_bench")
+CATERER_ID = "bench-caterer"
+CATEGORIES = 100
+ITEMS_PER_CATEGORY = 50
+RUNS = int(os.environ.get("BENCH_RUNS", "30"))
+
+
+def seed(db) -> None:
+    db["menu_categories"].delete_many({"caterer_id": CATERER_ID})
+    db["menu_items"].delete_many({"caterer_id": CATERER_ID})
+    now = datetime.utcnow()
+    cats = [
+        {"caterer_id": CATERER_ID, "name": f"Category {c:03d}", "created_at": now, "updated_at": None}
+        for c in range(CATEGORIES)
+    ]
+    cat_ids = db["menu_categories"].insert_many(cats).inserted_ids
+    items = [
+        {
+            "caterer_id": CATERER_ID,
+            "category_id": str(cat_id),
+            "name": f"Item {i:03d}",
+            "description": "Slow-cooked with whole spices and finished with cream",
+            "created_at": now,
+            "updated_at": None,
+        }
+        for cat_id in cat_ids
+        for i in range(ITEMS_PER_CATEGORY)
+    ]
+    db["menu_items"].insert_many(items)
+    db["menu_categories"].create_index([("caterer_id", 1), ("name", 1)])
+    db["menu_items"].create_index([("caterer_id", 1), ("category_id", 1), ("name", 1)])
+
+
+def legacy_full_menu(db, cid, skip_cat, limit_cat, skip_item, limit_item) -> List[dict]:
+    """The previous implementation: one items query per category."""
+    categories = list(
+        db["menu_categories"].find({"caterer_id": cid}).sort("name", 1).skip(skip_cat).limit(limit_cat)
+    )
+    out = []
+    for cat_doc in categories:
+        items = list(
+            db["menu_items"]
+            .find({"caterer_id": cid, "category_id": str(cat_doc["_id"])})
+            .sort("name", 1)
+            .skip(skip_item)
+            .limit(limit_item)
+        )
+        out.append({"id": str(cat_doc["_id"]), "items": items})
+    return out
+
+
+def measure(label: str, fn: Callable[[], List[dict]]) -> float:
+    fn()  # warm up connection pool and plan cache
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    items = sum(len(c["items"]) for c in result)
+    print(
+        f"{label:<12} categories={len(result):<4} items={items:<5} "
+        f"min={samples[0]:8.2f}ms  median={statistics.median(samples):8.2f}ms  p95={p95:8.2f}ms"
+    )
+    return statistics.median(samples)
+
+
+def item_names(menu: List[dict]) -> List[List[str]]:
+    return [[item["name"] for item in category["items"]] for category in menu]
+
+
+def main() -> None:
+    client = MongoClient(MONGO_URI)
+    db = client[DB_NAME]
+    seed(db)
+    args = (db, CATERER_ID, 0, CATEGORIES, 0, ITEMS_PER_CATEGORY)
+    if item_names(legacy_full_menu(*args)) != item_names(fetch_full_menu(*args)):
+        raise SystemExit("the two variants returned different menus")
+
+    print(f"MongoDB {client.server_info()['version']} at {MONGO_URI}, {RUNS} runs each")
+    before = measure("per-category", lambda: legacy_full_menu(*args))
+    after = measure("aggregation", lambda: fetch_full_menu(*args))
+    print(f"median {before:.2f}ms -> {after:.2f}ms ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_responses.py
+"""
+Bytes on the wire and CPU per response for the large list endpoints: JSON
+encoding (stdlib vs orjson vs pydantic's direct dump) and gzip/brotli
+compression at the levels the app uses.
+
+No databases needed:
+
+    python -m benchmarks.bench_responses
+
+Payloads are the realistic ones from bench_schemas (a 50-order page, the
+12 x 40 full menu, 50 packages). BENCH_RUNS (default 50) calls are timed per
+operation and the median is printed. The transfer column is the time to
+move the body over a BENCH_LINK_KBPS (default 1000, a poor mobile link)
+connection, ignoring latency and TCP slow start. Brotli rows need the
+`brotli` package.
+"""
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.compression import brotli, compress
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.modules.order.schemas import OrderOut
+from app.modules.package.schemas import FullMenuCategoryOut, PackageOut
+from benchmarks.bench_schemas import full_menu, order, package
+
+RUNS = int(os.environ.get("BENCH_RUNS", "50"))
+LINK_KBPS = float(os.environ.get("BENCH_LINK_KBPS", "1000"))
+
+CASES = [
+    ("orders x50", List[OrderOut], [order(i) for i in range(50)]),
+    ("full menu 12x40", List[FullMenuCategoryOut], full_menu()),
+    ("packages x50", List[PackageOut], [package(i) for i in range(50)]),
+]
+
+
+def median_ms(fn: Callable[[], Any]) -> float:
+    fn()
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def transfer_ms(size: int) -> float:
+    return size * 8 / LINK_KBPS
+
+
+def row(label: str, size: int, cpu_ms: float) -> None:
+    print(f"  {label:<34}{size:>10,} B{cpu_ms:>10.3f}ms{transfer_ms(size):>12.1f}ms")
+
+
+def main() -> None:
+    encoder = FastJSONResponse(None)
+    for name, tp, payload in CASES:
+        adapter = TypeAdapter(tp)
+        validated = adapter.validate_python(payload)
+        plain = adapter.dump_python(validated, mode="json")
+        print(f"\n{name:<36}{'bytes':>12}{'cpu':>12}{'@' + format(LINK_KBPS, 'g') + 'kbps':>14}")
+
+        body = json.dumps(
+            jsonable_encoder(plain), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+        row("encode: jsonable_encoder + json", len(body), median_ms(
+            lambda: json.dumps(
+                jsonable_encoder(plain), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode()
+        ))
+        row("encode: orjson (FastJSONResponse)", len(encoder.render(plain)), median_ms(lambda: encoder.render(plain)))
+        row("encode: pydantic dump_json", len(adapter.dump_json(validated)), median_ms(lambda: adapter.dump_json(validated)))
+
+        row(f"gzip level {settings.compression_gzip_level}", len(compress(body, "gzip")),
+            median_ms(lambda: compress(body, "gzip")))
+        if brotli is not None:
+            row(f"brotli quality {settings.compression_brotli_quality}", len(compress(body, "br")),
+                median_ms(lambda: compress(body, "br")))
+        else:
+            print(f"  {'brotli':<34}(not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+# benchmarks/bench_schemas.py
+"""
+Cost of validating and serializing the API schemas at realistic payload
+sizes, with a history to catch regressions.
+
+No databases needed:
+
+    python -m benchmarks.bench_schemas
+
+Every case is timed for three operations where they apply:
+
+  validate   TypeAdapter.validate_python on plain dicts (how endpoints build
+             response models, and how FastAPI re-validates a response_model)
+  response   validate + dump to JSON-able python + json.dumps, i.e. the whole
+             response_model path FastAPI runs per request
+  parse      validate_json on a raw request body (request schemas only)
+
+Each timing is the best per-call time over BENCH_REPEAT (default 7) batches,
+which is the figure least disturbed by the rest of the machine; the median
+is printed alongside. Results are appended to BENCH_HISTORY (default
+benchmarks/history/bench_schemas.jsonl) and compared with the median of the
+last BENCH_BASELINE_RUNS (default 5) runs from the same machine, Python and
+pydantic version. A case slower than that by more than BENCH_THRESHOLD
+(default 0.15, i.e. 15%) fails the run with exit status 1 and is not
+recorded; set BENCH_ACCEPT=1 to record it anyway after an intended change,
+or BENCH_RECORD=0 to compare without recording. BENCH_ONLY=<substring>
+restricts the run to matching cases.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pydantic
+from pydantic import TypeAdapter
+
+from app.modules.caterer.schemas import CatererOut
+from app.modules.customer.schemas import CustomerOut
+from app.modules.order.schemas import OrderOut, OrderWithCustomerIn, PaymentOut
+from app.modules.package.schemas import (
+    FullMenuCategoryOut,
+    MenuItemOut,
+    PackageCreate,
+    PackageOut,
+    QuoteRequest,
+    SearchHit,
+)
+
+REPEAT = int(os.environ.get("BENCH_REPEAT", "7"))
+HISTORY = os.environ.get(
+    "BENCH_HISTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "history", "bench_schemas.jsonl")
+)
+BASELINE_RUNS = int(os.environ.get("BENCH_BASELINE_RUNS", "5"))
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.15"))
+RECORD = os.environ.get("BENCH_RECORD", "1") != "0"
+ACCEPT = os.environ.get("BENCH_ACCEPT", "0") == "1"
+ONLY = os.environ.get("BENCH_ONLY")
+
+NOW = datetime(2025, 3, 1, 12, 30)
+DISHES = ["Paneer Tikka", "Dal Makhani", "Veg Biryani", "Butter Naan", "Gulab Jamun", "Jeera Rice"]
+
+
+# ─── Payloads ────────────────────────────────────────────────────────────────
+# Sizes follow what a busy tenant actually returns: a 12-dish menu per event,
+# 1-3 events per order, a 50-order page, 12 categories x 40 items.
+
+def menu(n: int = 12) -> List[Dict[str, str]]:
+    return [{"name": f"{DISHES[i % len(DISHES)]} {i}", "description": "Served hot, with chutney"} for i in range(n)]
+
+
+def event(i: int) -> Dict[str, Any]:
+    return {
+        "event_id": f"65f1c0ffee{i:014d}",
+        "event_type": "Wedding",
+        "event_date": NOW + timedelta(days=i),
+        "start_time": "19:00",
+        "end_time": "23:30",
+        "venue": "Lotus Banquet, Ring Road",
+        "no_of_guests": 350,
+        "extra_services": {"DJ": 15000, "Decoration": 42000},
+        "menu": {"items": menu()},
+        "total_amount": 315000.0,
+        "created_at": NOW,
+        "updated_at": None,
+    }
+
+
+def order(i: int) -> Dict[str, Any]:
+    return {
+        "order_id": f"1b4e28ba-2fa1-11d2-883f-{i:012d}",
+        "customer": {
+            "customer_id": f"7c9e6679-7425-40de-944b-{i:012d}",
+            "name": "Asha Mehta",
+            "phone": f"98{i:08d}",
+            "email": "asha@example.com",
+        },
+        "events": [event(i * 3 + e) for e in range(1 + i % 3)],
+        "grand_total": Decimal("630000.00"),
+        "paid_till_now": Decimal("150000.00"),
+        "due": Decimal("480000.00"),
+        "paid_status": "PARTIAL",
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def customer(i: int) -> Dict[str, Any]:
+    return {
+        "customer_id": f"7c9e6679-7425-40de-944b-{i:012d}",
+        "name": f"Customer {i}",
+        "phone": f"98{i:08d}",
+        "email": f"customer{i}@example.com" if i % 3 else None,
+        "created_at": NOW,
+        "updated_at": None,
+    }
+
+
+def menu_item(i: int, category_id: str = "65f1c0ffee0000000000000a") -> Dict[str, Any]:
+    return {
+        "id": f"65f1c0ffee{i:014d}",
+        "category_id": category_id,
+        "name": f"{DISHES[i % len(DISHES)]} {i}",
+        "description": "House special, slow-cooked with whole spices",
+        "created_at": NOW,
+        "updated_at": None,
+    }
+
+
+def package(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"65f1c0ffee{i:014d}",
+        "name": f"Package {i:02d}",
+        "price": 850.0,
+        "description": "Three-course dinner with live counters",
+        "menu": menu(),
+        "decoration_type": "Floral",
+        "waiter_count": 8,
+        "pro_couple_count": 1,
+        "created_at": NOW,
+        "updated_at": None,
+    }
+
+
+def full_menu() -> List[Dict[str, Any]]:
+    categories = []
+    for c in range(12):
+        cat_id = f"65f1c0ffee{c:014d}"
+        categories.append(
+            {
+                "id": cat_id,
+                "name": f"Category {c:02d}",
+                "created_at": NOW,
+                "updated_at": None,
+                "items": [menu_item(c * 40 + i, cat_id) for i in range(40)],
+            }
+        )
+    return categories
+
+
+def caterer() -> Dict[str, Any]:
+    return {
+        "id": "3f2504e0-4f89-11d3-9a0c-0305e82c3301",
+        "name": "Shree Caterers",
+        "email": "owner@shree.example.com",
+        "contact": "+91 98765 43210",
+        "address": "12 MG Road",
+        "city": "Pune",
+        "state": "MH",
+        "postal_code": "411001",
+        "description": "Weddings and corporate events since 1998",
+        "profile_image_url": "https://cdn.example.com/caterers/shree/logo.png",
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def search_hits() -> List[Dict[str, Any]]:
+    hits = []
+    for i in range(20):
+        is_item = i % 2 == 0
+        hits.append(
+            {
+                "kind": "item" if is_item else "package",
+                "id": f"65f1c0ffee{i:014d}",
+                "name": f"{DISHES[i % len(DISHES)]} {i}",
+                "description": "House special",
+                "category_id": "65f1c0ffee0000000000000a" if is_item else None,
+                "matched_menu": None if is_item else menu(3),
+                "score": 12.5 - i * 0.25,
+            }
+        )
+    return hits
+
+
+def order_with_customer_body() -> bytes:
+    events = [{k: v for k, v in event(i).items() if k not in ("event_id", "created_at", "updated_at")} for i in range(3)]
+    body = {"phone": "9876543210", "name": "Asha Mehta", "email": "asha@example.com", "events": events}
+    return json.dumps(body, default=str).encode()
+
+
+def quote_body() -> bytes:
+    body = {
+        "candidates": [
+            {"package_id": f"65f1c0ffee{i % 15:014d}", "guests": 100 + i * 10, "extra_services": {"DJ": 15000}}
+            for i in range(100)
+        ],
+        "slabs": [{"min_guests": 200, "discount_pct": 5}, {"min_guests": 500, "discount_pct": 10}],
+        "waiter_rate": 800,
+        "pro_couple_rate": 2500,
+        "guests_per_waiter": 25,
+    }
+    return json.dumps(body).encode()
+
+
+def package_create_body() -> bytes:
+    body = {k: v for k, v in package(0).items() if k not in ("id", "created_at", "updated_at")}
+    return json.dumps(body).encode()
+
+
+# (name, type, python payload or None, JSON request body or None)
+CASES: List[Tuple[str, Any, Optional[Any], Optional[bytes]]] = [
+    ("OrderOut", OrderOut, order(1), None),
+    ("List[OrderOut] x50", List[OrderOut], [order(i) for i in range(50)], None),
+    ("List[CustomerOut] x200", List[CustomerOut], [customer(i) for i in range(200)], None),
+    ("PaymentOut", PaymentOut,
+     {"payment_id": "p-1", "amount": Decimal("15000.00"), "datetime": NOW, "type": "UPI", "notes": None}, None),
+    ("List[PackageOut] x50", List[PackageOut], [package(i) for i in range(50)], None),
+    ("List[MenuItemOut] x100", List[MenuItemOut], [menu_item(i) for i in range(100)], None),
+    ("List[FullMenuCategoryOut] 12x40", List[FullMenuCategoryOut], full_menu(), None),
+    ("List[SearchHit] x20", List[SearchHit], search_hits(), None),
+    ("CatererOut", CatererOut, caterer(), None),
+    ("OrderWithCustomerIn 3 events", OrderWithCustomerIn, None, order_with_customer_body()),
+    ("QuoteRequest x100", QuoteRequest, None, quote_body()),
+    ("PackageCreate", PackageCreate, None, package_create_body()),
+]
+
+
+# ─── Timing ──────────────────────────────────────────────────────────────────
+
+def operations(tp: Any, payload: Optional[Any], body: Optional[bytes]) -> Dict[str, Callable[[], Any]]:
+    adapter = TypeAdapter(tp)
+    ops: Dict[str, Callable[[], Any]] = {}
+    if payload is not None:
+        ops["validate"] = lambda: adapter.validate_python(payload)
+        ops["response"] = lambda: json.dumps(
+            adapter.dump_python(adapter.validate_python(payload), mode="json"),
+            ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+        )
+    if body is not None:
+        ops["parse"] = lambda: adapter.validate_json(body)
+    return ops
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[float, float]:
+    """Best and median per-call time in microseconds."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()  # enough loops for >= 0.2s per batch
+    per_call = sorted(t / loops * 1e6 for t in timer.repeat(repeat=REPEAT, number=loops))
+    return per_call[0], statistics.median(per_call)
+
+
+# ─── History ─────────────────────────────────────────────────────────────────
+
+def environment() -> str:
+    return (
+        f"{platform.node()}/{platform.machine()}/"
+        f"{platform.python_implementation()}-{platform.python_version()}/pydantic-{pydantic.VERSION}"
+    )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline(env: str) -> Dict[str, float]:
+    if not os.path.exists(HISTORY):
+        return {}
+    runs = []
+    with open(HISTORY) as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["environment"] == env:
+                runs.append(entry["results"])
+    history: Dict[str, List[float]] = {}
+    for results in runs[-BASELINE_RUNS:]:
+        for key, best in results.items():
+            history.setdefault(key, []).append(best)
+    return {key: statistics.median(values) for key, values in history.items()}
+
+
+def record(env: str, results: Dict[str, float]) -> None:
+    os.makedirs(os.path.dirname(HISTORY), exist_ok=True)
+    with open(HISTORY, "a") as f:
+        entry = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "environment": env,
+            "results": {key: round(value, 3) for key, value in results.items()},
+        }
+        f.write(json.dumps(entry) + "\n")
+
+
+def main() -> int:
+    env = environment()
+    previous = baseline(env)
+    results: Dict[str, float] = {}
+    regressions: List[str] = []
+
+    print(f"{'case':<44}{'best':>12}{'median':>12}{'baseline':>12}{'change':>9}")
+    for name, tp, payload, body in CASES:
+        if ONLY and ONLY.lower() not in name.lower():
+            continue
+        for op, fn in operations(tp, payload, body).items():
+            key = f"{name} [{op}]"
+            best, median = measure(fn)
+            results[key] = best
+            base = previous.get(key)
+            if base:
+                change = best / base - 1
+                flag = "  REGRESSED" if change > THRESHOLD else ""
+                if flag:
+                    regressions.append(key)
+                print(f"{key:<44}{best:10.1f}us{median:10.1f}us{base:10.1f}us{change:+8.1%}{flag}")
+            else:
+                print(f"{key:<44}{best:10.1f}us{median:10.1f}us{'-':>12}{'new':>9}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {THRESHOLD:.0%}:")
+        for key in regressions:
+            print(f"  {key}")
+    if RECORD and (ACCEPT or not regressions):
+        record(env, results)
+        print(f"\nrecorded in {HISTORY}")
+    return 1 if regressions and not ACCEPT else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
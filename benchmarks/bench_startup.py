@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start time of a worker: from spawning the server process to the first
+successful response, plus the import time of `app.main` on its own.
+
+Needs the usual app settings (.env) and reachable databases, since startup
+warms the Mongo client:
+
+    python -m benchmarks.bench_startup
+
+BENCH_RUNS (default 5) servers are started one after another on
+BENCH_PORT (default 8765); each is polled on BENCH_PATH (default /healthz)
+and stopped once it answers.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import List
+
+RUNS = int(os.environ.get("BENCH_RUNS", "5"))
+PORT = int(os.environ.get("BENCH_PORT", "8765"))
+PATH = os.environ.get("BENCH_PATH", "/healthz")
+TIMEOUT = float(os.environ.get("BENCH_TIMEOUT", "60"))
+
+
+def import_time() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_to_first_response() -> float:
+    url = f"http://127.0.0.1:{PORT}{PATH}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+    )
+    try:
+        while time.perf_counter() - start < TIMEOUT:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"no response from {url} within {TIMEOUT}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples.sort()
+    print(
+        f"{label:<20} runs={len(samples):<3} min={samples[0]:8.1f}ms  "
+        f"median={statistics.median(samples):8.1f}ms  max={samples[-1]:8.1f}ms"
+    )
+
+
+def main() -> None:
+    report("import app.main", [import_time() for _ in range(RUNS)])
+    report("first response", [time_to_first_response() for _ in range(RUNS)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# benchmarks/loadtest/run.py
+"""
+Repeatable load test against local stand-ins for the production services.
+
+    docker compose -f benchmarks/loadtest/docker-compose.yml up -d
+    python -m benchmarks.loadtest.run --workers 2 --concurrency 32 --duration 60
+
+Settings come from benchmarks/loadtest/loadtest.env (override with --env-file
+or the environment). Unless --base-url points at an already running server,
+the schema and indexes are created with `app.manage` and uvicorn is started
+with --workers workers. Tenants are seeded once (see seed.py) and reused on
+later runs; --no-seed only logs the tenants in.
+
+Each client thread repeatedly picks a workload (weighted, or only
+--scenario) for a random tenant. The report lists count, errors, throughput
+and p50/p95/p99/max latency per step and per workload; --json also writes it
+to a file for comparing runs.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_env(path: str) -> None:
+    # before any app import: app.core.config reads the environment once
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            os.environ.setdefault(key.strip(), value.strip())
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = min(int(round(p / 100 * (len(sorted_samples) - 1))), len(sorted_samples) - 1)
+    return sorted_samples[k]
+
+
+def start_server(port: int, workers: int, timeout: float) -> subprocess.Popen:
+    import httpx
+
+    for command in ("create-schema", "ensure-indexes"):
+        subprocess.run([sys.executable, "-m", "app.manage", command], check=True)
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"server did not answer /healthz within {timeout}s")
+
+
+def worker(base_url, tenants, workloads, weights, stop_at, seed, results, lock) -> None:
+    import httpx
+
+    from benchmarks.loadtest.workloads import Session
+
+    rng = random.Random(seed)
+    samples, journeys = [], []
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        while time.monotonic() < stop_at:
+            name, journey = rng.choices(workloads, weights=weights)[0]
+            session = Session(client, rng.choice(tenants), rng)
+            started = time.perf_counter()
+            journey(session)
+            elapsed = time.perf_counter() - started
+            failed = any(status == 0 or status >= 400 for _, _, status in session.samples)
+            journeys.append((name, elapsed, failed))
+            samples.extend(session.samples)
+    with lock:
+        results["steps"].extend(samples)
+        results["workloads"].extend(journeys)
+
+
+def summarize(rows, wall: float) -> Dict[str, Dict[str, float]]:
+    """
+    rows are (name, seconds, failed) tuples.
+    """
+    grouped: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for name, seconds, failed in rows:
+        grouped[name].append(seconds * 1000)
+        errors[name] += int(failed)
+    summary = {}
+    for name in sorted(grouped):
+        ms = sorted(grouped[name])
+        summary[name] = {
+            "count": len(ms),
+            "errors": errors[name],
+            "rps": round(len(ms) / wall, 2),
+            "p50_ms": round(statistics.median(ms), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "max_ms": round(ms[-1], 2),
+        }
+    return summary
+
+
+def print_table(title: str, summary: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print(f"{'name':<28}{'count':>8}{'errors':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, s in summary.items():
+        print(
+            f"{name:<28}{s['count']:>8}{s['errors']:>8}{s['rps']:>9.1f}"
+            f"{s['p50_ms']:>8.1f}ms{s['p95_ms']:>8.1f}ms{s['p99_ms']:>8.1f}ms{s['max_ms']:>8.1f}ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--env-file", default=os.path.join(HERE, "loadtest.env"))
+    parser.add_argument("--base-url", help="test a server that is already running")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument("--scenario", action="append", help="only run these workloads (repeatable)")
+    parser.add_argument("--tenants", type=int, default=5)
+    parser.add_argument("--customers", type=int, default=2000, help="customers per tenant")
+    parser.add_argument("--orders", type=int, default=10000, help="orders per tenant")
+    parser.add_argument("--items-per-category", type=int, default=40)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the tenants as they are")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    load_env(args.env_file)
+    from benchmarks.loadtest import seed as seeding
+    from benchmarks.loadtest.workloads import WORKLOADS
+
+    selected = args.scenario or list(WORKLOADS)
+    unknown = set(selected) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}; choose from {', '.join(WORKLOADS)}")
+    workloads = [(name, WORKLOADS[name][0]) for name in selected]
+    weights = [WORKLOADS[name][1] for name in selected]
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = start_server(args.port, args.workers, timeout=120)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        if args.no_seed:
+            import httpx
+
+            with httpx.Client(base_url=base_url, timeout=60) as client:
+                tenants = [seeding.register_and_login(client, n) for n in range(args.tenants)]
+        else:
+            tenants = seeding.seed(
+                base_url, args.tenants, args.customers, args.orders, args.items_per_category, args.seed
+            )
+        if any(not t.order_ids for t in tenants) and "payment" in selected:
+            parser.error("payment workload needs seeded orders; drop --no-seed on the first run")
+
+        results = {"steps": [], "workloads": []}
+        lock = threading.Lock()
+        print(f"running {', '.join(selected)} for {args.duration:.0f}s with {args.concurrency} clients")
+        started = time.monotonic()
+        stop_at = started + args.duration
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(base_url, tenants, workloads, weights, stop_at, args.seed + i, results, lock),
+            )
+            for i in range(args.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.monotonic() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    steps = summarize(
+        [(step, seconds, status == 0 or status >= 400) for step, seconds, status in results["steps"]], wall
+    )
+    journeys = summarize(results["workloads"], wall)
+    print_table("per step", steps)
+    print_table("per workload", journeys)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "config": {k: v for k, v in vars(args).items() if k != "json"},
+                    "wall_seconds": round(wall, 2),
+                    "steps": steps,
+                    "workloads": journeys,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
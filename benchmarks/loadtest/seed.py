@@ -0,0 +1,240 @@
+# benchmarks/loadtest/seed.py
+"""
+Seed load-test tenants.
+
+Owners are registered and logged in through the API (so passwords and
+tokens are real); their bulk data goes straight into the databases with the
+app's own models and helpers, which is orders of magnitude faster than
+thousands of POSTs. Tenants that already hold data are reused as-is.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import insert
+
+PASSWORD = "loadtest-password"
+
+EVENT_TYPES = ["Wedding", "Reception", "Birthday", "Corporate lunch", "Engagement", "Puja"]
+VENUES = ["Lotus Banquet", "Green Lawns", "Hotel Regency", "Community Hall", "Client residence"]
+DISHES = [
+    "Paneer Tikka", "Dal Makhani", "Veg Biryani", "Butter Naan", "Gulab Jamun", "Jeera Rice",
+    "Malai Kofta", "Chole Bhature", "Masala Dosa", "Rasmalai", "Hakka Noodles", "Manchurian",
+    "Pav Bhaji", "Kaju Katli", "Tandoori Roti", "Aloo Gobi", "Palak Paneer", "Veg Pulao",
+]
+CATEGORIES = [
+    "Starters", "Soups", "Main Course", "Breads", "Rice", "Desserts", "Beverages", "Chinese",
+    "South Indian", "Chaat", "Salads", "Live Counters",
+]
+
+
+@dataclass
+class Tenant:
+    cid: str
+    email: str
+    token: str
+    order_ids: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def owner_email(n: int) -> str:
+    return f"loadtest+{n}@catertrack.local"
+
+
+def register_and_login(client: httpx.Client, n: int) -> Tenant:
+    email = owner_email(n)
+    client.post("/auth/register", json={"email": email, "contact": f"Load Test {n}", "password": PASSWORD})
+    resp = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    resp.raise_for_status()
+    token = resp.json()["access_token"]
+    me = client.get("/caterer/profile", headers={"Authorization": f"Bearer {token}"})
+    me.raise_for_status()
+    return Tenant(cid=me.json()["id"], email=email, token=token)
+
+
+def _menu(rng: random.Random) -> Dict[str, List[Dict[str, str]]]:
+    return {
+        "items": [
+            {"name": dish, "description": f"{dish}, served hot"}
+            for dish in rng.sample(DISHES, rng.randint(6, 12))
+        ]
+    }
+
+
+def seed_menu(mongo_db, cid: str, rng: random.Random, items_per_category: int) -> None:
+    from app.modules.package.search import item_search_terms, package_search_terms
+
+    now = datetime.utcnow()
+    cat_ids = mongo_db["menu_categories"].insert_many(
+        [{"caterer_id": cid, "name": name, "created_at": now, "updated_at": None} for name in CATEGORIES]
+    ).inserted_ids
+    items = []
+    for cat_id, cat_name in zip(cat_ids, CATEGORIES):
+        for i in range(items_per_category):
+            name = f"{rng.choice(DISHES)} {cat_name} {i:03d}"
+            description = f"House special {cat_name.lower()} item"
+            items.append(
+                {
+                    "caterer_id": cid,
+                    "category_id": str(cat_id),
+                    "name": name,
+                    "description": description,
+                    "search_terms": item_search_terms(name, description),
+                    "created_at": now,
+                    "updated_at": None,
+                }
+            )
+    mongo_db["menu_items"].insert_many(items)
+
+    packages = []
+    for i in range(15):
+        menu = _menu(rng)["items"]
+        name = f"Package {i:02d}"
+        packages.append(
+            {
+                "caterer_id": cid,
+                "name": name,
+                "price": float(rng.randrange(300, 1500, 50)),
+                "description": "Load-test package",
+                "menu": menu,
+                "decoration_type": rng.choice(["Floral", "Classic", None]),
+                "waiter_count": rng.randint(2, 10),
+                "pro_couple_count": rng.randint(0, 2),
+                "search_terms": package_search_terms(name, "Load-test package", menu),
+                "created_at": now,
+                "updated_at": None,
+            }
+        )
+    mongo_db["packages"].insert_many(packages)
+
+
+def seed_orders(db, mongo_db, cid: str, rng: random.Random, customers: int, orders: int) -> List[str]:
+    from app.core import versioning
+    from app.modules.customer.models import Customer
+    from app.modules.order.events import store_menus
+    from app.modules.order.models import Order, Payment
+
+    customer_rows = [
+        {
+            "customer_id": str(uuid.uuid4()),
+            "caterer_id": cid,
+            "name": f"Customer {i}",
+            "phone": f"98{i:08d}",  # unique per tenant
+            "email": f"customer{i}@example.com" if i % 3 else None,
+        }
+        for i in range(customers)
+    ]
+    for start in range(0, len(customer_rows), 1000):
+        db.execute(insert(Customer), customer_rows[start:start + 1000])
+
+    menus = [_menu(rng) for _ in range(20)]
+    menu_hashes = store_menus(mongo_db, menus)
+    now = datetime.utcnow()
+
+    order_ids: List[str] = []
+    order_rows, payment_rows, event_docs = [], [], []
+    for _ in range(orders):
+        order_id = str(uuid.uuid4())
+        order_ids.append(order_id)
+        total = Decimal(0)
+        for _ in range(rng.randint(1, 3)):
+            guests = rng.randint(50, 800)
+            amount = guests * rng.randrange(300, 1200, 50)
+            total += amount
+            event_docs.append(
+                {
+                    "order_id": order_id,
+                    "caterer_id": cid,
+                    "event_type": rng.choice(EVENT_TYPES),
+                    "event_date": now + timedelta(days=rng.randint(-180, 180)),
+                    "start_time": "12:00",
+                    "end_time": "16:00",
+                    "venue": rng.choice(VENUES),
+                    "no_of_guests": guests,
+                    "extra_services": {"DJ": 15000} if rng.random() < 0.3 else None,
+                    "menu_hash": rng.choice(menu_hashes),
+                    "total_amount": float(amount),
+                    "created_at": now,
+                    "updated_at": None,
+                }
+            )
+        paid = Decimal(0)
+        if rng.random() < 0.5:
+            paid = (total * Decimal(rng.choice(["0.25", "0.5", "1"]))).quantize(Decimal("0.01"))
+            payment_rows.append(
+                {
+                    "payment_id": str(uuid.uuid4()),
+                    "order_id": order_id,
+                    "amount": paid,
+                    "datetime": now,
+                    "type": rng.choice(["CASH", "UPI", "BANK"]),
+                    "notes": None,
+                }
+            )
+        due = total - paid
+        order_rows.append(
+            {
+                "order_id": order_id,
+                "caterer_id": cid,
+                "customer_id": rng.choice(customer_rows)["customer_id"],
+                "grand_total": total,
+                "paid_till_now": paid,
+                "due": due,
+                "paid_status": "PAID" if due <= 0 else ("PARTIAL" if paid else "UNPAID"),
+            }
+        )
+
+    for start in range(0, len(order_rows), 1000):
+        db.execute(insert(Order), order_rows[start:start + 1000])
+    for start in range(0, len(payment_rows), 1000):
+        db.execute(insert(Payment), payment_rows[start:start + 1000])
+    db.commit()
+    for start in range(0, len(event_docs), 5000):
+        mongo_db["events"].insert_many(event_docs[start:start + 5000], ordered=False)
+
+    versioning.bump_version(mongo_db, cid, versioning.MENU, versioning.PACKAGES, versioning.ORDERS)
+    return order_ids
+
+
+def seed(
+    base_url: str,
+    tenants: int,
+    customers: int,
+    orders: int,
+    items_per_category: int,
+    random_seed: int = 42,
+) -> List[Tenant]:
+    from app.db.cockroach import SessionLocal
+    from app.db.mongo import get_mongo_db
+    from app.modules.order.models import Order
+
+    rng = random.Random(random_seed)
+    mongo_db = get_mongo_db()
+    result: List[Tenant] = []
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for n in range(tenants):
+            tenant = register_and_login(client, n)
+            db = SessionLocal()
+            try:
+                existing = [
+                    row.order_id
+                    for row in db.query(Order.order_id).filter_by(caterer_id=tenant.cid)
+                ]
+                if existing:
+                    tenant.order_ids = existing
+                    print(f"tenant {n}: reusing {len(existing)} orders")
+                else:
+                    seed_menu(mongo_db, tenant.cid, rng, items_per_category)
+                    tenant.order_ids = seed_orders(db, mongo_db, tenant.cid, rng, customers, orders)
+                    print(f"tenant {n}: seeded {customers} customers, {orders} orders")
+            finally:
+                db.close()
+            result.append(tenant)
+    return result
@@ -0,0 +1,128 @@
+# benchmarks/loadtest/workloads.py
+"""
+Scripted user journeys. Each workload is one iteration of what a screen in
+the UI does; every HTTP call is timed as its own step, labelled
+"<workload>.<step>".
+"""
+import io
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.loadtest.seed import Tenant
+
+# (step, seconds, status)
+Sample = Tuple[str, float, int]
+
+
+class Session:
+    def __init__(self, client: httpx.Client, tenant: Tenant, rng: random.Random):
+        self.client = client
+        self.tenant = tenant
+        self.rng = rng
+        self.samples: List[Sample] = []
+
+    def call(self, step: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            resp = self.client.request(method, url, headers=self.tenant.headers, **kwargs)
+            status = resp.status_code
+        except httpx.HTTPError:
+            resp, status = None, 0
+        self.samples.append((step, time.perf_counter() - started, status))
+        return resp
+
+
+def dashboard(s: Session) -> None:
+    cid = s.tenant.cid
+    s.call("dashboard.profile", "GET", "/caterer/profile")
+    s.call("dashboard.orders", "GET", f"/caterer/{cid}/orders")
+    s.call("dashboard.customers", "GET", f"/caterer/{cid}/customer")
+    s.call("dashboard.packages", "GET", f"/caterer/{cid}/packages", params={"fields": "name,price"})
+
+
+def _event(s: Session) -> Dict:
+    return {
+        "event_type": "Wedding",
+        "event_date": datetime.utcnow().isoformat(),
+        "start_time": "19:00",
+        "end_time": "23:00",
+        "venue": "Lotus Banquet",
+        "no_of_guests": s.rng.randint(50, 800),
+        "extra_services": None,
+        "menu": {"items": [{"name": "Paneer Tikka", "description": "served hot"}]},
+        "total_amount": float(s.rng.randrange(50_000, 500_000, 500)),
+    }
+
+
+def create_order(s: Session) -> None:
+    cid = s.tenant.cid
+    body = {
+        "phone": f"97{s.rng.randrange(10**8):08d}",
+        "name": "Walk-in customer",
+        "email": None,
+        "events": [_event(s) for _ in range(s.rng.randint(1, 3))],
+    }
+    resp = s.call("create_order.order", "POST", f"/caterer/{cid}/order-with-customer", json=body)
+    if resp is not None and resp.status_code == 201:
+        s.tenant.order_ids.append(resp.json()["order_id"])
+        s.call("create_order.reload", "GET", f"/caterer/{cid}/orders/{resp.json()['order_id']}")
+
+
+def payment(s: Session) -> None:
+    cid = s.tenant.cid
+    order_id = s.rng.choice(s.tenant.order_ids)
+    s.call("payment.list", "GET", f"/caterer/{cid}/orders/{order_id}/payments")
+    s.call(
+        "payment.create",
+        "POST",
+        f"/caterer/{cid}/orders/{order_id}/payments",
+        json={
+            "amount": str(s.rng.randrange(500, 5000)),
+            "datetime": datetime.utcnow().isoformat(),
+            "type": s.rng.choice(["CASH", "UPI"]),
+            "notes": "load test",
+        },
+    )
+
+
+def menu_browse(s: Session) -> None:
+    cid = s.tenant.cid
+    s.call("menu.categories", "GET", f"/caterer/{cid}/menu/category")
+    resp = s.call("menu.items", "GET", f"/caterer/{cid}/menu/item", params={"limit": 50})
+    cursor = resp.headers.get("X-Next-Cursor") if resp is not None else None
+    if cursor:
+        s.call("menu.items_next", "GET", f"/caterer/{cid}/menu/item", params={"limit": 50, "cursor": cursor})
+    s.call("menu.full_menu", "GET", f"/caterer/{cid}/menu")
+    s.call("menu.search", "GET", f"/caterer/{cid}/search", params={"q": s.rng.choice(["pan", "dal", "biry", "gul"])})
+
+
+def csv_import(s: Session) -> None:
+    cid = s.tenant.cid
+    batch = uuid.uuid4().hex[:6]
+    rows = ["Category,Item,Description"]
+    for i in range(200):
+        # mostly existing categories, a few new ones; every item new
+        category = s.rng.choice(["Starters", "Desserts", f"Import {batch}"])
+        rows.append(f"{category},Imported dish {batch}-{i},Imported by the load test")
+    data = io.BytesIO(("\n".join(rows) + "\n").encode())
+    s.call(
+        "csv_import.import",
+        "POST",
+        f"/caterer/{cid}/menu/import",
+        files={"file": ("menu.csv", data, "text/csv")},
+    )
+
+
+# name -> (journey, relative weight in the mixed run)
+WORKLOADS: Dict[str, Tuple[Callable[[Session], None], int]] = {
+    "dashboard": (dashboard, 30),
+    "menu_browse": (menu_browse, 35),
+    "create_order": (create_order, 15),
+    "payment": (payment, 18),
+    "csv_import": (csv_import, 2),
+}
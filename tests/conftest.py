@@ -0,0 +1,115 @@
+# tests/conftest.py
+"""
+Shared fixtures. Tests run without CockroachDB or MongoDB: SQL goes to an
+in-memory SQLite database and Mongo to mongomock, both fresh per test.
+
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+import os
+
+# Settings are read at import time; give the required ones test values.
+for name, value in {
+    "COCKROACH_DATABASE_URL": "sqlite://",
+    "MONGO_URI": "mongodb://localhost:1",
+    "SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "5",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PORT": "25",
+    "EMAIL_USER": "test",
+    "EMAIL_PASSWORD": "test",
+    "EMAIL_FROM": "test@example.com",
+    "FRONTEND_URL": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
+
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.modules.auth.models  # noqa: F401
+import app.modules.caterer.models  # noqa: F401
+import app.modules.customer.models  # noqa: F401
+import app.modules.order.models  # noqa: F401
+from app.core import cache
+from app.db.cockroach import Base, SessionLocal
+from app.db.mongo import get_mongo_db
+from app.db.stale import StaleSessionLocal
+from app.modules.auth.api.deps import get_current_user
+
+CID = "c1"
+
+# Newer pymongo passes sort= to bulk updates; mongomock doesn't take it yet.
+_add_update = mongomock.collection.BulkOperationBuilder.add_update
+mongomock.collection.BulkOperationBuilder.add_update = (
+    lambda self, *args, sort=None, **kwargs: _add_update(self, *args, **kwargs)
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    for backend in cache._caches.values():
+        if isinstance(backend, cache.LRUCache):
+            backend.clear()
+    yield
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal.configure(bind=engine)
+    StaleSessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def mongo():
+    return mongomock.MongoClient()["catertrack"]
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(id="u1", caterer_id=CID, role="OWNER")
+
+
+@pytest.fixture
+def make_client(engine, mongo, user):
+    """
+    make_client(router, ...) -> TestClient for an app with just those
+    routers, authenticated as `user` (an OWNER of caterer "c1").
+    """
+
+    def make(*routers, middleware=(), raise_server_exceptions=True):
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router)
+        for cls in middleware:
+            app.add_middleware(cls)
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_mongo_db] = lambda: mongo
+        return TestClient(app, raise_server_exceptions=raise_server_exceptions)
+
+    return make
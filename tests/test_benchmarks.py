@@ -0,0 +1,54 @@
+# tests/test_benchmarks.py
+"""
+The benchmark fixtures and load-test journeys are only run by hand; these
+keep them in step with the schemas and endpoints they exercise.
+"""
+import random
+
+import pytest
+
+from app.modules.caterer.api import profile
+from app.modules.caterer.models import Caterer
+from app.modules.customer.api import customer
+from app.modules.order.api import order
+from app.modules.package.api import menu_import, package
+from benchmarks.bench_schemas import CASES, operations
+from benchmarks.loadtest.run import percentile, summarize
+from benchmarks.loadtest.seed import Tenant
+from benchmarks.loadtest.workloads import Session, WORKLOADS
+
+
+@pytest.mark.parametrize("name,tp,payload,body", CASES, ids=[case[0] for case in CASES])
+def test_schema_benchmark_cases_are_valid(name, tp, payload, body):
+    ops = operations(tp, payload, body)
+    assert ops
+    for fn in ops.values():
+        fn()
+
+
+def test_summary_percentiles():
+    assert percentile([], 95) == 0.0
+    assert percentile([float(i) for i in range(1, 101)], 95) == 95.0
+
+    summary = summarize([("a", 0.010, False), ("a", 0.030, True), ("b", 0.002, False)], wall=2.0)
+    assert summary["a"] == {
+        "count": 2, "errors": 1, "rps": 1.0, "p50_ms": 20.0, "p95_ms": 30.0, "p99_ms": 30.0, "max_ms": 30.0,
+    }
+    assert summary["b"]["count"] == 1
+
+
+def test_journeys_succeed(make_client, db):
+    db.add(Caterer(id="c1", name="Annapurna", email="owner@example.com", contact="1"))
+    db.commit()
+    client = make_client(order.router, customer.router, package.router, menu_import.router, profile.router)
+    session = Session(client, Tenant(cid="c1", email="owner@example.com", token="-"), random.Random(1))
+
+    # the full menu and search steps need $lookup, which mongomock lacks
+    for name in ("create_order", "payment", "csv_import", "dashboard"):
+        journey, _ = WORKLOADS[name]
+        journey(session)
+
+    failed = [(step, status) for step, _, status in session.samples if not 200 <= status < 400]
+    steps = {step for step, _, _ in session.samples}
+    assert not failed
+    assert {"create_order.order", "payment.create", "csv_import.import"} <= steps
@@ -0,0 +1,152 @@
+# tests/test_cache.py
+import logging
+import threading
+
+import pytest
+
+from app.core import versioning
+from app.core.cache import CacheBackend, LRUCache, RedisCache
+from app.modules.caterer.api import profile
+from app.modules.caterer.models import Caterer
+from app.modules.customer.api import customer
+from app.modules.package.api import package
+
+PACKAGES = "/caterer/c1/packages"
+CUSTOMERS = "/caterer/c1/customer"
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend("x")
+
+
+def test_lru_evicts_by_count_and_bytes():
+    cache = LRUCache("t", max_entries=2, max_bytes=10_000)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now the most recent
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    small = LRUCache("t", max_entries=100, max_bytes=200)
+    small.set("big", "x" * 500)
+    assert small.get("big") is None
+    small.set("a", "x" * 60)
+    small.set("b", "x" * 60)
+    small.set("c", "x" * 60)
+    assert small.bytes <= 200
+    assert small.get("a") is None
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache("t", max_entries=10, max_bytes=10_000)
+    cache.set("k", "v", ttl=5)
+    now[0] += 4
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+
+
+def test_cached_values_are_copies():
+    cache = LRUCache("t", max_entries=10, max_bytes=10_000)
+    value = {"items": [1]}
+    cache.set("k", value)
+    value["items"].append(2)
+    cache.get("k")["items"].append(3)
+    assert cache.get("k") == {"items": [1]}
+
+
+def test_hit_and_miss_counts_are_exact_across_threads():
+    cache = LRUCache("t", max_entries=10, max_bytes=10_000)
+    cache.set("hit", 1)
+
+    def lookups():
+        for _ in range(2000):
+            cache.get("hit")
+            cache.get("miss")
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == 16_000
+    assert stats["hit_rate"] == 0.5
+
+
+def test_reads_are_served_from_cache_until_a_write(make_client, mongo):
+    client = make_client(package.router)
+    client.post(PACKAGES, json={"name": "Gold", "price": 500})
+    assert [p["name"] for p in client.get(PACKAGES).json()] == ["Gold"]
+
+    # a change behind the API's back isn't seen: the read was cached
+    mongo["packages"].update_many({}, {"$set": {"name": "Changed"}})
+    assert [p["name"] for p in client.get(PACKAGES).json()] == ["Gold"]
+
+    # a write through the API bumps the version and invalidates it
+    client.post(PACKAGES, json={"name": "Silver", "price": 300})
+    assert sorted(p["name"] for p in client.get(PACKAGES).json()) == ["Changed", "Silver"]
+
+
+def test_customer_reads_are_invalidated_by_customer_writes(make_client, db):
+    client = make_client(customer.router)
+    assert client.get(f"{CUSTOMERS}/search", params={"phone": "1"}).json() is None
+    assert client.get(CUSTOMERS).json() == []
+
+    client.post(CUSTOMERS, json={"name": "Asha", "phone": "1"})
+
+    # the cached "no such phone" and the empty list are both gone
+    assert client.get(f"{CUSTOMERS}/search", params={"phone": "1"}).json()["name"] == "Asha"
+    [row] = client.get(CUSTOMERS).json()
+    assert client.get(f"{CUSTOMERS}/{row['customer_id']}").json()["name"] == "Asha"
+
+
+def test_profile_is_cached_per_version(make_client, db, mongo):
+    db.add(Caterer(id="c1", name="Annapurna", email="a@example.com", contact="1"))
+    db.commit()
+    client = make_client(profile.router)
+    assert client.get("/caterer/profile").json()["name"] == "Annapurna"
+
+    db.query(Caterer).update({"name": "Renamed"})
+    db.commit()
+    assert client.get("/caterer/profile").json()["name"] == "Annapurna"
+
+    versioning.bump_version(mongo, "c1", versioning.PROFILE)
+    assert client.get("/caterer/profile").json()["name"] == "Renamed"
+
+
+@pytest.fixture
+def broken_redis(monkeypatch):
+    redis = pytest.importorskip("redis")
+
+    class Down:
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise redis.ConnectionError("Connection refused")
+
+            return fail
+
+    monkeypatch.setattr(redis.Redis, "from_url", staticmethod(lambda url: Down()))
+    return RedisCache("customers", "redis://localhost:6379/0")
+
+
+def test_redis_errors_are_cache_misses(broken_redis, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.core.cache"):
+        broken_redis.set("k", 1)
+        assert broken_redis.get("k") is None
+        broken_redis.delete("k")
+
+    stats = broken_redis.stats()
+    assert (stats["errors"], stats["misses"], stats["bytes"]) == (3, 1, None)
+    assert "Redis cache get failed for customers:k" in caplog.text
+
+
+def test_requests_are_served_while_redis_is_down(make_client, broken_redis, monkeypatch):
+    monkeypatch.setattr(customer, "customer_cache", broken_redis)
+    client = make_client(customer.router)
+    assert client.post(CUSTOMERS, json={"name": "Asha", "phone": "1"}).status_code == 201
+    assert [c["name"] for c in client.get(CUSTOMERS).json()] == ["Asha"]
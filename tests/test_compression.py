@@ -0,0 +1,109 @@
+# tests/test_compression.py
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, acceptable_encodings, choose_encoding
+from app.core.conditional import conditional_response, make_etag
+
+ROWS = [{"id": i, "name": f"Paneer Tikka {i}"} for i in range(200)]
+ETAG = make_etag("c1", 1)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.api_route("/big", methods=["GET", "HEAD"])
+    def big(request: Request, response: Response):
+        return conditional_response(request, response, ETAG) or ROWS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        chunks = (f"line {i}\n".encode() * 50 for i in range(20))
+        return StreamingResponse(chunks, media_type="text/plain")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(b"x" * 5000), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/no-transform")
+    def no_transform():
+        return JSONResponse(ROWS, headers={"Cache-Control": "no-transform"})
+
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip, br", ["br", "gzip"]),
+    ("gzip;q=1.0, br;q=0.5", ["gzip", "br"]),
+    ("br;q=0, gzip", ["gzip"]),
+    ("*", ["br", "gzip"]),
+    ("*;q=0.5, gzip;q=0", ["br"]),
+    ("GZIP;q=0.8, identity", ["gzip"]),
+    ("identity", []),
+    ("gzip;q=bogus", []),
+    ("", []),
+])
+def test_acceptable_encodings(header, expected):
+    assert acceptable_encodings(header) == expected
+
+
+def test_falls_back_to_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def test_large_json_is_gzipped_with_a_weak_etag(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.headers["etag"] == f"W/{ETAG}"
+    assert int(r.headers["content-length"]) == r.num_bytes_downloaded < len(r.content)
+    assert r.json() == ROWS
+
+    # the weakened tag still revalidates
+    r = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
+    assert "content-encoding" not in r.headers
+
+
+@pytest.mark.parametrize("accept", ["identity", "gzip;q=0", "br;q=0, gzip;q=0"])
+def test_refused_encodings_get_identity(client, accept):
+    r = client.get("/big", headers={"Accept-Encoding": accept})
+    assert "content-encoding" not in r.headers
+    assert r.headers["etag"] == ETAG
+
+
+@pytest.mark.parametrize("path", ["/small", "/encoded", "/no-transform"])
+def test_small_encoded_and_no_transform_pass_through(client, path):
+    r = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert r.headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert "vary" not in r.headers
+
+
+def test_streamed_responses_are_compressed_as_they_go(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    r = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert r.headers["content-encoding"] == "gzip"
+    assert "content-length" not in r.headers
+    assert r.text == "".join(f"line {i}\n" * 50 for i in range(20))
+
+
+def test_head_is_left_alone(client):
+    r = client.head("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
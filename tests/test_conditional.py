@@ -0,0 +1,49 @@
+# tests/test_conditional.py
+import pytest
+
+from app.core.conditional import CONDITIONAL_CACHE_CONTROL
+from app.modules.package.api import package
+
+CATEGORIES = "/caterer/c1/menu/category"
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(package.router)
+
+
+def test_etag_then_304(client):
+    r = client.get(CATEGORIES)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == CONDITIONAL_CACHE_CONTROL
+
+    r = client.get(CATEGORIES, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+
+def test_weak_and_listed_tags_match(client):
+    etag = client.get(CATEGORIES).headers["etag"]
+    assert client.get(CATEGORIES, headers={"If-None-Match": "W/" + etag}).status_code == 304
+    assert client.get(CATEGORIES, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get(CATEGORIES, headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get(CATEGORIES, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_write_changes_the_etag(client):
+    etag = client.get(CATEGORIES).headers["etag"]
+    assert client.post(CATEGORIES, json={"name": "Starters"}).status_code == 201
+
+    r = client.get(CATEGORIES, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert [c["name"] for c in r.json()] == ["Starters"]
+
+
+def test_query_string_is_part_of_the_etag(client):
+    assert (
+        client.get(CATEGORIES, params={"sort_dir": "asc"}).headers["etag"]
+        != client.get(CATEGORIES, params={"sort_dir": "desc"}).headers["etag"]
+    )
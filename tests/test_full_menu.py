@@ -0,0 +1,61 @@
+# tests/test_full_menu.py
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.modules.package.api.package import fetch_full_menu
+
+NOW = datetime(2025, 1, 1)
+
+
+class RecordingCollection:
+    """
+    mongomock can't run $lookup with a sub-pipeline, so stand in for the
+    categories collection: record the aggregation, return joined docs.
+    """
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return iter(self.docs)
+
+
+def test_nested_menu_is_one_aggregation():
+    cat_id, item_id = ObjectId(), ObjectId()
+    categories = RecordingCollection([
+        {
+            "_id": cat_id, "caterer_id": "c1", "name": "Starters", "created_at": NOW,
+            "items": [
+                {"_id": item_id, "category_id": str(cat_id), "name": "Soup",
+                 "description": None, "created_at": NOW},
+            ],
+        },
+    ])
+
+    menu = fetch_full_menu({"menu_categories": categories}, "c1", 5, 10, 2, 20)
+
+    assert menu == [{
+        "id": str(cat_id), "name": "Starters", "created_at": NOW, "updated_at": None,
+        "items": [{
+            "id": str(item_id), "category_id": str(cat_id), "name": "Soup",
+            "description": None, "created_at": NOW, "updated_at": None,
+        }],
+    }]
+
+    [pipeline] = categories.pipelines
+    assert pipeline[:4] == [
+        {"$match": {"caterer_id": "c1"}},
+        {"$sort": {"name": 1}},
+        {"$skip": 5},
+        {"$limit": 10},
+    ]
+    lookup = pipeline[4]["$lookup"]
+    assert lookup["from"] == "menu_items"
+    items_stages = lookup["pipeline"]
+    # the item page is applied per category, inside the join, for this tenant
+    assert items_stages[0]["$match"]["caterer_id"] == "c1"
+    assert {"$skip": 2} in items_stages and {"$limit": 20} in items_stages
+    assert {"$project": {"search_terms": 0}} in items_stages
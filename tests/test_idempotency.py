@@ -0,0 +1,152 @@
+# tests/test_idempotency.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.modules.order import idempotency as idempotency_module
+from app.modules.order.api import order
+from app.modules.order.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER, Idempotency
+from app.modules.order.models import IdempotencyKey, Order, Payment
+
+PAYMENTS = "/caterer/c1/orders/o1/payments"
+BODY = {"amount": "500", "datetime": "2025-01-01T10:00:00", "type": "UPI", "notes": "advance"}
+
+
+def add_order(db):
+    db.add(Order(
+        order_id="o1", caterer_id="c1", customer_id="cu1",
+        grand_total=Decimal("1000"), paid_till_now=Decimal("0"), due=Decimal("1000"), paid_status="UNPAID",
+    ))
+    db.commit()
+
+
+@pytest.fixture
+def client(make_client, db):
+    add_order(db)
+    return make_client(order.router)
+
+
+def pay(client, key="k1", json=BODY):
+    return client.post(PAYMENTS, json=json, headers={IDEMPOTENCY_HEADER: key})
+
+
+def test_retries_replay_the_stored_response(client, db):
+    first = pay(client)
+    assert first.status_code == 201
+    assert REPLAYED_HEADER.lower() not in first.headers
+
+    # same request, keys in another order
+    retry = pay(client, json=dict(reversed(list(BODY.items()))))
+
+    assert retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert db.query(Payment).count() == 1
+    assert db.get(Order, "o1").paid_till_now == Decimal("500")
+
+
+def test_requests_without_a_key_are_not_deduplicated(client, db):
+    client.post(PAYMENTS, json=BODY)
+    client.post(PAYMENTS, json=BODY)
+    assert db.query(Payment).count() == 2
+
+
+def test_reusing_a_key_for_another_request_is_rejected(client):
+    pay(client)
+    r = pay(client, json=dict(BODY, amount="600"))
+    assert r.status_code == 422
+
+
+@pytest.mark.parametrize("key", ["", " ", "x" * 256])
+def test_malformed_keys_are_rejected(client, key):
+    assert pay(client, key=key).status_code == 400
+
+
+def test_a_key_still_in_progress_gets_409(client, db):
+    now = datetime.utcnow()
+    db.add(IdempotencyKey(
+        caterer_id="c1", key="k1", fingerprint=idempotency_module.fingerprint("POST", PAYMENTS, b"{}"),
+        created_at=now, expires_at=now + timedelta(hours=1),
+    ))
+    db.commit()
+
+    r = client.post(PAYMENTS, content=b"{}", headers={IDEMPOTENCY_HEADER: "k1", "Content-Type": "application/json"})
+    assert r.status_code == 409
+    assert r.headers["retry-after"] == "1"
+
+
+def test_a_failed_request_releases_its_key(make_client, db):
+    client = make_client(order.router)
+    assert pay(client).status_code == 404  # the order doesn't exist yet
+    assert db.query(IdempotencyKey).count() == 0
+
+    add_order(db)
+    retry = pay(client)
+    assert retry.status_code == 201
+    assert REPLAYED_HEADER.lower() not in retry.headers
+
+
+def test_an_unstored_response_keeps_the_claim(client, db, monkeypatch):
+    sessions = []
+    real = idempotency_module.SessionLocal
+
+    def session_local():
+        session = real()
+        sessions.append(session)
+        if len(sessions) == 2:  # the one complete() stores the response with
+
+            def lost():
+                raise OperationalError("UPDATE idempotency_key", {}, Exception("connection lost"))
+
+            session.commit = lost
+        return session
+
+    monkeypatch.setattr(idempotency_module, "SessionLocal", session_local)
+    assert pay(client).status_code == 201
+    monkeypatch.setattr(idempotency_module, "SessionLocal", real)
+
+    # the payment exists, so the key must not be free for a second one
+    [row] = db.query(IdempotencyKey).all()
+    assert row.status_code is None
+    assert pay(client).status_code == 409
+    assert db.query(Payment).count() == 1
+
+
+def test_only_one_retry_takes_over_an_abandoned_claim(engine, db, monkeypatch):
+    now = datetime.utcnow()
+    abandoned = now - timedelta(seconds=settings.idempotency_lock_seconds + 1)
+    db.add(IdempotencyKey(
+        caterer_id="c1", key="k1", fingerprint="f", created_at=abandoned, expires_at=now + timedelta(hours=1),
+    ))
+    db.commit()
+
+    first = Idempotency("c1", "k1", "f")
+    second = Idempotency("c1", "k1", "f")
+    real = idempotency_module.SessionLocal
+
+    def racing_session():
+        session = real()
+        original_get = session.get
+
+        def get(*args, **kwargs):
+            row = original_get(*args, **kwargs)
+            # the other retry takes the claim after this one has read the row
+            monkeypatch.setattr(idempotency_module, "SessionLocal", real)
+            first.claim()
+            return row
+
+        session.get = get
+        return session
+
+    monkeypatch.setattr(idempotency_module, "SessionLocal", racing_session)
+    with pytest.raises(HTTPException) as exc:
+        second.claim()
+
+    assert exc.value.status_code == 409
+    assert first.claimed and not second.claimed
+    db.expire_all()
+    assert db.get(IdempotencyKey, ("c1", "k1")).created_at > abandoned
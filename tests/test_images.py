@@ -0,0 +1,123 @@
+# tests/test_images.py
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from app.modules.caterer.schemas import CatererOut
+from app.utils import images
+from app.utils.images import VARIANTS, image_variant_urls, store_profile_image
+
+pytestmark = pytest.mark.anyio
+
+BASE = "https://api.example.com/static/profile_images/"
+LEGACY_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "static", "profile_images")
+
+
+def png_upload(size=(300, 200), filename="me.png") -> UploadFile:
+    buf = io.BytesIO()
+    Image.new("RGB", size, "red").save(buf, format="PNG")
+    buf.seek(0)
+    return UploadFile(file=buf, filename=filename)
+
+
+@pytest.fixture
+def image_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, "PROFILE_IMAGE_DIR", str(tmp_path))
+    yield tmp_path
+    images.shutdown_image_pool()
+
+
+def test_variant_urls_follow_from_the_stored_name(monkeypatch):
+    def no_disk(path):
+        raise AssertionError(f"checked the filesystem for {path}")
+
+    monkeypatch.setattr(os.path, "exists", no_disk)
+    stem = "c1_sha256-" + "0123456789abcdef" * 2
+    urls = image_variant_urls(BASE + stem + ".png")
+    assert urls == {
+        "original": BASE + stem + ".png",
+        **{name: f"{BASE}{stem}.{name}.webp" for name in VARIANTS},
+    }
+
+
+@pytest.mark.parametrize("name", sorted(os.listdir(LEGACY_DIR)))
+def test_legacy_uploads_have_no_variants(name):
+    # "<caterer id>_<uuid4 hex>" from before variants existed
+    assert image_variant_urls(BASE + name) == {"original": BASE + name}
+
+
+def test_external_urls_have_no_variants():
+    assert image_variant_urls("https://cdn.example.com/a.png") == {
+        "original": "https://cdn.example.com/a.png"
+    }
+
+
+async def test_store_writes_original_and_every_variant(image_dir):
+    filename = await store_profile_image(png_upload(), "c1")
+
+    stem, ext = os.path.splitext(filename)
+    assert ext == ".png"
+    assert images.STORED_STEM.fullmatch(stem)
+    written = sorted(os.listdir(image_dir))
+    assert written == sorted([filename, *(f"{stem}.{name}.webp" for name in VARIANTS)])
+    with Image.open(image_dir / f"{stem}.thumb.webp") as thumb:
+        assert max(thumb.size) == VARIANTS["thumb"]
+
+    # same bytes -> same name, nothing re-rendered
+    assert await store_profile_image(png_upload(), "c1") == filename
+
+
+def test_concurrent_renders_of_the_same_image_do_not_collide(tmp_path, monkeypatch):
+    src = tmp_path / "upload.png"
+    Image.new("RGB", (300, 200), "red").save(src)
+    stem = "c1_sha256-" + "0" * 32
+    real_replace = os.replace
+    raced = []
+
+    def replace(tmp, dest):
+        if not raced:
+            # another upload of the same picture renders and finishes first
+            raced.append(dest)
+            images.render_variants(str(src), str(tmp_path), stem)
+        real_replace(tmp, dest)
+
+    monkeypatch.setattr(images.os, "replace", replace)
+    written = images.render_variants(str(src), str(tmp_path), stem)
+
+    assert set(written) == set(VARIANTS)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+async def test_caterer_lists_only_variants_on_disk(image_dir):
+    [legacy] = [name for name in os.listdir(LEGACY_DIR) if name.endswith(".png")]
+    stored = await store_profile_image(png_upload(), "c1")
+
+    for name, expected in ((legacy, {"original"}), (stored, {"original", *VARIANTS})):
+        caterer = CatererOut(
+            id="c1", name="A", email="a@example.com", contact="1",
+            created_at="2025-01-01T00:00:00", updated_at=None, profile_image_url=BASE + name,
+        )
+        variants = caterer.profile_image_variants
+        assert set(variants) == expected
+        for url in variants.values():
+            filename = url[len(BASE):]
+            assert os.path.exists(os.path.join(LEGACY_DIR if name == legacy else image_dir, filename))
+
+
+async def test_store_rejects_oversized_upload(image_dir, monkeypatch):
+    monkeypatch.setattr(images.settings, "profile_image_max_bytes", 100)
+    with pytest.raises(HTTPException) as exc:
+        await store_profile_image(png_upload(), "c1")
+    assert exc.value.status_code == 413
+    assert os.listdir(image_dir) == []
+
+
+async def test_store_rejects_non_images(image_dir):
+    upload = UploadFile(file=io.BytesIO(b"not an image"), filename="me.png")
+    with pytest.raises(HTTPException) as exc:
+        await store_profile_image(upload, "c1")
+    assert exc.value.status_code == 422
+    assert os.listdir(image_dir) == []
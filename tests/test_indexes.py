@@ -0,0 +1,52 @@
+# tests/test_indexes.py
+import pytest
+
+from app.db.indexes import INDEXES, _plan_summary, ensure_indexes
+from app.modules.package.api import package
+
+
+def test_unique_indexes_catch_a_lost_race(make_client, mongo, monkeypatch):
+    ensure_indexes(mongo)
+    client = make_client(package.router)
+    assert client.post("/caterer/c1/packages", json={"name": "Gold", "price": 1}).status_code == 201
+
+    # a concurrent request that passed the duplicate check at the same time
+    monkeypatch.setattr(type(mongo["packages"]), "find_one", lambda self, *args, **kwargs: None)
+    r = client.post("/caterer/c1/packages", json={"name": "Gold", "price": 2})
+
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Package name already exists"
+    assert mongo["packages"].count_documents({}) == 1
+
+
+def test_a_failing_index_is_reported_and_skipped(mongo):
+    mongo["packages"].insert_many([
+        {"caterer_id": "c1", "name": "Gold"},
+        {"caterer_id": "c1", "name": "Gold"},
+    ])
+
+    results = ensure_indexes(mongo)
+
+    failed = [name for name, result in results.items() if result.startswith("failed")]
+    assert failed == [spec.name for spec in INDEXES if spec.collection == "packages" and spec.unique]
+    assert sum(result == "ok" for result in results.values()) == len(INDEXES) - len(failed)
+
+
+@pytest.mark.parametrize("plan,stages,indexes", [
+    ({"stage": "COLLSCAN"}, ["COLLSCAN"], []),
+    (
+        {"stage": "SORT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "ix"}}},
+        ["SORT", "FETCH", "IXSCAN"],
+        ["ix"],
+    ),
+    (
+        # slot-based engine plans nest the classic plan under queryPlan
+        {"queryPlan": {"stage": "OR", "inputStages": [
+            {"stage": "IXSCAN", "indexName": "a"}, {"stage": "IXSCAN", "indexName": "b"},
+        ]}},
+        ["OR", "IXSCAN", "IXSCAN"],
+        ["b", "a"],
+    ),
+])
+def test_plan_summary(plan, stages, indexes):
+    assert _plan_summary(plan) == (stages, indexes)
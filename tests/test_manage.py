@@ -0,0 +1,20 @@
+# tests/test_manage.py
+import sys
+
+from app import manage
+from app.core.config import settings
+from app.db.indexes import INDEXES
+
+
+def test_workers_leave_index_builds_to_the_deploy():
+    assert settings.mongo_auto_indexes is False
+
+
+def test_ensure_indexes_command(mongo, monkeypatch, capsys):
+    monkeypatch.setattr(manage, "get_mongo_db", lambda: mongo)
+    monkeypatch.setattr(sys, "argv", ["app.manage", "ensure-indexes"])
+
+    manage.main()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(f"{spec.name}: ok" for spec in INDEXES)
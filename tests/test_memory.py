@@ -0,0 +1,74 @@
+# tests/test_memory.py
+import logging
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.staticfiles import StaticFiles
+
+from app.core import memory
+from app.core.config import settings
+from app.core.memory import MB, MemoryMiddleware, MemoryTracker
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = MemoryTracker()
+    monkeypatch.setattr(memory, "tracker", tracker)
+    started = not tracemalloc.is_tracing()
+    memory.start_tracing()
+    yield tracker
+    if started:
+        tracemalloc.stop()
+
+
+@pytest.fixture
+def client(tracker, tmp_path):
+    (tmp_path / "logo.txt").write_text("logo")
+    app = FastAPI()
+
+    @app.get("/caterer/{cid}/report")
+    def report(cid: str, mb: int = 0):
+        buffer = bytearray(mb * MB)
+        return {"size": len(buffer)}
+
+    app.mount("/static", StaticFiles(directory=tmp_path), name="static")
+    app.add_middleware(MemoryMiddleware)
+    return TestClient(app)
+
+
+def test_peaks_are_recorded_per_route_and_tenant(client, tracker):
+    client.get("/caterer/c1/report", params={"mb": 0})
+    client.get("/caterer/c2/report", params={"mb": 4})
+
+    stats = tracker.routes[("GET", "/caterer/{cid}/report")]
+    assert stats["requests"] == 2
+    assert stats["peak_bytes_max"] >= 4 * MB
+    assert stats["max_tenant"] == "c2"
+    assert tracker.in_flight == 0
+
+    [largest, smallest] = [r["tenant"] for r in tracker.report()["largest_requests"]]
+    assert (largest, smallest) == ("c2", "c1")
+
+
+def test_large_requests_are_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "memory_log_threshold_mb", 2)
+    with caplog.at_level(logging.WARNING, logger=memory.__name__):
+        client.get("/caterer/c1/report", params={"mb": 1})
+        client.get("/caterer/c1/report", params={"mb": 3})
+
+    [record] = caplog.records
+    assert "GET /caterer/{cid}/report tenant=c1" in record.getMessage()
+
+
+def test_mounts_are_labelled_by_mount_path(client, tracker):
+    client.get("/static/logo.txt")
+    assert ("GET", "/static") in tracker.routes
+
+
+def test_report_lists_allocation_sites(client, tracker):
+    report = tracker.report(limit=3)
+    assert report["enabled"] is True
+    assert len(report["top_allocations"]) == 3
+    assert report["top_allocations"][0]["traceback"] is None
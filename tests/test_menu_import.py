@@ -0,0 +1,65 @@
+# tests/test_menu_import.py
+import pytest
+
+from app.core import versioning
+from app.modules.package.api import menu_import
+
+IMPORT = "/caterer/c1/menu/import"
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(menu_import.router)
+
+
+def upload(client, body: bytes):
+    return client.post(IMPORT, files={"file": ("menu.csv", body, "text/csv")})
+
+
+def test_import_creates_categories_and_items_once(client, mongo):
+    body = (
+        "\ufeffCategory,Item,Description\n"  # Excel BOM
+        "Starters,Soup,Hot\n"
+        "Starters,Salad,\n"
+        "Mains,Curry,Spicy\n"
+        "Starters,Soup,duplicate row\n"
+    ).encode()
+
+    r = upload(client, body)
+    assert r.status_code == 200
+    assert r.json() == {"message": "Import completed.", "categories_added": 2, "items_added": 3}
+    soup = mongo["menu_items"].find_one({"name": "Soup"})
+    assert soup["description"] == "Hot"
+    assert "soup" in soup["search_terms"]
+    version = versioning.get_version(mongo, "c1", versioning.MENU)
+    assert version != versioning.INITIAL_VERSION
+
+    # re-importing writes nothing and leaves the version alone
+    r = upload(client, body)
+    assert r.json()["categories_added"] == r.json()["items_added"] == 0
+    assert versioning.get_version(mongo, "c1", versioning.MENU) == version
+
+
+def test_missing_headers_are_rejected(client, mongo):
+    r = upload(client, b"Name,Price\nSoup,1\n")
+    assert r.status_code == 422
+    assert versioning.get_version(mongo, "c1", versioning.MENU) == versioning.INITIAL_VERSION
+
+
+def test_failure_after_written_batches_reports_them_and_bumps_the_version(
+    client, mongo, monkeypatch
+):
+    monkeypatch.setattr(menu_import, "IMPORT_BATCH_SIZE", 10)
+    rows = "".join(f"Category {i % 3},Item {i},{'x' * 40}\n" for i in range(500))
+    # the decoder reads ahead in 8 KiB chunks; put the bad byte well past that
+    body = ("Category,Item,Description\n" + rows).encode() + b"Broken,\xff\xfe,row\n"
+
+    r = upload(client, body)
+
+    assert r.status_code == 422
+    detail = r.json()["detail"]
+    assert detail["message"] == "CSV must be UTF-8 encoded"
+    assert detail["categories_added"] == 3
+    assert 0 < detail["items_added"] < 500
+    assert mongo["menu_items"].count_documents({}) == detail["items_added"]
+    assert versioning.get_version(mongo, "c1", versioning.MENU) != versioning.INITIAL_VERSION
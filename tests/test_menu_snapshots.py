@@ -0,0 +1,78 @@
+# tests/test_menu_snapshots.py
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import get_cache
+from app.modules.customer.models import Customer
+from app.modules.order.api import order
+from app.modules.order.events import SNAPSHOTS, menu_hash, migrate_event_menus
+
+MENU = {"Starters": ["Soup", "Salad"], "Main": "Thali"}
+
+
+def event(menu=MENU, **overrides):
+    return {
+        "event_type": "Wedding", "event_date": "2025-02-01T00:00:00", "start_time": "18:00",
+        "end_time": "23:00", "venue": "Hall", "no_of_guests": 100, "menu": menu,
+        "total_amount": 5000, **overrides,
+    }
+
+
+@pytest.fixture
+def client(make_client, db):
+    db.add(Customer(customer_id="cu1", caterer_id="c1", name="Asha", phone="1"))
+    db.commit()
+    return make_client(order.router)
+
+
+def test_menu_hash_ignores_key_order():
+    assert menu_hash({"a": 1, "b": [1, 2]}) == menu_hash({"b": [1, 2], "a": 1})
+    assert menu_hash({"a": 1}) != menu_hash({"a": 2})
+
+
+def test_identical_menus_are_stored_once(client, mongo):
+    reordered = dict(reversed(list(MENU.items())))
+    for menu in (MENU, reordered):
+        r = client.post("/caterer/c1/order", json={"customer_id": "cu1", "events": [event(menu), event(None)]})
+        assert r.status_code == 201
+        assert [e["menu"] for e in r.json()["events"]] == [MENU, None]
+
+    assert mongo[SNAPSHOTS].count_documents({}) == 1
+    stored = mongo["events"].find_one({"menu_hash": {"$ne": None}})
+    assert "menu" not in stored
+    assert stored["menu_hash"] == menu_hash(MENU)
+
+
+def test_reads_resolve_snapshots_in_one_query(client, mongo, monkeypatch):
+    for _ in range(3):
+        client.post("/caterer/c1/order", json={"customer_id": "cu1", "events": [event()]})
+    get_cache("menu_snapshots").clear()
+
+    finds = []
+    original_find = type(mongo[SNAPSHOTS]).find
+
+    def counting_find(self, *args, **kwargs):
+        if self.name == SNAPSHOTS:
+            finds.append(args)
+        return original_find(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(mongo[SNAPSHOTS]), "find", counting_find)
+    orders = client.get("/caterer/c1/orders").json()
+
+    assert [e["menu"] for o in orders for e in o["events"]] == [MENU] * 3
+    assert len(finds) == 1
+
+
+def test_migration_moves_embedded_menus(mongo):
+    mongo["events"].insert_many([
+        {"order_id": "o1", "menu": MENU, "created_at": datetime(2024, 1, 1)},
+        {"order_id": "o2", "menu": MENU, "created_at": datetime(2024, 1, 1)},
+        {"order_id": "o3", "menu": {"Main": "Pasta"}, "created_at": datetime(2024, 1, 1)},
+    ])
+
+    assert migrate_event_menus(mongo, batch_size=2) == {"events": 3, "snapshots": 2}
+    assert mongo["events"].count_documents({"menu": {"$exists": True}}) == 0
+    assert mongo["events"].find_one({"order_id": "o2"})["menu_hash"] == menu_hash(MENU)
+    # re-running finds nothing left to move
+    assert migrate_event_menus(mongo) == {"events": 0, "snapshots": 2}
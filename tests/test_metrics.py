@@ -0,0 +1,68 @@
+# tests/test_metrics.py
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from starlette.staticfiles import StaticFiles
+
+from app.core import metrics
+from app.core.metrics import MetricsMiddleware, Registry, instrument_engine
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = Registry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    return registry
+
+
+@pytest.fixture
+def client(tmp_path, registry):
+    (tmp_path / "logo.txt").write_text("logo")
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    instrument_engine(engine)
+
+    router = APIRouter()
+
+    @router.get("/caterer/{cid}/orders")
+    def orders(cid: str):
+        with engine.connect() as conn:
+            return conn.execute(text("select 1")).scalar()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.mount("/static", StaticFiles(directory=tmp_path), name="static")
+    app.add_middleware(MetricsMiddleware)
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template(client, registry):
+    client.get("/caterer/c1/orders")
+    client.get("/caterer/c2/orders")
+
+    assert registry.statuses == {("GET", "/caterer/{cid}/orders", "200"): 2}
+    assert registry.in_flight == {"GET": 0}
+    assert registry.db_latency[("GET", "/caterer/{cid}/orders", "cockroach")].total > 0
+    assert registry.db_latency[("GET", "/caterer/{cid}/orders", "mongo")].total == 0
+
+
+def test_mounts_are_labelled_by_mount_path(client, registry):
+    assert client.get("/static/logo.txt").status_code == 200
+    client.get("/static/missing.txt")
+    client.get("/nowhere")
+
+    assert registry.statuses == {
+        ("GET", "/static", "200"): 1,
+        ("GET", "/static", "404"): 1,
+        ("GET", "unmatched", "404"): 1,
+    }
+
+
+def test_render_is_prometheus_text(client, registry):
+    client.get("/caterer/c1/orders")
+    body = registry.render()
+    assert 'http_requests_total{method="GET",route="/caterer/{cid}/orders",status="200"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/caterer/{cid}/orders"} 1' in body
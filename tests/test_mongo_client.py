@@ -0,0 +1,56 @@
+# tests/test_mongo_client.py
+import pytest
+
+from app.db import mongo as mongo_module
+
+
+class FakeClient:
+    def __init__(self, uri, **options):
+        self.options = options
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setattr(mongo_module, "MongoClient", FakeClient)
+    monkeypatch.setattr(mongo_module, "_client", None)
+    monkeypatch.setattr(mongo_module, "_client_pid", None)
+    pid = [100]
+    monkeypatch.setattr(mongo_module.os, "getpid", lambda: pid[0])
+    yield pid
+    mongo_module.pool_metrics.reset()
+
+
+def test_one_client_per_process(clients):
+    first = mongo_module.get_mongo_client()
+    assert mongo_module.get_mongo_client() is first
+    assert first.options["maxPoolSize"] == mongo_module.settings.mongo_max_pool_size
+    assert mongo_module.pool_metrics in first.options["event_listeners"]
+
+
+def test_a_forked_worker_builds_its_own_client(clients):
+    parent = mongo_module.get_mongo_client()
+    mongo_module.pool_metrics.checkouts = 7
+
+    clients[0] = 200  # after fork()
+    child = mongo_module.get_mongo_client()
+
+    assert child is not parent
+    assert not parent.closed  # the parent's sockets are not ours to close
+    assert mongo_module.pool_metrics.checkouts == 0
+
+
+def test_close_leaves_an_inherited_client_alone(clients):
+    parent = mongo_module.get_mongo_client()
+    clients[0] = 200
+    mongo_module.close_mongo()
+    assert not parent.closed
+    assert mongo_module._client is None
+
+    clients[0] = 100
+    own = mongo_module.get_mongo_client()
+    mongo_module.close_mongo()
+    assert own.closed
@@ -0,0 +1,86 @@
+# tests/test_pagination.py
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.indexes import INDEXES, ensure_indexes
+from app.modules.package.api import package
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(package.router)
+
+
+def walk(client, url, **params):
+    """Follow X-Next-Cursor to the end; return every row and the page count."""
+    rows, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, cursor=cursor) if cursor else params
+        r = client.get(url, params=query)
+        assert r.status_code == 200, r.text
+        rows.extend(r.json())
+        pages += 1
+        cursor = r.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return rows, pages
+
+
+def test_packages_by_name_walk_every_page_once(client):
+    for name in ["E", "B", "D", "A", "C"]:
+        client.post("/caterer/c1/packages", json={"name": name, "price": 1})
+
+    rows, pages = walk(client, "/caterer/c1/packages", limit=2)
+    assert [r["name"] for r in rows] == ["A", "B", "C", "D", "E"]
+    assert pages == 3
+
+    rows, _ = walk(client, "/caterer/c1/packages", limit=2, sort_dir="desc")
+    assert [r["name"] for r in rows] == ["E", "D", "C", "B", "A"]
+
+
+def test_ties_are_broken_by_id(client, mongo):
+    # the same item name in several categories, all created at once
+    now = datetime(2025, 1, 1)
+    ids = sorted(ObjectId() for _ in range(5))
+    mongo["menu_items"].insert_many([
+        {"_id": _id, "caterer_id": "c1", "category_id": f"cat{i}", "name": "Soup", "created_at": now}
+        for i, _id in enumerate(ids)
+    ])
+
+    for sort_by in ("name", "created_at"):
+        rows, pages = walk(client, "/caterer/c1/menu/item", limit=2, sort_by=sort_by)
+        assert [r["id"] for r in rows] == [str(_id) for _id in ids]
+        assert pages == 3
+
+
+def test_cursor_is_tied_to_its_sort_order(client):
+    for name in "ABC":
+        client.post("/caterer/c1/packages", json={"name": name, "price": 1})
+    cursor = client.get("/caterer/c1/packages", params={"limit": 1}).headers[NEXT_CURSOR_HEADER]
+
+    r = client.get("/caterer/c1/packages", params={"limit": 1, "cursor": cursor, "sort_by": "created_at"})
+    assert r.status_code == 400
+    r = client.get("/caterer/c1/packages", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+
+def test_no_registered_index_is_a_redundant_prefix():
+    for short in INDEXES:
+        for long in INDEXES:
+            if short is long or short.collection != long.collection:
+                continue
+            if long.keys[: len(short.keys)] == short.keys:
+                # only worth keeping when it enforces uniqueness
+                assert short.unique, f"{short.name} is a prefix of {long.name}"
+
+
+def test_ensure_indexes_reports_unregistered_ones(mongo):
+    mongo["packages"].create_index([("caterer_id", 1), ("name", 1), ("_id", 1)], name="old_ix")
+
+    results = ensure_indexes(mongo)
+
+    assert all(results[spec.name] == "ok" for spec in INDEXES)
+    assert results["packages.old_ix"] == "unregistered"
+    assert not any(key.endswith("._id_") for key in results)
@@ -0,0 +1,61 @@
+# tests/test_pool.py
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import exc
+
+from app.db.pool import InstrumentedQueuePool
+
+
+def make_pool(**kw):
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:", check_same_thread=False), **kw)
+
+
+def test_checkouts_with_room_do_not_count_as_waiting():
+    pool = make_pool(pool_size=1, max_overflow=1)
+    first = pool.connect()  # opens the pooled connection
+    second = pool.connect()  # opens the overflow connection
+    first.close()
+    third = pool.connect()  # reuses the idle one
+
+    stats = pool.stats()
+    assert stats["checkouts"] == 3
+    assert stats["max_waiting"] == 0
+    assert stats["waiting"] == 0
+    second.close()
+    third.close()
+
+
+def test_blocked_checkouts_are_waiting_until_served():
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=5)
+    held = pool.connect()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.connect()))
+    waiter.start()
+
+    deadline = time.monotonic() + 5
+    while pool.stats()["waiting"] != 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    held.close()
+    waiter.join(5)
+    stats = pool.stats()
+    assert got and stats["waiting"] == 0
+    assert stats["max_waiting"] == 1
+    got[0].close()
+
+
+def test_timeouts_are_counted():
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=0.05)
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waiting"] == 0
+    assert stats["checkout_seconds_max"] >= 0.05
+    held.close()
@@ -0,0 +1,106 @@
+# tests/test_profiling.py
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.config import settings
+from app.core.profiling import OVERLAPPED, ProfilingMiddleware
+from app.modules.ops.api import profiles
+
+OPS = {"X-Ops-Token": "secret"}
+
+
+def slow_work():
+    time.sleep(0.1)
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    monkeypatch.setattr(settings, "ops_token", "secret")
+    # count this file as application code, so its stacks are kept
+    monkeypatch.setattr(profiling, "APP_ROOT", os.path.dirname(os.path.abspath(__file__)) + os.sep)
+
+    app = FastAPI()
+    app.include_router(profiles.router)
+
+    @app.post("/work", status_code=201)
+    def work():
+        slow_work()
+        return {"done": True}
+
+    return ProfilingMiddleware(app)
+
+
+@pytest.fixture
+def client(middleware):
+    return TestClient(middleware)
+
+
+@pytest.fixture
+def as_tenant(monkeypatch):
+    monkeypatch.setattr(profiling, "_authorize", lambda headers: "c1")
+
+
+def test_profiling_is_off_by_default():
+    assert settings.profiling_enabled is False
+
+
+def test_stored_profile_is_read_back_with_the_same_credentials(client):
+    r = client.post("/work", headers={"X-Profile": "1", **OPS})
+    assert r.status_code == 201 and r.json() == {"done": True}
+
+    profile = client.get(f"/profiles/{r.headers['x-profile-id']}", headers=OPS)
+    assert profile.status_code == 200
+    assert "slow_work" in profile.text
+    assert profile.headers["x-profile-request"] == "POST /work"
+
+    assert client.get(f"/profiles/{r.headers['x-profile-id']}").status_code == 401
+
+
+def test_inline_profile_replaces_the_body(client):
+    r = client.post("/work", headers={"X-Profile": "inline", **OPS})
+
+    assert r.status_code == 200
+    assert r.headers["x-profile-status"] == "201"
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "slow_work" in r.text
+    assert "x-profile-id" not in r.headers
+
+
+def test_unauthenticated_requests_are_served_unprofiled(client):
+    r = client.post("/work", headers={"X-Profile": "1"})
+    assert r.status_code == 201
+    assert r.headers["x-profile"] == "denied: Not authenticated"
+
+
+def test_tenant_cannot_profile_while_other_requests_are_in_flight(client, middleware, as_tenant):
+    middleware.in_flight = 1  # another request being served by this worker
+    r = client.post("/work", headers={"X-Profile": "1"})
+    assert r.status_code == 201
+    assert r.headers["x-profile"] == "busy"
+
+    middleware.in_flight = 0
+    r = client.post("/work", headers={"X-Profile": "1"})
+    assert "slow_work" in client.get(f"/profiles/{r.headers['x-profile-id']}").text
+
+
+@pytest.mark.parametrize("mode", ["1", "inline"])
+def test_tenant_profile_is_discarded_when_another_request_starts(client, middleware, as_tenant, monkeypatch, mode):
+    def overlapping_work():
+        middleware.started += 1  # another request arrives mid-profile
+        time.sleep(0.05)
+
+    monkeypatch.setattr(f"{__name__}.slow_work", overlapping_work)
+    r = client.post("/work", headers={"X-Profile": mode})
+
+    if mode == "inline":
+        assert r.status_code == 409
+        assert r.text == OVERLAPPED
+    else:
+        profile = client.get(f"/profiles/{r.headers['x-profile-id']}")
+        assert profile.status_code == 409
+        assert profile.json()["detail"] == OVERLAPPED
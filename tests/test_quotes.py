@@ -0,0 +1,64 @@
+# tests/test_quotes.py
+import pytest
+
+from app.modules.package.api import package
+
+QUOTES = "/caterer/c1/quotes"
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(package.router)
+
+
+@pytest.fixture
+def gold(client):
+    r = client.post(
+        "/caterer/c1/packages",
+        json={"name": "Gold", "price": 450.5, "waiter_count": 2, "pro_couple_count": 1},
+    )
+    return r.json()["id"]
+
+
+def test_quote_lines_price_slabs_staff_and_extras(client, gold):
+    r = client.post(QUOTES, json={
+        "candidates": [
+            {"package_id": gold, "guests": 100, "extra_services": {"DJ": 1500}, "label": "A"},
+            {"package_id": gold, "guests": 20},
+            {"package_id": "not-an-id", "guests": 10},
+        ],
+        "slabs": [{"min_guests": 50, "discount_pct": 10}, {"min_guests": 200, "discount_pct": 20}],
+        "waiter_rate": 800,
+        "pro_couple_rate": 2000,
+        "guests_per_waiter": 25,
+    })
+    assert r.status_code == 200
+    big, small, missing = r.json()
+
+    assert big["base_amount"] == "45050.00"
+    assert big["discount_pct"] == 10
+    assert big["discount_amount"] == "4505.00"
+    assert big["waiter_count"] == 4  # ceil(100 / 25) beats the package's 2
+    assert big["staff_amount"] == "5200.00"
+    assert big["extras_amount"] == "1500.00"
+    assert big["total"] == "47245.00"
+    assert big["label"] == "A"
+
+    assert small["discount_pct"] == 0
+    assert small["waiter_count"] == 2
+    assert missing["error"] == "Package not found"
+    assert missing["total"] == "0.00"
+
+
+def test_negative_extra_services_are_rejected(client, gold):
+    r = client.post(QUOTES, json={
+        "candidates": [{"package_id": gold, "guests": 10, "extra_services": {"Refund": -5000}}],
+    })
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"][-1] == "Refund"
+
+
+def test_other_tenants_packages_are_not_found(client, gold, mongo):
+    mongo["packages"].update_many({}, {"$set": {"caterer_id": "c2"}})
+    [line] = client.post(QUOTES, json={"candidates": [{"package_id": gold, "guests": 10}]}).json()
+    assert line["error"] == "Package not found"
@@ -0,0 +1,87 @@
+# tests/test_search.py
+from datetime import datetime
+
+import pytest
+
+from app.modules.package import search as search_module
+from app.modules.package.api import package
+from app.modules.package.search import item_search_terms, search_menu, search_terms
+
+
+def add_item(mongo, name, description=None):
+    mongo["menu_items"].insert_one({
+        "caterer_id": "c1",
+        "category_id": "cat",
+        "name": name,
+        "description": description,
+        "search_terms": item_search_terms(name, description),
+        "created_at": datetime(2025, 1, 1),
+    })
+
+
+def names(hits):
+    return [hit["name"] for hit in hits]
+
+
+def test_search_terms_are_word_prefixes():
+    assert search_terms("Paneer Tikka") == sorted(
+        ["pa", "pan", "pane", "panee", "paneer", "ti", "tik", "tikk", "tikka"]
+    )
+    assert search_terms("a b") == []
+
+
+def test_every_word_must_match_and_name_matches_rank_first(mongo):
+    add_item(mongo, "Veg Biryani", "rice with paneer")
+    add_item(mongo, "Paneer Tikka", "grilled")
+    add_item(mongo, "Paneer Butter Masala")
+    add_item(mongo, "Dal Tadka")
+
+    assert names(search_menu(mongo, "c1", "pan")) == [
+        "Paneer Butter Masala", "Paneer Tikka", "Veg Biryani",
+    ]
+    assert names(search_menu(mongo, "c1", "paneer tik")) == ["Paneer Tikka"]
+    assert search_menu(mongo, "c1", "p") == []
+    assert search_menu(mongo, "other", "pan") == []
+
+
+def test_exact_word_outranks_prefix(mongo):
+    add_item(mongo, "Chana Masala")
+    add_item(mongo, "Cha")
+    assert names(search_menu(mongo, "c1", "cha")) == ["Cha", "Chana Masala"]
+
+
+def test_broad_prefix_keeps_the_best_matches_past_the_scan_limit(mongo, monkeypatch):
+    monkeypatch.setattr(search_module, "SCAN_LIMIT", 5)
+    # stored first, so an unordered scan would see only these
+    for i in range(10):
+        add_item(mongo, f"Rice {i}", "cheddar chunks")
+    add_item(mongo, "Chana Masala")
+    add_item(mongo, "Ch")
+
+    hits = search_menu(mongo, "c1", "ch", kind="items", limit=3)
+
+    assert names(hits)[:2] == ["Ch", "Chana Masala"]
+
+
+def test_search_endpoint(make_client):
+    client = make_client(package.router)
+    client.post(
+        "/caterer/c1/packages",
+        json={"name": "Gold", "price": 900, "menu": [{"name": "Paneer Tikka", "description": "x"}]},
+    )
+    r = client.get("/caterer/c1/search", params={"q": "tikka"})
+    assert r.status_code == 200
+    [hit] = r.json()
+    assert hit["kind"] == "package"
+    assert hit["matched_menu"] == [{"name": "Paneer Tikka", "description": "x"}]
+
+    etag = r.headers["etag"]
+    assert client.get(
+        "/caterer/c1/search", params={"q": "tikka"}, headers={"If-None-Match": etag}
+    ).status_code == 304
+
+
+@pytest.mark.parametrize("q", ["x", ""])
+def test_search_endpoint_rejects_short_queries(make_client, q):
+    client = make_client(package.router)
+    assert client.get("/caterer/c1/search", params={"q": q}).status_code == 422
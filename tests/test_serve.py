@@ -0,0 +1,36 @@
+# tests/test_serve.py
+import pytest
+
+pytest.importorskip("gunicorn")
+
+from app import serve  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+def test_options_are_valid_gunicorn_settings(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 3)
+    monkeypatch.setattr(settings, "server_max_requests", 5000)
+    monkeypatch.setattr(settings, "server_max_requests_jitter", 500)
+
+    cfg = serve.Server(serve.gunicorn_options()).cfg
+
+    assert cfg.workers == 3
+    assert cfg.max_requests == 5000
+    assert cfg.max_requests_jitter == 500
+    assert cfg.worker_class_str == "uvicorn_worker.UvicornWorker"
+    assert cfg.post_fork is serve.post_fork
+
+
+def test_workers_default_to_the_usable_cpus(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", None)
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    assert serve.gunicorn_options()["workers"] == 2
+
+
+def test_post_fork_drops_inherited_connections(monkeypatch):
+    from app.db import cockroach
+
+    calls = []
+    monkeypatch.setattr(cockroach.engine, "dispose", lambda close=True: calls.append(close))
+    serve.post_fork(server=None, worker=None)
+    assert calls == [False]
@@ -0,0 +1,79 @@
+# tests/test_sparse_fields.py
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.modules.customer.models import Customer
+from app.modules.order.api import order
+from app.modules.order.models import Order
+from app.modules.package.api import package
+
+ORDERS = "/caterer/c1/orders"
+
+
+@pytest.fixture
+def client(make_client, db, mongo):
+    db.add(Customer(customer_id="cu1", caterer_id="c1", name="Asha", phone="1", email=None))
+    db.add(Order(
+        order_id="o1", caterer_id="c1", customer_id="cu1",
+        grand_total=Decimal("123.45"), paid_till_now=Decimal("0"), due=Decimal("10.00"),
+        paid_status="PARTIAL",
+    ))
+    db.commit()
+    mongo["events"].insert_one({
+        "order_id": "o1", "caterer_id": "c1", "event_type": "Wedding",
+        "event_date": datetime(2025, 2, 1), "start_time": "18:00", "end_time": "23:00",
+        "venue": "Hall", "no_of_guests": 200, "extra_services": None, "menu": {"Main": "Thali"},
+        "total_amount": 123.45, "created_at": datetime(2025, 1, 1), "updated_at": None,
+    })
+    return make_client(order.router)
+
+
+def test_sparse_fields_encode_like_the_full_response(client):
+    [full] = client.get(ORDERS).json()
+    assert full["grand_total"] == "123.45"
+
+    [sparse] = client.get(ORDERS, params={"fields": "grand_total,due,created_at,events.total_amount"}).json()
+
+    assert sparse == {
+        "order_id": full["order_id"],
+        "events": [{"event_id": full["events"][0]["event_id"], "total_amount": 123.45}],
+        "grand_total": full["grand_total"],
+        "due": full["due"],
+        "created_at": full["created_at"],
+    }
+    # served from the cache the second time; same encoding
+    assert client.get(ORDERS, params={"fields": "grand_total,due,created_at,events.total_amount"}).json() == [sparse]
+
+
+@pytest.mark.parametrize("fields", ["order_id", "events", "customer", "events.venue"])
+def test_selections_without_order_columns(client, fields):
+    r = client.get(ORDERS, params={"fields": fields})
+    assert r.status_code == 200, r.text
+    [row] = r.json()
+    assert row["order_id"] == "o1"
+    assert set(row) == {"order_id", fields.split(".")[0]} - {""}
+
+
+def test_sparse_fields_follow_the_response_model_order(client):
+    [row] = client.get(ORDERS, params={"fields": "paid_status,customer"}).json()
+    assert list(row) == ["order_id", "customer", "paid_status"]
+    assert row["customer"] == {"customer_id": "cu1", "name": "Asha", "phone": "1", "email": None}
+
+
+def test_unknown_fields_are_rejected(client):
+    r = client.get(ORDERS, params={"fields": "bogus,events.nope"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Unknown field(s): bogus, events.nope"
+
+
+def test_package_fields_keep_etag_and_cursor(make_client):
+    client = make_client(package.router)
+    for name in "AB":
+        client.post("/caterer/c1/packages", json={"name": name, "price": 100, "description": "d"})
+
+    r = client.get("/caterer/c1/packages", params={"fields": "name,price", "limit": 1})
+    assert r.json() == [{"id": r.json()[0]["id"], "name": "A", "price": 100.0}]
+    assert r.headers["etag"]
+    assert r.headers["x-next-cursor"]
@@ -0,0 +1,89 @@
+# tests/test_stale_reads.py
+import pytest
+from sqlalchemy import event
+
+from app.db import stale
+from app.db.stale import READ_CONSISTENCY_HEADER, as_of_clause
+from app.modules.caterer.api import profile
+from app.modules.caterer.models import Caterer
+from app.modules.customer.api import customer
+from app.modules.customer.models import Customer
+
+STALE = {READ_CONSISTENCY_HEADER: "stale"}
+
+
+@pytest.fixture
+def as_of_statements(engine):
+    """
+    SET TRANSACTION statements the sessions sent; sqlite doesn't know AS OF
+    SYSTEM TIME, so they are recorded and replaced with a no-op.
+    """
+    sent = []
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def intercept(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SET TRANSACTION"):
+            sent.append(statement)
+            return "SELECT 1", ()
+        return statement, parameters
+
+    return sent
+
+
+@pytest.fixture
+def client(make_client, db, as_of_statements):
+    db.add(Caterer(id="c1", name="Annapurna", email="a@example.com", contact="1"))
+    db.add(Customer(customer_id="cu1", caterer_id="c1", name="Asha", phone="1"))
+    db.commit()
+    return make_client(profile.router, customer.router)
+
+
+def rename(db, name):
+    db.query(Caterer).update({"name": name})
+    db.query(Customer).update({"name": name})
+    db.commit()
+
+
+@pytest.mark.parametrize("value,clause", [
+    ("follower_read_timestamp()", "follower_read_timestamp()"),
+    ("-10s", "'-10s'"),
+    ("-1.5m", "'-1.5m'"),
+])
+def test_as_of_clause(value, clause):
+    assert as_of_clause(value) == clause
+
+
+@pytest.mark.parametrize("value", ["10s", "now()", "-10s; DROP TABLE x", ""])
+def test_as_of_clause_rejects_anything_else(value):
+    with pytest.raises(RuntimeError):
+        as_of_clause(value)
+
+
+def test_strong_reads_by_default(client, as_of_statements):
+    r = client.get("/caterer/profile")
+    assert r.headers["etag"]
+    assert READ_CONSISTENCY_HEADER.lower() not in r.headers
+    assert as_of_statements == []
+
+
+def test_stale_reads_are_labelled_untagged_and_uncached(client, db, as_of_statements):
+    for path in ("/caterer/profile", "/caterer/c1/customer"):
+        r = client.get(path, headers=STALE)
+        assert r.status_code == 200
+        assert r.headers[READ_CONSISTENCY_HEADER] == "stale"
+        assert "etag" not in r.headers
+    assert as_of_statements == [f"SET TRANSACTION AS OF SYSTEM TIME {stale.AS_OF}"] * 2
+
+    # nothing was cached, so a strong read sees the latest rows
+    rename(db, "Renamed")
+    assert client.get("/caterer/profile").json()["name"] == "Renamed"
+    assert client.get("/caterer/c1/customer").json()[0]["name"] == "Renamed"
+
+
+def test_listed_routes_default_to_stale_and_can_opt_out(client, monkeypatch, as_of_statements):
+    monkeypatch.setattr(stale, "STALE_READ_ROUTES", frozenset({"list_customers"}))
+
+    assert client.get("/caterer/c1/customer").headers[READ_CONSISTENCY_HEADER] == "stale"
+    r = client.get("/caterer/c1/customer", headers={READ_CONSISTENCY_HEADER: "strong"})
+    assert READ_CONSISTENCY_HEADER.lower() not in r.headers
+    assert len(as_of_statements) == 1
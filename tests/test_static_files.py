@@ -0,0 +1,97 @@
+# tests/test_static_files.py
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.compression import brotli
+from app.core.static_files import (
+    DEFAULT_CACHE_CONTROL,
+    IMMUTABLE_CACHE_CONTROL,
+    CachedStaticFiles,
+)
+
+SCRIPT = b"console.log('hello');\n" * 50
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(SCRIPT))
+    # httpx decodes br itself when the brotli package is installed
+    (tmp_path / "app.js.br").write_bytes(brotli.compress(SCRIPT) if brotli else b"br bytes")
+    (tmp_path / "plain.css").write_bytes(b"body {}")
+    images = tmp_path / "profile_images"
+    images.mkdir()
+    (images / "c1_abc.png").write_bytes(b"original")
+    (images / "c1_abc.thumb.webp").write_bytes(b"thumb")
+    return tmp_path
+
+
+@pytest.fixture
+def client(static_dir):
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=str(static_dir)), name="static")
+    return TestClient(app)
+
+
+def get(client, path, accept_encoding=None, **headers):
+    # identity unless asked: httpx sends "gzip, deflate" by default
+    headers["accept-encoding"] = accept_encoding or "identity"
+    return client.get(path, headers=headers)
+
+
+def test_prefers_brotli_then_gzip(client):
+    r = get(client, "/static/app.js", "gzip, br")
+    assert r.headers["content-encoding"] == "br"
+    assert r.headers["content-type"].startswith("text/javascript")
+    assert r.headers["vary"] == "Accept-Encoding"
+
+    r = get(client, "/static/app.js", "gzip")
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == SCRIPT  # httpx decodes it
+
+
+def test_q_values_are_honoured(client):
+    r = get(client, "/static/app.js", "br;q=0, gzip")
+    assert r.headers["content-encoding"] == "gzip"
+
+    r = get(client, "/static/app.js", "gzip;q=0.5, br;q=0.9")
+    assert r.headers["content-encoding"] == "br"
+
+    r = get(client, "/static/app.js", "br;q=0, gzip;q=0")
+    assert "content-encoding" not in r.headers
+    assert r.content == SCRIPT
+
+
+def test_encoding_names_are_matched_as_tokens(client):
+    r = get(client, "/static/app.js", "x-gzip-ish")
+    assert "content-encoding" not in r.headers
+
+
+def test_identity_fallback_varies_when_siblings_exist(client):
+    r = get(client, "/static/app.js")
+    assert "content-encoding" not in r.headers
+    assert r.headers["vary"] == "Accept-Encoding"
+
+    r = get(client, "/static/plain.css")
+    assert "vary" not in r.headers
+    assert r.headers["cache-control"] == DEFAULT_CACHE_CONTROL
+
+
+def test_profile_images_are_immutable_with_strong_etags(client):
+    r = get(client, "/static/profile_images/c1_abc.png")
+    assert r.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    etag = r.headers["etag"]
+    assert not etag.startswith("W/")
+
+    r = get(client, "/static/profile_images/c1_abc.png", **{"if-none-match": etag})
+    assert r.status_code == 304
+
+
+def test_variant_query_serves_the_resized_sibling(client):
+    r = get(client, "/static/profile_images/c1_abc.png?variant=thumb")
+    assert r.content == b"thumb"
+    r = get(client, "/static/profile_images/c1_abc.png?variant=huge")
+    assert r.content == b"original"